@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def parse_size(value):
+    """Parse WIDTHxHEIGHT, e.g. 540x540"""
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size '{value}', expected WIDTHxHEIGHT")
+    return (width, height)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a LinkedIn Carousel as an animated GIF, APNG or MP4")
+    parser.add_argument('json_file', type=str, help='Path to the carousel JSON data file (e.g., output/my_carousel_data.json)')
+    parser.add_argument('--format', type=str, choices=['gif', 'apng', 'mp4'], default='gif',
+                        help='Animation format (mp4 needs ffmpeg on the PATH)')
+    parser.add_argument('--output', type=str,
+                        help='Output file (default: next to the JSON file, named after the carousel)')
+    parser.add_argument('--dwell', type=int, default=2500, help='Milliseconds each slide stays on screen')
+    parser.add_argument('--crossfade', type=int, default=600,
+                        help='Milliseconds of crossfade between slides (0 to disable)')
+    parser.add_argument('--crossfade-frames', type=int, default=6, help='Blended frames per crossfade')
+    parser.add_argument('--size', type=parse_size, help='Scale frames to WIDTHxHEIGHT, e.g. 540x540')
+    parser.add_argument('--fps', type=int, default=30, help='Frame rate for mp4')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.json_file):
+        print(f"Error: JSON file not found at: {args.json_file}")
+        return
+
+    output_path = args.output
+    if not output_path:
+        base = os.path.splitext(args.json_file)[0]
+        if base.endswith('_data'):
+            base = base[:-len('_data')]
+        output_path = f"{base}.{args.format}"
+
+    from src.carousel_generator.animation import animate_carousel_json
+    try:
+        animate_carousel_json(
+            args.json_file,
+            output_path,
+            animation_format=args.format,
+            dwell_ms=args.dwell,
+            crossfade_ms=args.crossfade,
+            crossfade_frames=args.crossfade_frames,
+            size=args.size,
+            fps=args.fps
+        )
+    except Exception as e:
+        print(f"Error during animation export: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def load_specs(path):
+    """Read carousel specs from a JSON list or a JSON Lines file (one carousel per line)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+def format_duration(seconds):
+    if seconds is None:
+        return "unknown"
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+def enqueue(args, queue):
+    added = skipped = invalid = 0
+    for path in args.files:
+        try:
+            specs = load_specs(path)
+        except (OSError, ValueError) as e:
+            print(f"Error reading {path}: {e}")
+            continue
+        for i, spec in enumerate(specs, 1):
+            try:
+                _, is_new = queue.enqueue(spec)
+            except ValueError as e:
+                print(f"Skipping {path} #{i}: {e}")
+                invalid += 1
+                continue
+            if is_new:
+                added += 1
+            else:
+                skipped += 1
+    print(f"Enqueued {added} carousels ({skipped} already queued, {invalid} invalid)")
+
+def work(args, queue):
+    from src.batch.runner import BatchWorker
+    worker = BatchWorker(queue, output_dir=args.output, threads=args.threads, worker_id=args.worker_id)
+    print(f"Worker {worker.worker_id} processing {queue.root} with {worker.threads} thread(s)")
+    profiler = None
+    if args.profile:
+        from src.carousel_generator.profiling import Profiler
+        profiler = Profiler(os.path.join(worker.output_dir, 'profile'), worker.worker_id)
+    try:
+        with profiler or contextlib.nullcontext():
+            stats = worker.run(max_jobs=args.max_jobs, wait=args.wait)
+    except KeyboardInterrupt:
+        worker.stop()
+        print("\nKeyboard interrupt received. Unfinished jobs resume once their lease expires.")
+        return
+    print(f"Worker finished: {stats['done']} done, {stats['failed']} failed, {stats['lost']} taken over")
+    if profiler:
+        profiler.print_summary()
+
+def status(args, queue):
+    report = queue.status()
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    counts = report['counts']
+    print(f"Pending: {counts['pending']}  Leased: {counts['leased']}  "
+          f"Done: {counts['done']}  Failed: {counts['failed']}")
+    print(f"Throughput: {report['throughput_per_minute']} carousels/min "
+          f"({report['slides_per_minute']} slides/min)")
+    print(f"ETA: {format_duration(report['eta_seconds'])}")
+    for worker_id, jobs in sorted(report['active_workers'].items()):
+        print(f"Active: {worker_id} ({jobs} job{'s' if jobs != 1 else ''})")
+    if report['expired_leases']:
+        print(f"Expired leases waiting to be requeued: {report['expired_leases']}")
+    for failure in report['failures']:
+        print(f"Failed: {failure['id']} '{failure['title']}' after {failure['attempts']} attempt(s): "
+              f"{failure['error']}")
+
+def retry(args, queue):
+    retried = queue.retry_failed()
+    print(f"Moved {len(retried)} failed carousels back to pending")
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable batch rendering of LinkedIn Carousels")
+    parser.add_argument('queue', type=str, help='Queue directory (shared storage when workers run on several machines)')
+    parser.add_argument('--lease', type=int, default=300,
+                        help='Seconds before an unrenewed job is handed to another worker')
+    parser.add_argument('--max-attempts', type=int, default=3, help='Attempts before a job is marked failed')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = commands.add_parser('enqueue', help='Add carousels from JSON or JSON Lines files')
+    enqueue_parser.add_argument('files', nargs='+', help='Files of {"title", "slides", "theme", ...} objects')
+
+    work_parser = commands.add_parser('work', help='Claim and render queued carousels')
+    work_parser.add_argument('--output', type=str, help='Results directory (default: <queue>/results)')
+    work_parser.add_argument('--threads', type=int, default=1, help='Render threads in this worker')
+    work_parser.add_argument('--worker-id', type=str, help='Name shown in status (default: host-pid)')
+    work_parser.add_argument('--max-jobs', type=int, help='Stop after this many jobs')
+    work_parser.add_argument('--wait', action='store_true', help='Keep polling for new jobs instead of exiting')
+    work_parser.add_argument('--profile', action='store_true',
+                             help='Profile the worker: cProfile stats, collapsed stacks and memory report in <output>/profile')
+
+    status_parser = commands.add_parser('status', help='Show progress, throughput, ETA and failures')
+    status_parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    commands.add_parser('retry', help='Move failed carousels back to pending')
+
+    args = parser.parse_args()
+
+    from src.batch.jobqueue import JobQueue
+    queue = JobQueue(args.queue, lease_seconds=args.lease, max_attempts=args.max_attempts)
+    {'enqueue': enqueue, 'work': work, 'status': status, 'retry': retry}[args.command](args, queue)
+
+if __name__ == "__main__":
+    main()
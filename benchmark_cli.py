@@ -0,0 +1,81 @@
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def sample_slides(count):
+    """`count` slides shaped like a typical carousel: a heading and three bullet points each"""
+    return [{"heading": f"Point {i} worth sharing", "content": "Why it matters\nWhat changed\nWhat to do next"}
+            for i in range(1, count + 1)]
+
+def median_seconds(run, repeat):
+    """Median wall time of `repeat` calls of `run`, after one warm-up call; returns (seconds, last result)"""
+    result = run()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), result
+
+def benchmark_pdf_modes(args):
+    from src.carousel_generator.generator import CarouselGenerator, PDF_MODES
+    from src.carousel_generator.sinks import MemorySink
+
+    generator = CarouselGenerator(theme=args.theme, quality=args.quality, sink=MemorySink())
+    slides = sample_slides(args.slides)
+    print(f"{args.slides} slides, theme {args.theme}, {args.quality} quality, median of {args.repeat} runs")
+    for pdf_mode in PDF_MODES:
+        def run():
+            sink = MemorySink()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = generator.generate_carousel("Benchmark", slides, pdf=True, pdf_mode=pdf_mode,
+                                                     namespace=False, sink=sink)
+            return sink.files[result["pdf_path"]]
+
+        seconds, pdf_data = median_seconds(run, args.repeat)
+        print(f"  {pdf_mode:<7} {seconds:7.3f}s  PDF {len(pdf_data) / 1024:8.1f} KiB")
+
+def benchmark_formats(args):
+    from src.carousel_generator.generator import CarouselGenerator, SLIDE_FORMATS
+    from src.carousel_generator.sinks import MemorySink
+
+    generator = CarouselGenerator(theme=args.theme, quality=args.quality, sink=MemorySink())
+    slides = sample_slides(args.slides)
+    print(f"{args.slides} slides, theme {args.theme}, {args.quality} quality, median of {args.repeat} runs")
+    for slide_format in SLIDE_FORMATS:
+        def run():
+            sink = MemorySink()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = generator.generate_carousel("Benchmark", slides, pdf=False, slide_format=slide_format,
+                                                     namespace=False, dedupe=False, sink=sink)
+            return [sink.files[path] for path in result["slide_paths"]]
+
+        seconds, slide_files = median_seconds(run, args.repeat)
+        average = sum(len(data) for data in slide_files) / len(slide_files)
+        print(f"  {slide_format:<7} {seconds:7.3f}s  {average / 1024:8.1f} KiB per slide")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the rendering paths on a sample carousel")
+    parser.add_argument('--slides', type=int, default=10, help='Number of slides in the sample carousel')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per path (after one warm-up run)')
+    parser.add_argument('--theme', type=str, default='default')
+    parser.add_argument('--quality', type=str, choices=['final', 'draft'], default='final')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('pdf-modes', help='Whole carousels with a raster and with a vector PDF')
+    commands.add_parser('formats', help='Slide files written as PNG and as SVG')
+
+    args = parser.parse_args()
+    if args.command == 'pdf-modes':
+        benchmark_pdf_modes(args)
+    elif args.command == 'formats':
+        benchmark_formats(args)
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,8 @@ import traceback
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.carousel_generator.generator import CarouselGenerator
+# Only lightweight modules are imported up front so `--help` and argument errors stay fast;
+# Pillow, reportlab and the background providers load when a carousel is generated.
 from src.carousel_generator.themes import get_available_themes
 
 def parse_slide_data(slide_file):
@@ -77,6 +78,178 @@ def get_interactive_slides(num_slides):
         slides_content.append({"heading": heading, "content": content})
     return slides_content
 
+def parse_sizes(value):
+    """Parse a comma-separated list of WIDTHxHEIGHT sizes."""
+    sizes = []
+    for item in value.split(','):
+        width, sep, height = item.strip().lower().partition('x')
+        if not sep or not width.isdigit() or not height.isdigit():
+            raise argparse.ArgumentTypeError(f"invalid size '{item.strip()}', expected WIDTHxHEIGHT")
+        sizes.append((int(width), int(height)))
+    return sizes
+
+def parse_palette(value):
+    """Parse PRIMARY,SECONDARY,ACCENT hex colors (e.g. #0a66c2,#004182,#f5c518) into RGB tuples."""
+    colors = []
+    for item in value.split(','):
+        hex_color = item.strip().lstrip('#')
+        if len(hex_color) != 6:
+            raise argparse.ArgumentTypeError(f"invalid color '{item.strip()}', expected #RRGGBB")
+        try:
+            colors.append(tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4)))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid color '{item.strip()}', expected #RRGGBB")
+    if len(colors) != 3:
+        raise argparse.ArgumentTypeError("expected three colors: PRIMARY,SECONDARY,ACCENT")
+    return colors
+
+def parse_themes(value):
+    """Parse a comma-separated list of theme names, or 'all'."""
+    available_themes = get_available_themes()
+    if value.strip().lower() == 'all':
+        return available_themes
+    themes = [item.strip() for item in value.split(',') if item.strip()]
+    unknown = [theme for theme in themes if theme not in available_themes]
+    if unknown or not themes:
+        raise argparse.ArgumentTypeError(
+            f"invalid theme(s) {', '.join(unknown) or value!r}, choose from: all, {', '.join(available_themes)}")
+    return themes
+
+def create_backgrounds(args, generator, slides_content, theme=None):
+    """Generate (or reuse cached) AI backgrounds for every slide."""
+    import asyncio
+    from src.carousel_generator.backgrounds import (BackgroundCache, GeminiBackgroundProvider,
+                                                    StubBackgroundProvider, build_background_prompts,
+                                                    generate_backgrounds)
+
+    if args.background_provider == 'gemini':
+        provider = GeminiBackgroundProvider()
+    else:
+        provider = StubBackgroundProvider(size=generator.theme_config["slide_size"])
+    cache = BackgroundCache(os.path.join(args.output, '.background_cache'))
+    prompts = build_background_prompts(theme or args.theme, slides_content,
+                                       individual=args.individual_backgrounds,
+                                       custom_style=args.custom_style)
+    print(f"Preparing {len(set(prompts))} background(s) with the {provider.model} provider...")
+    return asyncio.run(generate_backgrounds(prompts, provider, cache, args.background_concurrency))
+
+def generate_matrix(args, generator, slides_content, logo_path):
+    """Render the carousel in every theme from --themes."""
+    from src.carousel_generator.matrix import generate_theme_matrix
+
+    background_paths = None
+    if args.background_provider != 'none':
+        try:
+            background_paths = {theme: create_backgrounds(args, generator, slides_content, theme)
+                                for theme in args.themes}
+        except Exception as e:
+            print(f"Warning: Background generation failed ({e}). Continuing without backgrounds.")
+
+    print(f"\nGenerating carousel '{args.title}' in {len(args.themes)} themes: {', '.join(args.themes)}...")
+    try:
+        result = generate_theme_matrix(
+            args.title,
+            slides_content,
+            themes=args.themes,
+            output_dir=args.output,
+            quality=args.quality,
+            logo_path=logo_path,
+            background_paths=background_paths,
+            pdf=True if args.pdf else None,
+            pdf_mode=args.pdf_mode,
+            seed=args.seed,
+            engine=args.engine,
+            palette=args.palette
+        )
+        print("\nTheme matrix completed successfully!")
+        for theme, theme_result in result['themes'].items():
+            print(f"{theme}: {theme_result['output_dir']}/")
+    except Exception as e:
+        print(f"\nError during theme matrix generation: {e}")
+        traceback.print_exc()
+
+def animate_result(args, result):
+    """Export the generated slides as an animated GIF, APNG or MP4 next to the PDF"""
+    from src.carousel_generator.animation import animate_slides
+    animation_path = os.path.join(result['output_dir'], f"{args.title.replace(' ', '_')}_carousel.{args.animate}")
+    try:
+        animate_slides(result['slide_paths'], animation_path, args.animate,
+                       dwell_ms=args.dwell, crossfade_ms=args.crossfade)
+    except Exception as e:
+        print(f"Error during animation export: {e}")
+
+def generate(args, generator, slides_content, logo_path):
+    """Generate the carousel (or theme matrix or size exports) the arguments ask for."""
+    if args.themes:
+        generate_matrix(args, generator, slides_content, logo_path)
+        return
+
+    background_paths = None
+    if args.background_provider != 'none':
+        try:
+            background_paths = create_backgrounds(args, generator, slides_content)
+        except Exception as e:
+            print(f"Warning: Background generation failed ({e}). Continuing without backgrounds.")
+
+    print(f"\nGenerating carousel '{args.title}' with {len(slides_content)} slides...")
+    
+    if args.sizes:
+        try:
+            exported = generator.export_sizes(
+                args.title,
+                slides_content,
+                args.sizes,
+                logo_path=logo_path,
+                background_paths=background_paths,
+                namespace=not args.flat_output,
+                seed=args.seed
+            )
+            print("\nMulti-size export completed successfully!")
+            for size_name, paths in exported.items():
+                print(f"{size_name}: {len(paths)} slides")
+        except Exception as e:
+            print(f"\nError during multi-size export: {e}")
+            traceback.print_exc()
+        return
+
+    # Generate the carousel
+    try:
+        result = generator.generate_carousel(
+            args.title, 
+            slides_content,
+            logo_path=logo_path,
+            background_paths=background_paths,
+            pdf=True if args.pdf else None,
+            pdf_mode=args.pdf_mode,
+            slide_format=args.format,
+            namespace=not args.flat_output,
+            seed=args.seed
+        )
+        
+        if result and result.get('json_path') and (result.get('pdf_path') or args.quality == 'draft'):
+            print("\nCarousel generation completed successfully!")
+            if result.get('pdf_path'):
+                print(f"PDF saved to: {result['pdf_path']}")
+            print(f"JSON data saved to: {result['json_path']}")
+            print(f"Individual slides saved in: {result['output_dir']}/")
+            print(f"Seed: {result['seed']} (pass --seed {result['seed']} to keep these template decorations after editing the slides)")
+
+            if args.animate:
+                animate_result(args, result)
+            
+            # Provide preview command instruction relative to workspace root
+            json_rel_path = os.path.relpath(result['json_path'], os.getcwd())
+            print("\nTo preview your carousel, run:")
+            # Use forward slashes for cross-platform compatibility in the command suggestion
+            print(f"python preview_cli.py {json_rel_path.replace(os.sep, '/')}") 
+        else:
+            print("\nCarousel generation finished, but some output paths might be missing.")
+            print(f"Result details: {result}")
+
+    except Exception as e:
+        print(f"\nError during carousel generation: {e}")
+        traceback.print_exc()
+
 def main():
     available_themes = get_available_themes()
     parser = argparse.ArgumentParser(description='LinkedIn Carousel Generator')
@@ -87,6 +260,39 @@ def main():
                         default='default', help=f'Visual theme (options: {", ".join(available_themes)})')
     parser.add_argument('--logo', type=str, help='Path to logo image to add to slides')
     parser.add_argument('--output', type=str, default='output', help='Output directory for generated files')
+    parser.add_argument('--background-provider', type=str, choices=['none', 'gemini', 'stub'], default='none',
+                        help='Generate AI backgrounds under the template (stub works offline)')
+    parser.add_argument('--individual-backgrounds', action='store_true',
+                        help='Generate a unique background for each slide based on its content')
+    parser.add_argument('--custom-style', type=str, help='Custom style description for the background generator')
+    parser.add_argument('--background-concurrency', type=int, default=4,
+                        help='Maximum number of backgrounds generated at the same time')
+    parser.add_argument('--quality', type=str, choices=['final', 'draft'], default='final',
+                        help='Render quality; draft is a fast, scaled-down preview without PDF')
+    parser.add_argument('--pdf', action='store_true', help='Also build the PDF for draft renders')
+    parser.add_argument('--pdf-mode', type=str, choices=['raster', 'vector'], default='raster',
+                        help='Build the PDF from slide images (raster) or draw it directly with selectable text (vector)')
+    parser.add_argument('--format', type=str, choices=['png', 'svg'], default='png',
+                        help='File format for the individual slides')
+    parser.add_argument('--flat-output', action='store_true',
+                        help='Write files directly into --output instead of a per-carousel subdirectory')
+    parser.add_argument('--engine', type=str, choices=['reference', 'lut'], default='reference',
+                        help='Draw templates from scratch (reference) or recolor cached template layers (lut)')
+    parser.add_argument('--palette', type=parse_palette,
+                        help='Custom brand colors PRIMARY,SECONDARY,ACCENT as hex, e.g. "#0a66c2,#004182,#f5c518"')
+    parser.add_argument('--themes', type=parse_themes,
+                        help="Render the carousel in several themes at once ('all' or e.g. dark,tech) plus a comparison sheet")
+    parser.add_argument('--sizes', type=parse_sizes,
+                        help='Export PNG slides at several sizes from one layout, e.g. 1080x1080,1080x1350,1200x627')
+    parser.add_argument('--animate', type=str, choices=['gif', 'apng', 'mp4'],
+                        help='Also export the slides as an animation (mp4 needs ffmpeg)')
+    parser.add_argument('--dwell', type=int, default=2500, help='Milliseconds each slide stays on screen when animating')
+    parser.add_argument('--crossfade', type=int, default=600,
+                        help='Milliseconds of crossfade between slides when animating (0 to disable)')
+    parser.add_argument('--seed', type=int,
+                        help="Seed for the templates' random decorations (default: derived from the title and slides)")
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile generation: cProfile stats, collapsed stacks and memory report in <output>/profile')
     
     args = parser.parse_args()
     
@@ -94,6 +300,23 @@ def main():
         parser.error("--title is required.")
         # args.title = input("Enter carousel title: ") # Alternative: prompt if missing
         
+    if args.animate and args.format == 'svg':
+        parser.error("--animate needs PNG slides; drop --format svg.")
+
+    if args.themes:
+        unsupported = [flag for flag, used in (('--sizes', args.sizes), ('--format svg', args.format == 'svg'),
+                                               ('--animate', args.animate), ('--flat-output', args.flat_output))
+                       if used]
+        if unsupported:
+            parser.error(f"--themes cannot be combined with {', '.join(unsupported)}.")
+
+    if args.sizes:
+        unsupported = [flag for flag, used in (('--pdf', args.pdf), ('--pdf-mode vector', args.pdf_mode == 'vector'),
+                                               ('--format svg', args.format == 'svg'), ('--animate', args.animate))
+                       if used]
+        if unsupported:
+            parser.error(f"--sizes only exports PNG slides and cannot be combined with {', '.join(unsupported)}.")
+
     if not args.slides and not args.file:
          parser.error("Either --slides or --file must be provided.")
          # num_slides = int(input("How many slides do you want to create? ")) # Alternative
@@ -119,41 +342,28 @@ def main():
         
     # Initialize generator
     try:
-        generator = CarouselGenerator(theme=args.theme, output_dir=args.output)
-        print(f"Using theme: {args.theme}, Output directory: {args.output}")
+        from src.carousel_generator.generator import CarouselGenerator
+        from src.carousel_generator.utils import load_environment
+        load_environment()
+        generator = CarouselGenerator(theme=args.theme, output_dir=args.output, quality=args.quality,
+                                      engine=args.engine)
+        if args.palette:
+            generator.set_palette(*args.palette)
+        print(f"Using theme: {args.theme} ({args.quality}), Output directory: {args.output}")
     except Exception as e:
         print(f"Error initializing carousel generator: {e}")
         traceback.print_exc()
         return
         
-    print(f"\nGenerating carousel '{args.title}' with {len(slides_content)} slides...")
-    
-    # Generate the carousel
-    try:
-        result = generator.generate_carousel(
-            args.title, 
-            slides_content,
-            logo_path=logo_path
-        )
-        
-        if result and result.get('pdf_path') and result.get('json_path'):
-            print("\nCarousel generation completed successfully!")
-            print(f"PDF saved to: {result['pdf_path']}")
-            print(f"JSON data saved to: {result['json_path']}")
-            print(f"Individual slides saved in: {generator.output_dir}/")
-            
-            # Provide preview command instruction relative to workspace root
-            json_rel_path = os.path.relpath(result['json_path'], os.getcwd())
-            print("\nTo preview your carousel, run:")
-            # Use forward slashes for cross-platform compatibility in the command suggestion
-            print(f"python preview_cli.py {json_rel_path.replace(os.sep, '/')}") 
-        else:
-            print("\nCarousel generation finished, but some output paths might be missing.")
-            print(f"Result details: {result}")
-
-    except Exception as e:
-        print(f"\nError during carousel generation: {e}")
-        traceback.print_exc()
+    if args.profile:
+        from src.carousel_generator.profiling import Profiler
+        from src.carousel_generator.storage import carousel_slug
+        # Only generation is profiled; imports and argument parsing are left out
+        with Profiler(os.path.join(args.output, 'profile'), carousel_slug(args.title)) as profiler:
+            generate(args, generator, slides_content, logo_path)
+        profiler.print_summary()
+    else:
+        generate(args, generator, slides_content, logo_path)
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,12 @@
-import base64
 import os
+import sys
 import mimetypes
 from google import genai
-from google.genai import types
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+from src.carousel_generator.backgrounds import DEFAULT_GEMINI_MODEL, stream_gemini_response
+
 load_dotenv()
 
 def save_binary_file(file_name, data):
@@ -18,33 +20,9 @@ def generate(prompt):
         api_key=os.environ.get("GEMINI_API_KEY"),
     )
 
-    model = "gemini-2.0-flash-exp-image-generation"
-    contents = [
-        types.Content(
-            role="user",
-            parts=[
-                types.Part.from_text(text=prompt),
-            ],
-        ),
-    ]
-    generate_content_config = types.GenerateContentConfig(
-        response_modalities=[
-            "image",
-            "text",
-        ],
-        response_mime_type="text/plain",
-    )
-
-    for chunk in client.models.generate_content_stream(
-        model=model,
-        contents=contents,
-        config=generate_content_config,
-    ):
-        if not chunk.candidates or not chunk.candidates[0].content or not chunk.candidates[0].content.parts:
-            continue
-        if chunk.candidates[0].content.parts[0].inline_data:
+    for inline_data, text in stream_gemini_response(client, DEFAULT_GEMINI_MODEL, prompt):
+        if inline_data:
             file_name = "ENTER_FILE_NAME"
-            inline_data = chunk.candidates[0].content.parts[0].inline_data
             file_extension = mimetypes.guess_extension(inline_data.mime_type)
             save_binary_file(
                 f"{file_name}{file_extension}", inline_data.data
@@ -55,7 +33,7 @@ def generate(prompt):
                 f"to: {file_name}"
             )
         else:
-            print(chunk.text)
+            print(text)
 
 if __name__ == "__main__":
     generate("A beautiful sunset over a calm ocean")
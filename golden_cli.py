@@ -0,0 +1,55 @@
+import argparse
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+ENGINES = ['reference', 'lut', 'scene']
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and verify golden images of every theme, template and icon")
+    parser.add_argument('golden_dir', type=str, help='Directory holding the golden images and manifest.json')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help='Render the golden images')
+    record_parser.add_argument('--engine', type=str, choices=ENGINES, default='reference',
+                               help='Implementation to record (normally the reference)')
+    record_parser.add_argument('--seed', type=int, default=1234, help='Seed for the templates\' random elements')
+    record_parser.add_argument('--quality', type=str, choices=['final', 'draft'], default='final')
+    record_parser.add_argument('--themes', type=str, help='Comma-separated themes (default: all)')
+
+    verify_parser = commands.add_parser('verify', help='Render again and compare with the golden images')
+    verify_parser.add_argument('--engine', type=str, choices=ENGINES, default='reference',
+                               help='Implementation to check against the recorded images')
+    verify_parser.add_argument('--tolerance', type=int, default=0,
+                               help='Largest per-channel difference a pixel may have and still count as equal')
+    verify_parser.add_argument('--max-fraction', type=float, default=0.0,
+                               help='Fraction of pixels allowed to differ by more than --tolerance')
+    verify_parser.add_argument('--diffs', type=str, help='Where to write diff images (default: <golden_dir>/diffs)')
+
+    args = parser.parse_args()
+
+    from src.carousel_generator.golden import record_golden, verify_golden
+
+    if args.command == 'record':
+        themes = [theme.strip() for theme in args.themes.split(',')] if args.themes else None
+        record_golden(args.golden_dir, args.engine, args.seed, args.quality, themes)
+        return
+
+    if not os.path.exists(os.path.join(args.golden_dir, 'manifest.json')):
+        print(f"Error: No golden images in {args.golden_dir}; run 'record' first.")
+        sys.exit(2)
+    report = verify_golden(args.golden_dir, args.engine, args.tolerance, args.max_fraction, args.diffs)
+    for name in report['failed']:
+        result = report['results'][name]
+        detail = result.get('error') or (f"max diff {result['max_diff']}, mean {result['mean_diff']}, "
+                                         f"{result['changed_fraction']:.2%} of pixels changed")
+        print(f"FAIL {name}: {detail} -> {result.get('diff_path')}")
+    print(f"{args.engine} vs {report['reference_engine']}: {len(report['passed'])} passed, "
+          f"{len(report['failed'])} failed")
+    # Non-zero exit status so test runs and CI can gate on the result
+    sys.exit(1 if report['failed'] else 0)
+
+if __name__ == "__main__":
+    main()
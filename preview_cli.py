@@ -7,15 +7,17 @@ import traceback
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.preview.html_generator import generate_preview_html
-from src.preview.server import start_preview_server
-
 def main():
     parser = argparse.ArgumentParser(description="Preview LinkedIn Carousel")
     parser.add_argument('json_file', type=str, help='Path to the carousel JSON data file (e.g., output/my_carousel_data.json)')
     parser.add_argument('--port', type=int, default=8000, help='Port for the preview server')
+    parser.add_argument('--export', type=str, metavar='DIR',
+                        help='Write a static preview (index.html plus assets) to DIR instead of starting the server')
     
     args = parser.parse_args()
+
+    from src.preview.html_generator import export_static_preview, generate_preview_html
+    from src.preview.server import start_preview_server
     
     # Get absolute path to JSON file
     json_abs_path = os.path.abspath(args.json_file)
@@ -25,6 +27,13 @@ def main():
         print(f"Error: JSON file not found at: {json_abs_path}")
         return
 
+    if args.export:
+        # Self-contained bundle: open it from disk or upload it to any static host
+        html_path = export_static_preview(json_abs_path, args.export)
+        if html_path:
+            print(f"Open {os.path.abspath(html_path)} in a browser, or upload {args.export} to any static host")
+        return
+
     # Workspace root is the current working directory when the script is run
     workspace_root = os.getcwd()
     print(f"Workspace root detected as: {workspace_root}")
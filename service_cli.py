@@ -0,0 +1,40 @@
+import argparse
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def main():
+    parser = argparse.ArgumentParser(description="LinkedIn Carousel render service")
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8080, help='Port for the render service')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2,
+                        help='Number of warm render workers')
+    parser.add_argument('--max-queue', type=int, default=16,
+                        help='Queued renders allowed before new requests get HTTP 429')
+    parser.add_argument('--timeout', type=float, default=60.0,
+                        help='Default per-request timeout in seconds')
+
+    args = parser.parse_args()
+
+    from src.service.server import create_render_server
+    try:
+        httpd, pool = create_render_server(args.host, args.port, args.workers, args.max_queue, args.timeout)
+    except OSError as e:
+        print(f"Error: Could not bind to {args.host}:{args.port}. {e}")
+        return
+
+    print(f"Render service listening on http://{args.host}:{args.port}/render "
+          f"({args.workers} workers, queue of {args.max_queue})")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nKeyboard interrupt received.")
+    finally:
+        httpd.server_close()
+        pool.shutdown()
+        print("Render service stopped.")
+
+if __name__ == "__main__":
+    main()
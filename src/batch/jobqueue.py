@@ -0,0 +1,293 @@
+import os
+import json
+import time
+import socket
+import uuid
+import hashlib
+import threading
+
+from ..carousel_generator.storage import atomic_open
+from ..carousel_generator.themes import get_available_themes, QUALITY_TIERS
+from ..carousel_generator.context import TEMPLATE_ENGINES
+
+JOB_STATES = ("pending", "leased", "done", "failed")
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 3
+# Leased jobs being finished are renamed to ".<id>.<token>" plus this suffix (see JobQueue._finish)
+FINISHING_SUFFIX = ".finishing"
+
+
+class LeaseLostError(Exception):
+    """Raised when a worker's lease on a job expired and another worker took the job over"""
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+
+
+def validate_job(spec):
+    """Check one carousel spec from a batch file and fill in defaults"""
+    if not isinstance(spec, dict):
+        raise ValueError("Each job must be a JSON object")
+    title = spec.get("title")
+    if not title or not isinstance(title, str):
+        raise ValueError("'title' is required")
+    slides = spec.get("slides")
+    if not slides or not isinstance(slides, list) or not all(isinstance(s, dict) for s in slides):
+        raise ValueError("'slides' must be a non-empty list of objects with 'heading' and 'content'")
+    theme = spec.get("theme", "default")
+    if theme not in get_available_themes():
+        raise ValueError(f"Unknown theme '{theme}'")
+    quality = spec.get("quality", "final")
+    if quality not in QUALITY_TIERS:
+        raise ValueError(f"'quality' must be one of: {', '.join(QUALITY_TIERS)}")
+    engine = spec.get("engine", "reference")
+    if engine not in TEMPLATE_ENGINES:
+        raise ValueError(f"'engine' must be one of: {', '.join(TEMPLATE_ENGINES)}")
+    seed = spec.get("seed")
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int)):
+        raise ValueError("'seed' must be an integer")
+    job = {
+        "title": title,
+        "theme": theme,
+        "quality": quality,
+        "engine": engine,
+        "pdf": bool(spec.get("pdf", quality != "draft")),
+        "slides": [
+            {"heading": str(s.get("heading", "")), "content": str(s.get("content", ""))}
+            for s in slides
+        ],
+    }
+    # Only explicit seeds are kept, so specs without one keep their job id
+    if seed is not None:
+        job["seed"] = seed
+    return job
+
+
+def job_id_for(spec):
+    """Stable id of a validated spec, so enqueuing the same carousel twice adds one job"""
+    canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class JobQueue:
+    """Carousel jobs kept as files in a directory, usable by workers on many machines.
+
+    Each job is one JSON file that moves between the `pending`, `leased`,
+    `done` and `failed` subdirectories. Workers claim a job by renaming it
+    from pending to leased, which only one of them can win, so the queue
+    works on any shared filesystem with atomic rename (local disks, NFS).
+    A lease is the leased file's modification time: workers renew it while
+    they work, and a lease not renewed within `lease_seconds` (for example
+    because the worker died) is put back into pending for another worker.
+    A finishing worker first renames its leased file to a private name, so
+    a job is never both requeued and finished.
+    Job files are always replaced atomically, never edited in place.
+    Delivery is at least once: a worker that stalls past its lease may
+    finish a job another worker also runs, which is harmless because all
+    outputs are written atomically. Machines sharing a queue should have
+    roughly synchronized clocks.
+    """
+
+    def __init__(self, root, lease_seconds=DEFAULT_LEASE_SECONDS, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.root = root
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        for state in JOB_STATES:
+            os.makedirs(self.state_dir(state), exist_ok=True)
+
+    def state_dir(self, state):
+        return os.path.join(self.root, state)
+
+    def path_for(self, state, job_id):
+        return os.path.join(self.state_dir(state), f"{job_id}.json")
+
+    def job_ids(self, state):
+        """Ids of the jobs in `state`, oldest first"""
+        entries = []
+        with os.scandir(self.state_dir(state)) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and not entry.name.startswith("."):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.name[:-len(".json")]))
+                    except FileNotFoundError:
+                        pass  # Moved by another worker while listing
+        return [job_id for _, job_id in sorted(entries)]
+
+    def read(self, state, job_id):
+        with open(self.path_for(state, job_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, path, job):
+        with atomic_open(path, "w", encoding="utf-8") as f:
+            json.dump(job, f, indent=2)
+
+    def find(self, job_id):
+        """(state, job) for a job id, or (None, None) if it is not in the queue"""
+        for state in JOB_STATES:
+            try:
+                return state, self.read(state, job_id)
+            except FileNotFoundError:
+                continue
+        return None, None
+
+    def enqueue(self, spec):
+        """Add a carousel spec (see validate_job) and return (job_id, added)
+
+        Specs already in the queue, in any state, are not added again.
+        """
+        spec = validate_job(spec)
+        job_id = job_id_for(spec)
+        if self.find(job_id)[0] is not None:
+            return job_id, False
+        self._write(self.path_for("pending", job_id),
+                    {"id": job_id, "spec": spec, "attempts": 0, "enqueued_at": time.time()})
+        return job_id, True
+
+    def claim(self, worker_id=None):
+        """Lease the oldest pending job and return it, or None when nothing is pending"""
+        for job_id in self.job_ids("pending"):
+            pending_path = self.path_for("pending", job_id)
+            leased_path = self.path_for("leased", job_id)
+            try:
+                # Renames keep the timestamp, so start the lease before the job shows up as leased
+                os.utime(pending_path)
+                os.rename(pending_path, leased_path)
+            except FileNotFoundError:
+                continue  # Another worker claimed it first
+            job = self.read("leased", job_id)
+            job["worker"] = worker_id or default_worker_id()
+            job["leased_at"] = time.time()
+            job.setdefault("started_at", job["leased_at"])
+            self._write(leased_path, job)
+            return job
+        return None
+
+    def renew(self, job_id):
+        """Extend the lease on a job; raises LeaseLostError if it was taken away"""
+        try:
+            os.utime(self.path_for("leased", job_id))
+        except FileNotFoundError:
+            raise LeaseLostError(f"Lease on job {job_id} was lost")
+
+    def lease_age(self, job_id):
+        return time.time() - os.stat(self.path_for("leased", job_id)).st_mtime
+
+    def requeue_expired(self):
+        """Move jobs whose lease expired back to pending and return their ids"""
+        requeued = []
+        for job_id in self.job_ids("leased"):
+            try:
+                if self.lease_age(job_id) <= self.lease_seconds:
+                    continue
+                os.rename(self.path_for("leased", job_id), self.path_for("pending", job_id))
+            except FileNotFoundError:
+                continue  # Finished, or requeued by another worker, in the meantime
+            requeued.append(job_id)
+        # Jobs whose worker died while finishing them (see _finish)
+        with os.scandir(self.state_dir("leased")) as it:
+            stale = [entry for entry in it if entry.name.endswith(FINISHING_SUFFIX)]
+        for entry in stale:
+            job_id = entry.name[1:].split(".", 1)[0]
+            try:
+                if time.time() - entry.stat().st_mtime <= self.lease_seconds:
+                    continue
+                os.rename(entry.path, self.path_for("pending", job_id))
+            except FileNotFoundError:
+                continue
+            requeued.append(job_id)
+        return requeued
+
+    def _finish(self, job, state):
+        """Record `job` and move it out of leased into `state`, if this worker still holds it"""
+        # Renaming the lease to a name only this worker knows takes the job out of requeue_expired's reach
+        # before it is rewritten, so a requeue can no longer race the final move
+        finishing_path = os.path.join(self.state_dir("leased"), f".{job['id']}.{uuid.uuid4().hex}{FINISHING_SUFFIX}")
+        try:
+            # Fresh lease first, so the renamed file is not mistaken for one left by a dead worker
+            os.utime(self.path_for("leased", job["id"]))
+            os.rename(self.path_for("leased", job["id"]), finishing_path)
+        except FileNotFoundError:
+            raise LeaseLostError(f"Lease on job {job['id']} was lost")
+        self._write(finishing_path, job)
+        os.rename(finishing_path, self.path_for(state, job["id"]))
+
+    def complete(self, job, result):
+        job = dict(job, result=result, finished_at=time.time())
+        self._finish(job, "done")
+        return job
+
+    def fail(self, job, error):
+        """Record a failed attempt; the job is retried until it has failed max_attempts times"""
+        attempts = job.get("attempts", 0) + 1
+        job = dict(job, attempts=attempts, error=str(error), failed_at=time.time())
+        self._finish(job, "failed" if attempts >= self.max_attempts else "pending")
+        return job
+
+    def retry_failed(self):
+        """Move every failed job back to pending with a fresh attempt count"""
+        retried = []
+        for job_id in self.job_ids("failed"):
+            job = dict(self.read("failed", job_id), attempts=0)
+            self._write(self.path_for("failed", job_id), job)
+            try:
+                os.rename(self.path_for("failed", job_id), self.path_for("pending", job_id))
+            except FileNotFoundError:
+                continue
+            retried.append(job_id)
+        return retried
+
+    def status(self, window_seconds=3600):
+        """Counts per state, recent throughput, ETA and failures
+
+        Throughput is the number of jobs finished per minute over the last
+        `window_seconds` (or since the first job finished, if more recent).
+        """
+        counts = {state: len(self.job_ids(state)) for state in JOB_STATES}
+        now = time.time()
+        finished = []
+        for job_id in self.job_ids("done"):
+            try:
+                job = self.read("done", job_id)
+            except FileNotFoundError:
+                continue
+            finished.append((job.get("finished_at", now), job.get("result", {}).get("slide_count", 0)))
+        recent = [(at, slides) for at, slides in finished if now - at <= window_seconds]
+        throughput = 0.0
+        if recent:
+            span = max(now - min(at for at, _ in recent), 1.0)
+            throughput = len(recent) / span * 60
+        remaining = counts["pending"] + counts["leased"]
+        eta_seconds = 0.0 if not remaining else (remaining / throughput * 60 if throughput else None)
+
+        workers = {}
+        expired = 0
+        for job_id in self.job_ids("leased"):
+            try:
+                job = self.read("leased", job_id)
+                age = self.lease_age(job_id)
+            except FileNotFoundError:
+                continue
+            if age > self.lease_seconds:
+                expired += 1
+            else:
+                worker = job.get("worker", "unknown")
+                workers[worker] = workers.get(worker, 0) + 1
+
+        failures = []
+        for job_id in self.job_ids("failed"):
+            try:
+                job = self.read("failed", job_id)
+            except FileNotFoundError:
+                continue
+            failures.append({"id": job_id, "title": job["spec"]["title"], "attempts": job.get("attempts", 0),
+                             "error": job.get("error", "")})
+        return {
+            "counts": counts,
+            "throughput_per_minute": round(throughput, 2),
+            "slides_per_minute": round(throughput * (sum(s for _, s in recent) / len(recent)), 2) if recent else 0.0,
+            "eta_seconds": round(eta_seconds) if eta_seconds is not None else None,
+            "active_workers": workers,
+            "expired_leases": expired,
+            "failures": failures,
+        }
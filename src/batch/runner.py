@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import threading
+from PIL import Image
+
+from ..carousel_generator.generator import CarouselGenerator
+from ..carousel_generator.context import get_render_context
+from ..carousel_generator.pdf_stream import StreamingPdfWriter
+from ..carousel_generator.templates import carousel_seed
+from ..carousel_generator.sinks import LocalDirectorySink
+from ..carousel_generator.utils import save_carousel_data
+from .jobqueue import LeaseLostError, default_worker_id
+
+CHECKPOINT_NAME = "checkpoint.json"
+
+
+def load_checkpoint(sink):
+    """Slides already written for a job, as {slide number (str): path}, skipping files that went missing"""
+    try:
+        checkpoint = json.loads(sink.read(CHECKPOINT_NAME))
+    except (FileNotFoundError, ValueError):
+        return {}
+    return {number: path for number, path in checkpoint.get("slides", {}).items() if os.path.exists(path)}
+
+
+def run_job(generator, queue, job, output_dir, worker_id=None):
+    """Render one leased job into `<output_dir>/<job id>` and return its result
+
+    Every slide is written atomically and then recorded in checkpoint.json,
+    so a job taken over after its worker died only renders the slides that
+    are missing. The lease is renewed before each slide; LeaseLostError is
+    raised if another worker took the job over in the meantime. Slides are
+    seeded like generate_carousel, so resumed slides match the ones before.
+    """
+    spec = job["spec"]
+    title = spec["title"]
+    seed = spec.get("seed")
+    if seed is None:
+        seed = carousel_seed(title, spec["slides"])
+    context = get_render_context(spec["theme"], spec["quality"], spec["engine"])
+    sink = LocalDirectorySink(os.path.join(output_dir, job["id"]))
+    started = time.perf_counter()
+
+    slides = load_checkpoint(sink)
+    resumed = len(slides)
+    for number, slide in enumerate(spec["slides"], 1):
+        if str(number) in slides:
+            continue
+        queue.renew(job["id"])
+        image = generator.render_slide(slide["heading"], slide["content"], number, context=context, seed=seed)
+        slides[str(number)] = generator.save_slide({"number": number, "image": image}, sink, context=context)
+        sink.write(CHECKPOINT_NAME, json.dumps({"worker": worker_id, "slides": slides}, indent=2).encode("utf-8"))
+
+    slide_paths = [slides[str(number)] for number in range(1, len(spec["slides"]) + 1)]
+    pdf_path = None
+    if spec["pdf"]:
+        queue.renew(job["id"])
+        pdf_name = f"{title.replace(' ', '_')}_carousel.pdf"
+        compress_level = 1 if spec["quality"] == "draft" else 6
+        with sink.open(pdf_name) as pdf_file, StreamingPdfWriter(pdf_file, compress_level=compress_level) as pdf:
+            for path in slide_paths:
+                with Image.open(path) as image:
+                    pdf.add_image(image)
+        pdf_path = sink.location(pdf_name)
+
+    carousel_data = {
+        "title": title,
+        "theme": spec["theme"],
+        "seed": seed,
+        "slides": [
+            {"number": number, "heading": slide["heading"], "content": slide["content"], "image_path": path}
+            for number, (slide, path) in enumerate(zip(spec["slides"], slide_paths), 1)
+        ]
+    }
+    json_path = save_carousel_data(carousel_data, title, sink=sink)
+    return {
+        "output_dir": sink.location(),
+        "pdf_path": pdf_path,
+        "json_path": json_path,
+        "slide_paths": slide_paths,
+        "slide_count": len(slide_paths),
+        "resumed_slides": resumed,
+        "seed": seed,
+        "seconds": round(time.perf_counter() - started, 4)
+    }
+
+
+class BatchWorker:
+    """Claims jobs from a JobQueue and renders them until the queue is drained.
+
+    `threads` workers share one warm CarouselGenerator. Results go to
+    `output_dir`, by default `<queue root>/results`, which should be on the
+    same shared storage as the queue when workers run on several machines.
+    """
+
+    def __init__(self, queue, output_dir=None, threads=1, worker_id=None):
+        self.queue = queue
+        self.output_dir = output_dir or os.path.join(queue.root, "results")
+        self.threads = max(1, threads)
+        self.worker_id = worker_id or default_worker_id()
+        self.generator = CarouselGenerator(output_dir=self.output_dir)
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.stats = {"done": 0, "failed": 0, "lost": 0}
+
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def _work(self, worker_id, max_jobs, wait, poll_interval):
+        while not self.stop_event.is_set():
+            with self.lock:
+                if max_jobs is not None and sum(self.stats.values()) >= max_jobs:
+                    return
+            self.queue.requeue_expired()
+            job = self.queue.claim(worker_id)
+            if job is None:
+                if not wait:
+                    return
+                self.stop_event.wait(poll_interval)
+                continue
+            title = job["spec"]["title"]
+            try:
+                result = run_job(self.generator, self.queue, job, self.output_dir, worker_id)
+                self.queue.complete(job, result)
+                self._count("done")
+                print(f"[{worker_id}] Done: {title} ({result['slide_count']} slides, "
+                      f"{result['resumed_slides']} resumed) -> {result['output_dir']}")
+            except LeaseLostError as e:
+                self._count("lost")
+                print(f"[{worker_id}] {e}; another worker took over '{title}'")
+            except Exception as e:
+                self._count("failed")
+                print(f"[{worker_id}] Error rendering '{title}': {e}")
+                try:
+                    self.queue.fail(job, e)
+                except LeaseLostError:
+                    pass
+
+    def run(self, max_jobs=None, wait=False, poll_interval=5.0):
+        """Work until no job is pending (or, with `wait`, until stop() is called)
+
+        Returns counts of jobs done, failed and lost to other workers.
+        """
+        threads = []
+        for i in range(self.threads):
+            worker_id = self.worker_id if self.threads == 1 else f"{self.worker_id}-{i}"
+            thread = threading.Thread(target=self._work, args=(worker_id, max_jobs, wait, poll_interval),
+                                      name=f"batch-worker-{i}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        return dict(self.stats)
+
+    def stop(self):
+        """Stop claiming new jobs; jobs in progress are finished"""
+        self.stop_event.set()
@@ -0,0 +1,317 @@
+import io
+import os
+import json
+import zlib
+import shutil
+import struct
+import subprocess
+from PIL import Image, ImageChops
+
+from .storage import atomic_open, atomic_path
+
+ANIMATION_FORMATS = ("gif", "apng", "mp4")
+DEFAULT_DWELL_MS = 2500
+DEFAULT_CROSSFADE_MS = 600
+DEFAULT_CROSSFADE_FRAMES = 6
+DEFAULT_FPS = 30
+
+# Thumbnail size used to pick the shared GIF palette
+PALETTE_SAMPLE_SIZE = 160
+
+
+def _changed_box(previous, image):
+    """Bounding box of the pixels that differ from the previous frame (1x1 when nothing changed)"""
+    if previous is None:
+        return (0, 0) + image.size
+    return ImageChops.difference(previous, image).getbbox() or (0, 0, 1, 1)
+
+
+class GifWriter:
+    """Write an animated GIF one frame at a time.
+
+    All frames share one global palette, given up front (see
+    shared_palette), so no per-frame tables are stored. Each frame only
+    covers the region that changed since the previous frame, and unchanged
+    pixels inside it are transparent, which keeps crossfades and static
+    slides small. Only the previous frame is kept in memory.
+    """
+
+    def __init__(self, file, size, palette, loop=0):
+        self.file = file
+        self.size = size
+        self.palette_image = Image.new("P", (1, 1))
+        self.palette_image.putpalette(palette)
+        self.previous = None
+        self.file.write(b"GIF89a")
+        # Global color table of 256 entries, 8 bits per channel
+        self.file.write(struct.pack("<HHBBB", size[0], size[1], 0xF7, 0, 0))
+        self.file.write(bytes(palette[:768]).ljust(768, b"\0"))
+        self.file.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\0")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_frame(self, image, duration_ms):
+        frame = image.convert("RGB").quantize(palette=self.palette_image, dither=Image.Dither.NONE)
+        # The palette indices viewed as "L" so frames can be compared index by index
+        indices = Image.frombytes("L", frame.size, frame.tobytes())
+        box = _changed_box(self.previous, indices)
+        region = indices.crop(box)
+        transparent = None
+        if self.previous is not None:
+            counts = region.histogram()
+            unused = [index for index in range(256) if counts[index] == 0]
+            if unused:
+                # Pixels that match the previous frame become a transparent, otherwise unused index
+                transparent = unused[0]
+                same = ImageChops.difference(self.previous.crop(box), region).point(lambda v: 255 if v == 0 else 0)
+                region.paste(transparent, mask=same)
+        self.previous = indices
+
+        delay = max(2, int(round(duration_ms / 10)))
+        flags = (1 << 2) | (1 if transparent is not None else 0)  # keep the previous frame underneath
+        self.file.write(struct.pack("<BBBBHBB", 0x21, 0xF9, 4, flags, delay, transparent or 0, 0))
+        left, top, right, bottom = box
+        self.file.write(struct.pack("<BHHHHB", 0x2C, left, top, right - left, bottom - top, 0))
+        self.file.write(self._encode(region))
+
+    def _encode(self, region):
+        """LZW image data for `region`, taken from a single-frame GIF encoded by Pillow"""
+        buffer = io.BytesIO()
+        Image.frombytes("P", region.size, region.tobytes()).save(buffer, format="GIF", interlace=False,
+                                                                  optimize=False)
+        data = buffer.getvalue()
+        # Skip the header, color tables and extensions up to the image data
+        pos = 13
+        if data[10] & 0x80:
+            pos += 3 * (2 << (data[10] & 7))
+        while data[pos] == 0x21:
+            pos += 2
+            while data[pos]:
+                pos += data[pos] + 1
+            pos += 1
+        flags = data[pos + 9]
+        pos += 10
+        if flags & 0x80:
+            pos += 3 * (2 << (flags & 7))
+        start = pos
+        pos += 1
+        while data[pos]:
+            pos += data[pos] + 1
+        return data[start:pos + 1]
+
+    def close(self):
+        if self.file is not None:
+            self.file.write(b"\x3b")
+            self.file = None
+
+
+def _png_chunk(chunk_type, data):
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+
+
+class ApngWriter:
+    """Write an animated PNG one frame at a time.
+
+    Frames after the first only store the rectangle that changed. The frame
+    count goes in the header, so it must be known up front.
+    """
+
+    def __init__(self, file, size, frame_count, loop=0, compress_level=6):
+        self.file = file
+        self.size = size
+        self.compress_level = compress_level
+        self.sequence = 0
+        self.previous = None
+        self.file.write(b"\x89PNG\r\n\x1a\n")
+        self.file.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", size[0], size[1], 8, 2, 0, 0, 0)))
+        self.file.write(_png_chunk(b"acTL", struct.pack(">II", frame_count, loop)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _next_sequence(self):
+        sequence = self.sequence
+        self.sequence += 1
+        return sequence
+
+    def add_frame(self, image, duration_ms):
+        image = image.convert("RGB")
+        box = _changed_box(self.previous, image)
+        self.previous = image
+        left, top, right, bottom = box
+        self.file.write(_png_chunk(b"fcTL", struct.pack(
+            ">IIIIIHHBB", self._next_sequence(), right - left, bottom - top, left, top,
+            int(round(duration_ms)), 1000, 0, 0)))
+        data = self._encode(image.crop(box))
+        if self.sequence == 1:
+            # The first frame doubles as the default image for viewers without APNG support
+            self.file.write(_png_chunk(b"IDAT", data))
+        else:
+            self.file.write(_png_chunk(b"fdAT", struct.pack(">I", self._next_sequence()) + data))
+
+    def _encode(self, region):
+        """zlib stream of filtered scanlines for `region`, taken from a PNG encoded by Pillow"""
+        buffer = io.BytesIO()
+        region.save(buffer, format="PNG", compress_level=self.compress_level)
+        data = buffer.getvalue()
+        pos = 8
+        parts = []
+        while pos < len(data):
+            length, chunk_type = struct.unpack(">I4s", data[pos:pos + 8])
+            if chunk_type == b"IDAT":
+                parts.append(data[pos + 8:pos + 8 + length])
+            pos += 12 + length
+        return b"".join(parts)
+
+    def close(self):
+        if self.file is not None:
+            self.file.write(_png_chunk(b"IEND", b""))
+            self.file = None
+
+
+class Mp4Writer:
+    """Pipe raw frames to a local ffmpeg, which encodes them as H.264 MP4"""
+
+    def __init__(self, path, size, fps=DEFAULT_FPS):
+        ffmpeg = shutil.which("ffmpeg")
+        if not ffmpeg:
+            raise RuntimeError("MP4 export needs ffmpeg on the PATH; use gif or apng instead")
+        self.size = size
+        self.fps = fps
+        self.process = subprocess.Popen([
+            ffmpeg, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{size[0]}x{size[1]}", "-r", str(fps), "-i", "-",
+            # yuv420p (needed by most players) requires even dimensions
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-c:v", "libx264", "-pix_fmt", "yuv420p",
+            "-movflags", "+faststart", "-f", "mp4", path
+        ], stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+        self.close()
+
+    def add_frame(self, image, duration_ms):
+        data = image.convert("RGB").tobytes()
+        for _ in range(max(1, int(round(duration_ms * self.fps / 1000)))):
+            self.process.stdin.write(data)
+
+    def close(self):
+        if self.process is None:
+            return
+        process, self.process = self.process, None
+        process.stdin.close()
+        errors = process.stderr.read().decode("utf-8", "replace").strip()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed: {errors}")
+
+
+def _load_slide(source, size=None):
+    if hasattr(source, "seek"):
+        # File objects are read once for the palette and again for the frames
+        source.seek(0)
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+    if size and image.size != tuple(size):
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    return image
+
+
+def iter_frames(slide_sources, dwell_ms=DEFAULT_DWELL_MS, crossfade_ms=DEFAULT_CROSSFADE_MS,
+                crossfade_frames=DEFAULT_CROSSFADE_FRAMES, size=None):
+    """Yield (image, duration_ms) for each slide, with crossfade frames between slides
+
+    Slides are loaded one at a time, so at most two are held in memory.
+    """
+    previous = None
+    for source in slide_sources:
+        image = _load_slide(source, size)
+        if previous is not None and crossfade_frames and crossfade_ms:
+            for step in range(1, crossfade_frames + 1):
+                yield Image.blend(previous, image, step / (crossfade_frames + 1)), crossfade_ms / crossfade_frames
+        yield image, dwell_ms
+        previous = image
+
+
+def shared_palette(slide_sources, sample_size=PALETTE_SAMPLE_SIZE):
+    """One 256-color palette for a whole GIF, from thumbnails of every slide and their crossfades"""
+    thumbnails = []
+    for source in slide_sources:
+        thumbnail = _load_slide(source, (sample_size, sample_size))
+        if thumbnails:
+            thumbnails.append(Image.blend(thumbnails[-1], thumbnail, 0.5))
+        thumbnails.append(thumbnail)
+    mosaic = Image.new("RGB", (sample_size * len(thumbnails), sample_size))
+    for i, thumbnail in enumerate(thumbnails):
+        mosaic.paste(thumbnail, (i * sample_size, 0))
+    palette = mosaic.quantize(256, method=Image.Quantize.MEDIANCUT).getpalette()[:768]
+    return palette + [0] * (768 - len(palette))
+
+
+def animate_slides(slide_sources, output_path, animation_format=None, dwell_ms=DEFAULT_DWELL_MS,
+                   crossfade_ms=DEFAULT_CROSSFADE_MS, crossfade_frames=DEFAULT_CROSSFADE_FRAMES,
+                   size=None, fps=DEFAULT_FPS):
+    """Encode slide images (paths or binary files) as an animated GIF, APNG or MP4
+
+    `animation_format` defaults to the output file's extension (".apng" or
+    ".png" for APNG). Each slide shows for `dwell_ms`, with `crossfade_frames` blended
+    frames over `crossfade_ms` between slides. `size` (width, height) scales
+    the frames; by default the first slide's size is used.
+    """
+    slide_sources = list(slide_sources)
+    if not slide_sources:
+        raise ValueError("No slides to animate")
+    if animation_format is None:
+        extension = os.path.splitext(output_path)[1].lower().lstrip(".")
+        animation_format = "apng" if extension == "png" else extension
+    if animation_format not in ANIMATION_FORMATS:
+        raise ValueError(f"Unknown animation format '{animation_format}', expected one of: {', '.join(ANIMATION_FORMATS)}")
+    if size is None:
+        size = _load_slide(slide_sources[0]).size
+    size = tuple(size)
+
+    frames = iter_frames(slide_sources, dwell_ms, crossfade_ms, crossfade_frames, size)
+    if animation_format == "mp4":
+        with atomic_path(output_path) as tmp_path, Mp4Writer(tmp_path, size, fps) as writer:
+            for image, duration_ms in frames:
+                writer.add_frame(image, duration_ms)
+    else:
+        with atomic_open(output_path) as f:
+            if animation_format == "gif":
+                writer = GifWriter(f, size, shared_palette(slide_sources))
+            else:
+                crossfades = crossfade_frames if crossfade_frames and crossfade_ms else 0
+                writer = ApngWriter(f, size, len(slide_sources) + (len(slide_sources) - 1) * crossfades)
+            with writer:
+                for image, duration_ms in frames:
+                    writer.add_frame(image, duration_ms)
+    print(f"Animation saved to: {output_path}")
+    return output_path
+
+
+def animate_carousel_json(json_path, output_path, **options):
+    """Animate the slides listed in a carousel JSON file (see save_carousel_data)"""
+    with open(json_path, "r", encoding="utf-8") as f:
+        carousel_data = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(json_path))
+    slide_paths = []
+    for slide in carousel_data.get("slides", []):
+        path = slide["image_path"]
+        if not os.path.exists(path):
+            # Paths are usually relative to the working directory the carousel was made in;
+            # fall back to the JSON's own directory so moved output folders still work
+            path = os.path.join(base_dir, os.path.basename(path))
+        slide_paths.append(path)
+    return animate_slides(slide_paths, output_path, **options)
@@ -0,0 +1,203 @@
+import os
+import io
+import time
+import asyncio
+import hashlib
+import random
+from abc import ABC, abstractmethod
+from PIL import Image, ImageDraw, ImageFilter
+
+from .storage import atomic_open
+
+DEFAULT_GEMINI_MODEL = "gemini-2.0-flash-exp-image-generation"
+DEFAULT_BACKGROUND_OPACITY = 0.35
+
+THEME_STYLES = {
+    "default": "corporate style with soft blue and green tones",
+    "dark": "modern business style with bold contrasts on a dark navy base",
+    "light": "bright and airy design with subtle pastel colors",
+    "creative": "artistic design with vibrant purple and orange colors",
+    "tech": "digital aesthetic with teal and blue tones and futuristic elements",
+}
+
+
+class BackgroundProvider(ABC):
+    """Base class for background image backends.
+
+    Subclasses implement `generate`, which returns encoded image bytes for a
+    prompt. `model` is part of the cache key, so two backends never share
+    cached images.
+    """
+
+    model = "base"
+
+    @abstractmethod
+    def generate(self, prompt):
+        """Encoded image bytes for `prompt`"""
+
+    async def agenerate(self, prompt):
+        """Run the blocking `generate` on the default executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate, prompt)
+
+
+class GeminiBackgroundProvider(BackgroundProvider):
+    """Generate backgrounds with the Gemini image model (see gemini_example.py)"""
+
+    def __init__(self, model=DEFAULT_GEMINI_MODEL, api_key=None):
+        self.model = model
+        self.api_key = api_key or os.environ.get("GEMINI_API_KEY")
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            from google import genai
+            self._client = genai.Client(api_key=self.api_key)
+        return self._client
+
+    def generate(self, prompt):
+        for inline_data, _ in stream_gemini_response(self._get_client(), self.model, prompt):
+            if inline_data:
+                return inline_data.data
+        raise RuntimeError(f"Gemini returned no image for prompt: {prompt!r}")
+
+
+def stream_gemini_response(client, model, prompt):
+    """Ask a Gemini image model for `prompt` and yield (inline_data, text) for each streamed chunk
+
+    `inline_data` (with `.data` and `.mime_type`) is set for image chunks and
+    None for text chunks. Empty chunks are skipped.
+    """
+    from google.genai import types
+
+    contents = [
+        types.Content(
+            role="user",
+            parts=[
+                types.Part.from_text(text=prompt),
+            ],
+        ),
+    ]
+    generate_content_config = types.GenerateContentConfig(
+        response_modalities=[
+            "image",
+            "text",
+        ],
+        response_mime_type="text/plain",
+    )
+
+    for chunk in client.models.generate_content_stream(
+        model=model,
+        contents=contents,
+        config=generate_content_config,
+    ):
+        if not chunk.candidates or not chunk.candidates[0].content or not chunk.candidates[0].content.parts:
+            continue
+        inline_data = chunk.candidates[0].content.parts[0].inline_data
+        yield (inline_data, None) if inline_data else (None, chunk.text)
+
+
+class StubBackgroundProvider(BackgroundProvider):
+    """Offline provider that draws a deterministic abstract image per prompt.
+
+    `delay` simulates network latency so concurrency can be exercised in
+    tests and benchmarks without an API key.
+    """
+
+    model = "stub"
+
+    def __init__(self, size=(1080, 1080), delay=0.0):
+        self.size = size
+        self.delay = delay
+
+    def generate(self, prompt):
+        if self.delay:
+            time.sleep(self.delay)
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+        # Draw a small image and upscale it; the resize gives the soft, blurred look cheaply
+        width, height = max(1, self.size[0] // 8), max(1, self.size[1] // 8)
+        base = tuple(rng.randint(0, 255) for _ in range(3))
+        image = Image.new("RGB", (width, height), base)
+        draw = ImageDraw.Draw(image)
+        for i in range(12):
+            x, y = rng.randint(0, width), rng.randint(0, height)
+            r = rng.randint(width // 10, width // 3)
+            color = tuple(rng.randint(0, 255) for _ in range(3))
+            draw.ellipse([(x - r, y - r), (x + r, y + r)], fill=color)
+        image = image.filter(ImageFilter.GaussianBlur(radius=2)).resize(self.size, Image.BICUBIC)
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+
+class BackgroundCache:
+    """Content-addressed disk cache of generated backgrounds, keyed by prompt and model"""
+
+    def __init__(self, cache_dir=os.path.join("output", ".background_cache")):
+        self.cache_dir = cache_dir
+
+    def key(self, prompt, model):
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def path_for(self, prompt, model):
+        key = self.key(prompt, model)
+        return os.path.join(self.cache_dir, key[:2], f"{key}.img")
+
+    def get(self, prompt, model):
+        path = self.path_for(prompt, model)
+        return path if os.path.exists(path) else None
+
+    def put(self, prompt, model, data):
+        """Store image bytes atomically and return the cached path"""
+        path = self.path_for(prompt, model)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with atomic_open(path) as f:
+            f.write(data)
+        return path
+
+
+def build_background_prompts(theme_name, slides_content, individual=False, custom_style=None):
+    """Build one background prompt per slide.
+
+    Without `individual`, every slide gets the same theme prompt, so only one
+    image is generated for the whole carousel.
+    """
+    style = custom_style or THEME_STYLES.get(theme_name, THEME_STYLES["default"])
+    theme_prompt = (f"Abstract background for a LinkedIn carousel slide, {style}. "
+                    "No text, no letters, plenty of empty space for overlaid content.")
+    if not individual:
+        return [theme_prompt] * len(slides_content)
+    return [
+        f"{theme_prompt} Subtly inspired by the topic: {slide.get('heading', '')}"
+        for slide in slides_content
+    ]
+
+
+async def generate_backgrounds(prompts, provider, cache=None, concurrency=4):
+    """Generate (or load from cache) a background for every prompt concurrently.
+
+    Duplicate prompts are generated once. Returns cached file paths in the
+    same order as `prompts`.
+    """
+    cache = cache or BackgroundCache()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(prompt):
+        cached = cache.get(prompt, provider.model)
+        if cached:
+            return cached
+        async with semaphore:
+            data = await provider.agenerate(prompt)
+        return cache.put(prompt, provider.model, data)
+
+    unique_prompts = list(dict.fromkeys(prompts))
+    paths = await asyncio.gather(*(fetch(prompt) for prompt in unique_prompts))
+    by_prompt = dict(zip(unique_prompts, paths))
+    return [by_prompt[prompt] for prompt in prompts]
+
+
+def apply_background(template_image, background_path, opacity=DEFAULT_BACKGROUND_OPACITY):
+    """Blend a template over a background image used as the base layer"""
+    with Image.open(background_path) as background:
+        background = background.convert("RGB").resize(template_image.size)
+    return Image.blend(template_image, background, opacity)
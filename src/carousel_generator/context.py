@@ -0,0 +1,87 @@
+from functools import lru_cache
+from types import MappingProxyType
+
+from .themes import get_render_config
+
+# "reference" paints every template from scratch; "lut" recolors a cached role layer (see palette.py)
+TEMPLATE_ENGINES = ("reference", "lut")
+
+
+class RenderContext:
+    """Everything needed to render slides in one look: theme, quality, engine and colors.
+
+    Contexts are immutable, so one can be shared by any number of threads
+    and generators; with_theme and with_palette return new contexts instead
+    of changing this one. Use get_render_context to share warm contexts.
+    """
+
+    def __init__(self, theme_name="default", quality="final", engine="reference", palette=None):
+        if engine not in TEMPLATE_ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of: {', '.join(TEMPLATE_ENGINES)}")
+        config = dict(get_render_config(theme_name, quality))
+        if palette:
+            primary, secondary, accent = palette
+            config.update(primary_color=primary, secondary_color=secondary, accent_color=accent)
+        values = {
+            "theme_name": theme_name,
+            "quality": quality,
+            "engine": engine,
+            "palette": tuple(palette) if palette else None,
+            # Read-only view, so templates and callers cannot change a shared theme by accident
+            "theme_config": MappingProxyType(config),
+            "theme_colors": (config["primary_color"], config["secondary_color"], config["accent_color"]),
+            "template_type": config["template"],
+            # Draft slides favour encoding speed over file size
+            "save_options": MappingProxyType({"compress_level": 1} if quality == "draft" else {})
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RenderContext is immutable; use with_theme or with_palette")
+
+    def __repr__(self):
+        return (f"RenderContext(theme_name={self.theme_name!r}, quality={self.quality!r}, "
+                f"engine={self.engine!r}, palette={self.palette!r})")
+
+    def with_theme(self, theme_name):
+        """The same quality and engine in another theme (custom palettes are dropped)"""
+        return get_render_context(theme_name, self.quality, self.engine)
+
+    def with_palette(self, primary, secondary, accent):
+        """This theme's template and text styling with custom brand colors (RGB tuples)"""
+        return get_render_context(self.theme_name, self.quality, self.engine,
+                                  (tuple(primary), tuple(secondary), tuple(accent)))
+
+
+@lru_cache(maxsize=64)
+def get_render_context(theme_name="default", quality="final", engine="reference", palette=None):
+    """Shared RenderContext for a theme, quality, engine and optional (primary, secondary, accent) palette"""
+    return RenderContext(theme_name, quality, engine, palette)
+
+
+class CarouselJob:
+    """State of one generate_carousel run: its context, sink, seed and the carousel data collected so far
+
+    A job belongs to a single run, so concurrent runs on one generator never
+    share mutable state.
+    """
+
+    def __init__(self, title, context, sink, seed=None):
+        self.title = title
+        self.context = context
+        self.sink = sink
+        self.seed = seed
+        self.slide_paths = []
+        self.carousel_data = {
+            "title": title,
+            "theme": context.theme_name,
+            "seed": seed,
+            "slides": []
+        }
+
+    def add_slide(self, slide):
+        """Record a rendered slide (an item from render_slides)"""
+        self.slide_paths.append(slide["image_path"])
+        self.carousel_data["slides"].append(
+            {key: value for key, value in slide.items() if key not in ("image", "scene")})
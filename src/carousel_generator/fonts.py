@@ -0,0 +1,311 @@
+import struct
+import hashlib
+import threading
+import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
+from PIL import ImageDraw, ImageFont
+
+from .themes import DEFAULT_FALLBACK_FONTS
+from .utils import load_font
+
+# font_for result for characters that belong to the run before them (combining marks, ZWJ, variation selectors)
+ATTACH = -1
+
+
+def _u16(data, offset):
+    return struct.unpack_from(">H", data, offset)[0]
+
+
+def _u32(data, offset):
+    return struct.unpack_from(">I", data, offset)[0]
+
+
+def _cmap_subtables(data, font_index=0):
+    """(platform, encoding, format, offset) of each cmap subtable in a TTF, OTF or TTC font"""
+    base = 0
+    if data[:4] == b"ttcf":
+        base = _u32(data, 12 + 4 * font_index)
+    cmap = None
+    for i in range(_u16(data, base + 4)):
+        record = base + 12 + 16 * i
+        if data[record:record + 4] == b"cmap":
+            cmap = _u32(data, record + 8)
+            break
+    if cmap is None:
+        return []
+    subtables = []
+    for i in range(_u16(data, cmap + 2)):
+        platform, encoding, offset = struct.unpack_from(">HHI", data, cmap + 4 + 8 * i)
+        subtables.append((platform, encoding, _u16(data, cmap + offset), cmap + offset))
+    return subtables
+
+
+def _format4_ranges(data, offset):
+    seg_count = _u16(data, offset + 6) // 2
+    ends = offset + 14
+    starts = ends + 2 * seg_count + 2
+    deltas = starts + 2 * seg_count
+    range_offsets = deltas + 2 * seg_count
+    ranges = []
+    for i in range(seg_count):
+        start, end = _u16(data, starts + 2 * i), _u16(data, ends + 2 * i)
+        delta, range_offset = _u16(data, deltas + 2 * i), _u16(data, range_offsets + 2 * i)
+        if start == 0xFFFF:
+            continue
+        if range_offset == 0:
+            # Every code maps to (code + delta); only the one landing on glyph 0 is missing
+            missing = -delta & 0xFFFF
+            if start <= missing <= end:
+                ranges += [(start, missing - 1), (missing + 1, end)]
+            else:
+                ranges.append((start, end))
+            continue
+        for code in range(start, end + 1):
+            glyph_offset = range_offsets + 2 * i + range_offset + 2 * (code - start)
+            if glyph_offset + 2 <= len(data) and _u16(data, glyph_offset):
+                ranges.append((code, code))
+    return ranges
+
+
+def _format12_ranges(data, offset):
+    ranges = []
+    for i in range(_u32(data, offset + 12)):
+        start, end, glyph = struct.unpack_from(">III", data, offset + 16 + 12 * i)
+        ranges.append((start + 1 if glyph == 0 else start, end))
+    return ranges
+
+
+class CmapCoverage:
+    """Code points a font has glyphs for, read once from its cmap table.
+
+    Coverage is kept as merged, sorted ranges, so `covers` is a binary
+    search however many code points the font maps.
+    """
+
+    def __init__(self, ranges):
+        merged = []
+        for start, end in sorted(r for r in ranges if r[0] <= r[1]):
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+    @classmethod
+    def from_font_data(cls, data, font_index=0):
+        """Coverage from the bytes of a TTF, OTF or TTC font (Unicode cmap formats 4 and 12)"""
+        subtables = _cmap_subtables(data, font_index)
+        # Full-repertoire (format 12) tables include everything the BMP-only ones do
+        for platform, encoding, table_format, offset in subtables:
+            if table_format == 12 and (platform, encoding) in ((3, 10), (0, 4), (0, 6)):
+                return cls(_format12_ranges(data, offset))
+        for platform, encoding, table_format, offset in subtables:
+            if table_format == 4 and (platform == 0 or (platform, encoding) in ((3, 1), (3, 0))):
+                return cls(_format4_ranges(data, offset))
+        return cls([])
+
+    def covers(self, code_point):
+        i = bisect_right(self.starts, code_point) - 1
+        return i >= 0 and code_point <= self.ends[i]
+
+    def __len__(self):
+        return sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+
+
+# Contents of fonts loaded from memory, by sha1, so their coverage can be cached like files
+_font_bytes = {}
+
+
+@lru_cache(maxsize=None)
+def _coverage_for_key(key, font_index):
+    kind, value = key
+    if kind == "path":
+        with open(value, "rb") as f:
+            return CmapCoverage.from_font_data(f.read(), font_index)
+    return CmapCoverage.from_font_data(_font_bytes[value], font_index)
+
+
+def _coverage_key(font):
+    """Cache key for a font's coverage, or None if its data cannot be read"""
+    path = getattr(font, "path", None)
+    font_index = getattr(font, "index", 0)
+    if isinstance(path, str):
+        key = (("path", path), font_index)
+    elif getattr(font, "font_bytes", None):
+        # Fonts loaded from memory (such as Pillow's default font) are keyed by content
+        digest = hashlib.sha1(font.font_bytes).hexdigest()
+        _font_bytes.setdefault(digest, font.font_bytes)
+        key = (("bytes", digest), font_index)
+    else:
+        return None
+    try:
+        _coverage_for_key(*key)
+    except (OSError, struct.error, IndexError):
+        return None
+    return key
+
+
+def font_coverage(font):
+    """CmapCoverage of a FreeType font, built once per font file; None if its data cannot be read"""
+    key = _coverage_key(font)
+    return _coverage_for_key(*key) if key else None
+
+
+@lru_cache(maxsize=None)
+def resolve_font(name):
+    """Full path of an installed font file (as found by ImageFont.truetype), or None"""
+    try:
+        return ImageFont.truetype(name, 10).path
+    except OSError:
+        return None
+
+
+class FallbackIndex:
+    """Which font of a chain draws each character, memoized per character
+
+    The first font whose coverage includes a character wins; characters no
+    font covers stay with the primary font. Shared by every size and thread
+    using the same fonts.
+    """
+
+    def __init__(self, coverages):
+        self.coverages = coverages
+        self.fonts_by_char = {}
+
+    def font_for(self, char):
+        index = self.fonts_by_char.get(char)
+        if index is None:
+            index = self._lookup(char)
+            self.fonts_by_char[char] = index
+        return index
+
+    def _lookup(self, char):
+        if unicodedata.category(char) in ("Mn", "Me", "Cf") or 0xFE00 <= ord(char) <= 0xFE0F:
+            return ATTACH
+        code_point = ord(char)
+        for index, coverage in enumerate(self.coverages):
+            # Unknown coverage: assume the font has everything
+            if coverage is None or coverage.covers(code_point):
+                return index
+        return 0
+
+
+@lru_cache(maxsize=64)
+def _fallback_index(keys):
+    return FallbackIndex([_coverage_for_key(*key) if key else None for key in keys])
+
+
+class FontChain:
+    """A primary font plus fallbacks for characters it has no glyph for.
+
+    Text is split into runs that each use one font (one memoized lookup
+    per character); measuring and drawing work run by run. Text the
+    primary font fully covers is drawn with a single call, exactly as
+    before. The chain's `size` lets recording canvases treat it like a font.
+    """
+
+    def __init__(self, fonts, fallbacks=()):
+        self.fonts = fonts
+        self.primary = fonts[0]
+        self.size = getattr(self.primary, "size", None)
+        self.fallbacks = tuple(fallbacks)
+        self.index = _fallback_index(tuple(_coverage_key(font) for font in fonts))
+
+    def segment(self, text):
+        """Split `text` into (font, run) pairs"""
+        runs = []
+        for char in text:
+            index = self.index.font_for(char)
+            if index == ATTACH:
+                index = runs[-1][0] if runs else 0
+            if runs and runs[-1][0] == index:
+                runs[-1][1].append(char)
+            else:
+                runs.append((index, [char]))
+        return [(self.fonts[index], "".join(chars)) for index, chars in runs]
+
+    def getlength(self, text):
+        return sum(font.getlength(run) for font, run in self.segment(text))
+
+    def getbbox(self, text):
+        """Bounding box of `text` drawn at (0, 0) with the default "la" anchor"""
+        runs = self.segment(text)
+        if len(runs) == 1:
+            return runs[0][0].getbbox(text)
+        baseline = self.primary.getmetrics()[0]
+        left = top = right = bottom = None
+        x = 0.0
+        for font, run in runs:
+            box = font.getbbox(run, anchor="ls")
+            left = x + box[0] if left is None else min(left, x + box[0])
+            top = baseline + box[1] if top is None else min(top, baseline + box[1])
+            right = x + box[2] if right is None else max(right, x + box[2])
+            bottom = baseline + box[3] if bottom is None else max(bottom, baseline + box[3])
+            x += font.getlength(run)
+        return (left, top, right, bottom)
+
+    def draw(self, draw, xy, text, fill=None, anchor=None):
+        runs = self.segment(text)
+        if len(runs) == 1:
+            draw.text(xy, text, fill=fill, font=runs[0][0], anchor=anchor)
+            return
+        # Place the whole line by the primary font's metrics, then draw each run on a shared baseline
+        horizontal, vertical = (anchor or "la")
+        x, y = xy
+        if horizontal == "m":
+            x -= self.getlength(text) / 2
+        elif horizontal == "r":
+            x -= self.getlength(text)
+        ascent, descent = self.primary.getmetrics()
+        if vertical in ("a", "t"):
+            y += ascent
+        elif vertical == "m":
+            y += (ascent - descent) / 2
+        elif vertical in ("d", "b"):
+            y -= descent
+        for font, run in runs:
+            draw.text((x, y), run, fill=fill, font=font, anchor="ls")
+            x += font.getlength(run)
+
+
+_chains = threading.local()
+
+
+def _load_fallback(path, size):
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        # Bitmap-only fonts (such as some color emoji fonts) only load at fixed sizes
+        return None
+
+
+def load_font_chain(size, fallbacks=DEFAULT_FALLBACK_FONTS):
+    """load_font(size) followed by whichever `fallbacks` are installed, cached per thread"""
+    fallbacks = tuple(fallbacks or ())
+    cache = getattr(_chains, "cache", None)
+    if cache is None:
+        cache = _chains.cache = {}
+    chain = cache.get((size, fallbacks))
+    if chain is None:
+        fonts = [load_font(size)]
+        for name in fallbacks:
+            path = resolve_font(name)
+            font = _load_fallback(path, size) if path else None
+            if font is not None:
+                fonts.append(font)
+        chain = cache[(size, fallbacks)] = FontChain(fonts, fallbacks)
+    return chain
+
+
+def draw_text(draw, xy, text, fill=None, font=None, anchor=None):
+    """Draw `text` with a font or FontChain on any ImageDraw-like canvas
+
+    Pillow canvases get per-font runs; recording canvases (scenes, LUT
+    layers) receive the call unchanged and rasterize it later.
+    """
+    if isinstance(font, FontChain) and isinstance(draw, ImageDraw.ImageDraw):
+        font.draw(draw, xy, text, fill=fill, anchor=anchor)
+    else:
+        draw.text(xy, text, fill=fill, font=font, anchor=anchor)
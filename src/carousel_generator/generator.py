@@ -1,131 +1,516 @@
+import io
 import os
-import json
-from PIL import Image, ImageDraw, ImageFont
-from dotenv import load_dotenv
+import time
+import threading
+from contextlib import ExitStack
+from functools import lru_cache, partial
+from collections.abc import Sequence
+from PIL import Image, ImageDraw
 
 # Use relative imports within the package
-from .themes import get_theme_config, get_available_themes
-from .utils import (create_output_dir, create_pdf, save_carousel_data, 
-                   draw_icon, select_icon, add_slide_number_indicator)
-from .templates import TEMPLATE_FACTORIES, create_gradient_template
+from .themes import get_available_themes
+from .utils import create_output_dir, save_carousel_data, draw_icon, select_icon, scale_px
+from .templates import (TEMPLATE_FACTORIES, TEMPLATE_PAINTERS, create_gradient_template, draw_gradient_template,
+                        carousel_seed, slide_rng, slide_seed)
+from .scene import SceneRecorder
+from .svg_renderer import render_scene_svg
+from .pdf_stream import StreamingPdfWriter
+from .pdf_vector import VectorPdfWriter
+from .pipeline import SlideWritePipeline
+from .palette import RECOLORABLE_TEMPLATES, get_template_layer
+from .fonts import draw_text, load_font_chain
+from .storage import carousel_namespace
+from .sinks import LocalDirectorySink
+from .context import CarouselJob, get_render_context
+
+PDF_MODES = ("raster", "vector")
+SLIDE_FORMATS = ("png", "svg")
+
+@lru_cache(maxsize=256)
+def layout_slide_content(heading, content, slide_size, heading_font_size, content_font_size, scale=1):
+    """Place a slide's heading, icon and bullet points
+
+    Nothing here depends on colors or templates, so themes (and repeated
+    renders) with the same slide and font sizes share one cached layout.
+    Callers must not modify the returned dict.
+    """
+    width, height = slide_size
+    bullet_size = max(2, scale_px(10, scale))
+    bullet_gap = scale_px(10, scale)
+    bullets = []
+    y_position = height//2.5
+    for line in content.split('\n'):
+        if line.strip():
+            bullet_box = ((width//3 - bullet_size - bullet_gap, y_position + content_font_size//2 - bullet_size//2),
+                          (width//3 - bullet_gap, y_position + content_font_size//2 + bullet_size//2))
+            bullets.append((bullet_box, (width//3, y_position), line.strip()))
+            y_position += content_font_size + scale_px(20, scale)
+    return {
+        "heading_position": (width//2, height//6),
+        "icon": select_icon(heading),
+        "icon_position": (width//6, height//2.5),
+        "icon_size": scale_px(120, scale),
+        "bullets": tuple(bullets)
+    }
+
+def _uses_template_layers(context):
+    """Whether `context` recolors cached template layers instead of painting templates (see palette.py)"""
+    return context.engine == "lut" and context.template_type in RECOLORABLE_TEMPLATES
+
+class GenerationCancelled(Exception):
+    """Raised by generate_carousel when its cancel_event is set"""
 
-load_dotenv()
 
 class CarouselGenerator:
-    def __init__(self, theme="default", output_dir="output"):
+    """Renders carousels from a shared, immutable RenderContext (see context.py)
+
+    Per-run state lives in a CarouselJob, so one warm generator can serve
+    concurrent generate_carousel calls from several threads. Methods take
+    an optional `context` to render in another look without touching the
+    generator's default; set_theme and set_palette only swap that default.
+    """
+
+    def __init__(self, theme="default", output_dir="output", quality="final", sink=None, engine="reference"):
+        """`quality` is "final" for full-size output or "draft" for fast, scaled-down previews
+
+        Files are written to `sink` (see sinks.py) when given; otherwise to
+        output_dir, which is then created. `engine` is one of TEMPLATE_ENGINES.
+        """
+        self.context = get_render_context(theme, quality, engine)
+        # Data of the most recently finished carousel, kept for existing callers
         self.carousel_data = {}
         self.output_dir = output_dir
-        self.set_theme(theme)
-        create_output_dir(self.output_dir)
+        self.sink = sink
+        if sink is None:
+            create_output_dir(self.output_dir)
+
+    # Read-only views of the default context
+    theme_name = property(lambda self: self.context.theme_name)
+    quality = property(lambda self: self.context.quality)
+    engine = property(lambda self: self.context.engine)
+    theme_config = property(lambda self: self.context.theme_config)
+    theme_colors = property(lambda self: self.context.theme_colors)
+    template_type = property(lambda self: self.context.template_type)
+    save_options = property(lambda self: self.context.save_options)
+
+    def get_sink(self):
+        """The sink files are written to: `sink`, or a local sink over output_dir"""
+        return self.sink if self.sink is not None else LocalDirectorySink(self.output_dir)
+
+    def encode_png(self, image, context=None):
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", **(context or self.context).save_options)
+        return buffer.getvalue()
 
     def set_theme(self, theme_name):
-        self.theme_name = theme_name
-        self.theme_config = get_theme_config(theme_name)
-        self.theme_colors = (
-            self.theme_config["primary_color"],
-            self.theme_config["secondary_color"],
-            self.theme_config["accent_color"]
-        )
-        self.template_type = self.theme_config["template"]
+        """Make `theme_name` the default look; runs already in progress keep theirs"""
+        self.context = self.context.with_theme(theme_name)
 
-    def generate_template(self, slide_number):
-        """Generate a slide template based on the theme"""
-        template_func = TEMPLATE_FACTORIES.get(self.template_type, create_gradient_template)
-        return template_func(slide_number, self.theme_config, self.theme_colors)
+    def set_palette(self, primary, secondary, accent):
+        """Use custom brand colors (RGB tuples) with the current theme's template and text styling"""
+        self.context = self.context.with_palette(primary, secondary, accent)
+
+    def generate_template(self, slide_number, background_path=None, context=None, seed=None):
+        """Generate a slide template based on the theme, optionally over a background image
+
+        With a `seed` the template's random elements depend only on it and the
+        slide number; without one they come from the global random module.
+        The "lut" engine paints templates it cannot recolor exactly (see
+        palette.RECOLORABLE_TEMPLATES) like "reference".
+        """
+        context = context or self.context
+        if _uses_template_layers(context):
+            layer = get_template_layer(context.template_type, slide_number, context.theme_config, seed)
+            image = layer.recolor(context.theme_colors)
+        else:
+            template_func = TEMPLATE_FACTORIES.get(context.template_type, create_gradient_template)
+            image = template_func(slide_number, context.theme_config, context.theme_colors,
+                                  slide_rng(seed, slide_number))
+        if background_path:
+            from .backgrounds import apply_background
+            image = apply_background(image, background_path)
+        return image
+
+    def draw_slide_content(self, draw, heading, content, custom_text_color=None, context=None):
+        """Draw the heading, icon and bullet points onto any ImageDraw-like canvas"""
+        theme_config = (context or self.context).theme_config
+        text_color = custom_text_color if custom_text_color else theme_config["text_color"]
+        fallback_fonts = theme_config.get("fallback_fonts")
+        heading_font = load_font_chain(theme_config["heading_font_size"], fallback_fonts)
+        content_font = load_font_chain(theme_config["content_font_size"], fallback_fonts)
+        layout = layout_slide_content(
+            heading, content,
+            theme_config["slide_size"],
+            theme_config["heading_font_size"],
+            theme_config["content_font_size"],
+            theme_config.get("scale", 1)
+        )
 
-    def create_slide(self, heading, content, slide_number, logo_path=None, custom_text_color=None):
-        """Create a slide using a template"""
-        image = self.generate_template(slide_number)
-        draw = ImageDraw.Draw(image)
-        
-        text_color = custom_text_color if custom_text_color else self.theme_config["text_color"]
-        heading_font_size = self.theme_config["heading_font_size"]
-        content_font_size = self.theme_config["content_font_size"]
-        
-        try:
-            heading_font = ImageFont.truetype("arial.ttf", heading_font_size)
-            content_font = ImageFont.truetype("arial.ttf", content_font_size)
-        except IOError:
-            heading_font = ImageFont.load_default()
-            content_font = ImageFont.load_default()
-        
-        width, height = self.theme_config["slide_size"]
-        
         # Add heading (centered)
-        draw.text((width//2, height//6), heading, fill=text_color, font=heading_font, anchor="mm")
-        
+        draw_text(draw, layout["heading_position"], heading, fill=text_color, font=heading_font, anchor="mm")
+
         # Draw icon
-        icon_type = select_icon(heading)
-        draw_icon(
-            draw,
-            icon_type,
-            (width//6, height//2.5),
-            120,
-            self.theme_config["accent_color"]
-        )
-        
+        draw_icon(draw, layout["icon"], layout["icon_position"], layout["icon_size"],
+                  theme_config["accent_color"])
+
         # Add content as bullet points
-        y_position = height//2.5
-        content_lines = content.split('\n')
-        for line in content_lines:
-            if line.strip():
-                bullet_size = 10
-                draw.ellipse(
-                    [(width//3 - bullet_size - 10, y_position + content_font_size//2 - bullet_size//2),
-                     (width//3 - 10, y_position + content_font_size//2 + bullet_size//2)],
-                    fill=text_color
-                )
-                draw.text((width//3, y_position), line.strip(), fill=text_color, font=content_font)
-                y_position += content_font_size + 20
-        
+        for bullet_box, text_position, line in layout["bullets"]:
+            draw.ellipse(bullet_box, fill=text_color)
+            draw_text(draw, text_position, line, fill=text_color, font=content_font)
+
+    def render_slide(self, heading, content, slide_number, logo_path=None, custom_text_color=None,
+                     background_path=None, context=None, seed=None):
+        """Render a slide to a PIL image without saving it
+
+        Templates are seeded from `seed`, normally the carousel's (see
+        templates.carousel_seed); it defaults to one derived from the slide's
+        heading and content, so the same slide always renders the same.
+        """
+        context = context or self.context
+        if seed is None:
+            seed = slide_seed(heading, content)
+        image = self.generate_template(slide_number, background_path, context, seed)
+        self.draw_slide_content(ImageDraw.Draw(image), heading, content, custom_text_color, context)
+
+        width, height = context.theme_config["slide_size"]
+        scale = context.theme_config.get("scale", 1)
+
         # Add logo
         if logo_path and os.path.exists(logo_path):
             try:
                 logo = Image.open(logo_path).convert("RGBA") # Ensure RGBA for transparency
-                logo = logo.resize((100, 100))
-                image.paste(logo, (width - 120, height - 120), logo)
+                logo_size = scale_px(100, scale)
+                logo = logo.resize((logo_size, logo_size))
+                logo_offset = scale_px(120, scale)
+                image.paste(logo, (width - logo_offset, height - logo_offset), logo)
             except Exception as e:
                 print(f"Error adding logo: {e}")
+
+        return image
+
+    def create_slide(self, heading, content, slide_number, logo_path=None, custom_text_color=None,
+                     background_path=None, context=None, seed=None):
+        """Create a slide using a template (`seed` as in render_slide)"""
+        image = self.render_slide(heading, content, slide_number, logo_path, custom_text_color, background_path,
+                                  context, seed)
         
         # Save the slide
-        slide_path = os.path.join(self.output_dir, f"slide_{slide_number}.png")
-        image.save(slide_path)
-        return slide_path
-
-    def generate_carousel(self, title, slides_content, logo_path=None, custom_text_color=None):
-        """Generate a full LinkedIn carousel"""
-        self.carousel_data = {
-            "title": title,
-            "theme": self.theme_name,
-            "slides": []
-        }
-        
-        slide_paths = []
+        return self.get_sink().write(f"slide_{slide_number}.png", self.encode_png(image, context))
+
+    def build_scene(self, heading, content, slide_number, logo_path=None, custom_text_color=None,
+                    background_path=None, context=None, seed=None):
+        """Lay out a slide once as a resolution-independent SceneRecorder (`seed` as in render_slide)"""
+        context = context or self.context
+        if seed is None:
+            seed = slide_seed(heading, content)
+        scene = SceneRecorder(context.theme_config["slide_size"])
+        painter = TEMPLATE_PAINTERS.get(context.template_type, draw_gradient_template)
+        painter(scene, slide_number, context.theme_config, context.theme_colors, slide_rng(seed, slide_number))
+        if background_path:
+            from .backgrounds import DEFAULT_BACKGROUND_OPACITY
+            scene.background(background_path, DEFAULT_BACKGROUND_OPACITY)
+        self.draw_slide_content(scene, heading, content, custom_text_color, context)
+
+        if logo_path and os.path.exists(logo_path):
+            width, height = context.theme_config["slide_size"]
+            scale = context.theme_config.get("scale", 1)
+            logo_margin = scale_px(20, scale)
+            scene.logo(logo_path, (width - logo_margin, height - logo_margin), scale_px(100, scale))
+        return scene
+
+    def export_sizes(self, title, slides_content, sizes, logo_path=None, custom_text_color=None,
+                     background_paths=None, namespace=True, dedupe=True, context=None, sink=None, seed=None):
+        """Render every slide at several sizes, laying each slide out only once
+
+        `sizes` is a list of (width, height) tuples. Returns a dict mapping
+        "WIDTHxHEIGHT" to the list of slide paths written for that size.
+        `seed` defaults to one derived from the title and slides; `namespace`,
+        `dedupe`, `context` and `sink` work as in generate_carousel.
+        """
+        context = context or self.context
+        if seed is None:
+            seed = carousel_seed(title, slides_content)
+        sink = sink or self.get_sink()
+        if namespace:
+            settings = [context.theme_name, context.theme_colors, context.engine, context.quality, logo_path,
+                        custom_text_color, background_paths, sizes, seed]
+            sink = sink.child(carousel_namespace(title, settings, slides_content))
+        size_names = [f"{width}x{height}" for width, height in sizes]
+        exported = {name: [] for name in size_names}
+        for i, slide in enumerate(slides_content, 1):
+            background_path = background_paths[i - 1] if background_paths else None
+            scene = self.build_scene(slide.get("heading", ""), slide.get("content", ""), i,
+                                     logo_path, custom_text_color, background_path, context, seed)
+            for name, image in zip(size_names, scene.rasterize(sizes)):
+                exported[name].append(sink.write(f"slide_{i}_{name}.png", self.encode_png(image, context), dedupe))
+        print(f"Exported {title} at {', '.join(size_names)} to: {sink.location()}")
+        return exported
+
+    def render_slides(self, slides_content, logo_path=None, custom_text_color=None, background_paths=None,
+                      with_scenes=False, slide_format="png", sink=None, context=None, seed=None):
+        """Render slides one at a time without saving them (see iter_slides)
+
+        `image_path` is the slide's location in `sink`, which defaults to get_sink().
+        Slide templates are seeded from `seed` and their number (see generate_template);
+        without a `seed` each slide uses its own default (see render_slide).
+        """
+        context = context or self.context
+        sink = sink or self.get_sink()
+        if slide_format not in SLIDE_FORMATS:
+            raise ValueError(f"Unknown slide_format '{slide_format}', expected one of: {', '.join(SLIDE_FORMATS)}")
         for i, slide in enumerate(slides_content, 1):
-            slide_path = self.create_slide(
-                slide.get("heading", ""),
-                slide.get("content", ""),
-                i,
-                logo_path,
-                custom_text_color
-            )
-            slide_paths.append(slide_path)
-            
-            self.carousel_data["slides"].append({
+            heading = slide.get("heading", "")
+            content = slide.get("content", "")
+            background_path = background_paths[i - 1] if background_paths else None
+            scene = None
+            image = None
+            if with_scenes or slide_format == "svg":
+                scene = self.build_scene(heading, content, i, logo_path, custom_text_color, background_path,
+                                         context, seed)
+            if slide_format != "svg":
+                if scene is not None and not _uses_template_layers(context):
+                    # At the slide's own size the scene rasterizes to exactly the painted slide, so it is not painted twice
+                    image = scene.rasterize([scene.size])[0]
+                else:
+                    image = self.render_slide(heading, content, i, logo_path, custom_text_color, background_path,
+                                              context, seed)
+            item = {
                 "number": i,
-                "heading": slide.get("heading", ""),
-                "content": slide.get("content", ""),
-                "image_path": slide_path
-            })
-        
-        pdf_path = create_pdf(slide_paths, title, self.output_dir)
-        json_path = save_carousel_data(self.carousel_data, title, self.output_dir)
+                "heading": heading,
+                "content": content,
+                "image_path": sink.location(f"slide_{i}.{slide_format}"),
+                "image": image
+            }
+            if scene is not None:
+                item["scene"] = scene
+            yield item
+
+    def save_slide(self, slide, sink=None, dedupe=False, context=None):
+        """Write a rendered slide (an item from render_slides) as slide_{number} to `sink`
+
+        `sink` defaults to get_sink(); with `dedupe`, sinks that support it store
+        identical files once.
+        """
+        if slide["image"] is None:
+            name, data = f"slide_{slide['number']}.svg", render_scene_svg(slide["scene"]).encode("utf-8")
+        else:
+            name, data = f"slide_{slide['number']}.png", self.encode_png(slide["image"], context)
+        return (sink or self.get_sink()).write(name, data, dedupe)
+
+    def iter_slides(self, title, slides_content, logo_path=None, custom_text_color=None, background_paths=None,
+                    with_scenes=False, slide_format="png", namespace=True, dedupe=True, context=None, sink=None,
+                    seed=None):
+        """Render and save slides one at a time, yielding each as soon as it is ready
+
+        Each item is the slide's metadata plus its rendered `image`. Nothing is
+        kept between iterations, so `slides_content` can be any iterable and
+        memory use does not grow with the number of slides. With `with_scenes`
+        each slide is also laid out as a scene, included in the item, and `image`
+        is rasterized from it; it is the same image either way. With `slide_format="svg"` slides are written as
+        SVG from their scene and `image` is None. `namespace`, `dedupe`,
+        `context`, `sink` and `seed` work as in generate_carousel.
+        """
+        context = context or self.context
+        if seed is None:
+            seed = carousel_seed(title, slides_content)
+        sink = sink or self.get_sink()
+        if namespace:
+            settings = [context.theme_name, context.theme_colors, context.engine, context.quality, logo_path,
+                        custom_text_color, background_paths, slide_format, seed]
+            sink = sink.child(carousel_namespace(title, settings, slides_content))
+        for slide in self.render_slides(slides_content, logo_path, custom_text_color, background_paths,
+                                        with_scenes=with_scenes, slide_format=slide_format, sink=sink,
+                                        context=context, seed=seed):
+            self.save_slide(slide, sink, dedupe, context)
+            yield slide
+
+    def generate_carousel(self, title, slides_content, logo_path=None, custom_text_color=None,
+                          background_paths=None, pdf=None, pdf_mode="raster", slide_format="png",
+                          writer_threads=4, max_pending=8, namespace=True, dedupe=True,
+                          progress=None, cancel_event=None, context=None, sink=None, seed=None):
+        """Generate a full LinkedIn carousel
+
+        `background_paths` optionally gives one background image per slide
+        (see backgrounds.generate_backgrounds) to use as the template base layer.
+        `pdf` defaults to True for final quality and False for drafts.
+        `pdf_mode` is "raster" (one image per page) or "vector" (shapes and
+        selectable text drawn directly, see pdf_vector.py). `slide_format` is "png"
+        or "svg" for the individual slide files.
+
+        Slides are saved and PDF pages appended by `writer_threads` background
+        writers while the next slide renders, with at most `max_pending` slides
+        waiting to be written. The result's "timings" report how long each
+        stage took ("write_seconds" adds up all writer threads, "write_busy_seconds"
+        is the wall time any of them was writing) and how much of the writing
+        overlapped with rendering.
+
+        Files go to get_sink(). With `namespace` the carousel gets its own
+        directory there (see storage.carousel_namespace), returned as
+        "output_dir". Files only appear once complete (locally they are written
+        to a temporary name and renamed into place), so concurrent runs into
+        the same output directory never see partial files. With `dedupe`
+        byte-identical slides across carousels are stored once in
+        `<output_dir>/.blobs` and hardlinked.
+
+        `progress` is called with an event dict after each slide is rendered.
+        Setting `cancel_event` (a threading.Event) stops generation after the
+        current slide with GenerationCancelled; the partial PDF is discarded.
+
+        `context` (a RenderContext) and `sink` override the generator's
+        defaults for this run only. The run captures both when it starts and
+        keeps its state in a CarouselJob, so concurrent calls on one
+        generator never mix results.
+
+        Template random elements are drawn from `seed`, which defaults to one
+        derived from the title and slides, so identical input gives
+        byte-identical slides, PDF and JSON. The seed is recorded in the JSON
+        and the result; pass it back to reproduce a carousel.
+        """
+        if pdf_mode not in PDF_MODES:
+            raise ValueError(f"Unknown pdf_mode '{pdf_mode}', expected one of: {', '.join(PDF_MODES)}")
+        context = context or self.context
+        if pdf is None:
+            pdf = context.quality != "draft"
+        if seed is None:
+            seed = carousel_seed(title, slides_content)
         
+        started = time.perf_counter()
+        total = len(slides_content) if isinstance(slides_content, Sequence) else None
+        sink = sink or self.get_sink()
+        if namespace:
+            settings = [context.theme_name, context.theme_colors, context.engine, context.quality, logo_path,
+                        custom_text_color, background_paths, pdf, pdf_mode, slide_format, seed]
+            sink = sink.child(carousel_namespace(title, settings, slides_content))
+        job = CarouselJob(title, context, sink, seed)
+
+        vector = pdf and pdf_mode == "vector"
+        slides = self.render_slides(slides_content, logo_path, custom_text_color, background_paths,
+                                    with_scenes=vector, slide_format=slide_format, sink=sink, context=context,
+                                    seed=seed)
+        pdf_path = None
+        render_seconds = 0.0
+        # Unwinds in reverse: wait for pending writes, finish the PDF, then commit it to the sink
+        with ExitStack() as stack:
+            add_page = None
+            if pdf:
+                pdf_name = f"{title.replace(' ', '_')}_carousel.pdf"
+                pdf_path = sink.location(pdf_name)
+                pdf_file = stack.enter_context(sink.open(pdf_name))
+                if vector:
+                    pdf_writer = stack.enter_context(VectorPdfWriter(pdf_file))
+                    add_page = lambda slide: pdf_writer.add_scene(slide["scene"])
+                else:
+                    pdf_writer = stack.enter_context(
+                        StreamingPdfWriter(pdf_file, compress_level=1 if context.quality == "draft" else 6))
+
+                    def add_page(slide):
+                        image = slide["image"]
+                        if image is None:
+                            image = slide["scene"].rasterize([slide["scene"].size])[0]
+                        pdf_writer.add_image(image)
+
+            save = lambda slide: self.save_slide(slide, sink, dedupe, context)
+            pipeline = stack.enter_context(SlideWritePipeline(save, add_page, writer_threads, max_pending))
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise GenerationCancelled(f"Generation of '{title}' was cancelled")
+                render_start = time.perf_counter()
+                slide = next(slides, None)
+                render_seconds += time.perf_counter() - render_start
+                if slide is None:
+                    break
+                pipeline.submit(slide)
+                job.add_slide(slide)
+                if progress:
+                    progress({"event": "slide", "number": slide["number"], "total": total,
+                              "image_path": slide["image_path"]})
+        if pdf_path:
+            print(f"PDF saved to: {pdf_path}")
+
+        json_path = save_carousel_data(job.carousel_data, title, sink=sink)
+        self.carousel_data = job.carousel_data
+
+        wall_seconds = time.perf_counter() - started
         return {
+            "output_dir": sink.location(),
             "pdf_path": pdf_path,
             "json_path": json_path,
-            "slide_paths": slide_paths
+            "slide_paths": job.slide_paths,
+            "seed": seed,
+            "timings": {
+                "render_seconds": round(render_seconds, 4),
+                "write_seconds": round(pipeline.write_seconds, 4),
+                "stall_seconds": round(pipeline.stall_seconds, 4),
+                "write_busy_seconds": round(pipeline.busy_seconds, 4),
+                "wall_seconds": round(wall_seconds, 4),
+                # Wall time spent rendering and writing at once, i.e. writing hidden behind rendering
+                "overlap_seconds": round(min(pipeline.busy_seconds,
+                                             max(0.0, render_seconds + pipeline.busy_seconds - wall_seconds)), 4)
+            }
         }
 
+    async def create_slide_async(self, heading, content, slide_number, logo_path=None, custom_text_color=None,
+                                 background_path=None, executor=None, seed=None):
+        """Coroutine version of create_slide
+
+        Rendering runs on `executor` (the loop's default executor when None)
+        and the file is written on the default executor, so the event loop is
+        never blocked.
+        """
+        import asyncio  # Only loaded by async callers, keeping the CLI's startup light
+        loop = asyncio.get_running_loop()
+        context = self.context
+        image = await loop.run_in_executor(executor, partial(
+            self.render_slide, heading, content, slide_number, logo_path, custom_text_color, background_path, context,
+            seed))
+        return await loop.run_in_executor(None, partial(
+            self.save_slide, {"number": slide_number, "image": image}, context=context))
+
+    async def generate_carousel_events(self, title, slides_content, executor=None, **options):
+        """Run generate_carousel on `executor` and yield its progress as it happens
+
+        Yields {"event": "slide", "number", "total", "image_path"} for every
+        slide, then {"event": "done", "result": ...} with the generate_carousel
+        result; `options` are passed to generate_carousel. If the consuming
+        task is cancelled or the iterator is closed early, rendering stops
+        after the slide in progress. One generator can serve concurrent
+        requests; pass `context` or `sink` in `options` to vary them per request.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+        cancel_event = threading.Event()
+
+        def progress(event):
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        future = loop.run_in_executor(executor, partial(
+            self.generate_carousel, title, slides_content, progress=progress, cancel_event=cancel_event, **options))
+        try:
+            while not future.done():
+                next_event = asyncio.ensure_future(events.get())
+                await asyncio.wait({next_event, future}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event.done():
+                    yield next_event.result()
+                else:
+                    next_event.cancel()
+            # Events are queued before the result is delivered, so none are left behind
+            while not events.empty():
+                yield events.get_nowait()
+            yield {"event": "done", "result": future.result()}
+        finally:
+            if not future.done():
+                cancel_event.set()
+                # The worker cleans up on its own; retrieve its GenerationCancelled so it is not reported as unhandled
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    async def generate_carousel_async(self, title, slides_content, executor=None, **options):
+        """Coroutine version of generate_carousel (see generate_carousel_events)"""
+        result = None
+        async for event in self.generate_carousel_events(title, slides_content, executor, **options):
+            if event["event"] == "done":
+                result = event["result"]
+        return result
+
     def get_available_themes(self):
         return get_available_themes() 
\ No newline at end of file
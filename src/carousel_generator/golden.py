@@ -0,0 +1,177 @@
+import os
+import json
+import hashlib
+from PIL import Image, ImageChops, ImageDraw
+
+from .generator import CarouselGenerator
+from .context import get_render_context
+from .themes import get_available_themes, get_render_config
+from .templates import TEMPLATE_FACTORIES, TEMPLATE_PAINTERS, slide_rng
+from .palette import RECOLORABLE_TEMPLATES, get_template_layer
+from .scene import SceneRecorder
+from .sinks import MemorySink
+from .utils import ICON_TYPES, draw_icon
+
+# "reference" is the plain implementation, "lut" recolors cached template
+# layers (palette.py) and "scene" rasterizes a recorded display list (scene.py)
+GOLDEN_ENGINES = ("reference", "lut", "scene")
+DEFAULT_SEED = 1234
+MANIFEST_NAME = "manifest.json"
+GOLDEN_SLIDE_NUMBERS = (1, 2, 3)
+GOLDEN_SLIDE = {"heading": "Key data for growth", "content": "First point\nSecond point\nThird point"}
+ICON_CANVAS = 240
+
+
+def golden_cases(themes=None, slide_numbers=GOLDEN_SLIDE_NUMBERS):
+    """(name, kind, params) for every golden image: full slides per theme, bare templates and icons"""
+    cases = []
+    for theme in themes or get_available_themes():
+        for number in slide_numbers:
+            cases.append((f"slide-{theme}-{number}", "slide", {"theme": theme, "number": number}))
+    for template_type in sorted(TEMPLATE_FACTORIES):
+        for number in slide_numbers:
+            cases.append((f"template-{template_type}-{number}", "template",
+                          {"template": template_type, "number": number}))
+    for icon_type in ICON_TYPES:
+        cases.append((f"icon-{icon_type}", "icon", {"icon": icon_type}))
+    return cases
+
+
+def _render_slide(params, engine, quality, seed):
+    context = get_render_context(params["theme"], quality, "lut" if engine == "lut" else "reference")
+    generator = CarouselGenerator(sink=MemorySink())
+    if engine == "scene":
+        scene = generator.build_scene(GOLDEN_SLIDE["heading"], GOLDEN_SLIDE["content"], params["number"],
+                                      context=context, seed=seed)
+        return scene.rasterize([scene.size])[0]
+    return generator.render_slide(GOLDEN_SLIDE["heading"], GOLDEN_SLIDE["content"], params["number"],
+                                  context=context, seed=seed)
+
+
+def _render_template(params, engine, quality, seed):
+    # Each template with the default theme's colors and sizes
+    config = dict(get_render_config("default", quality), template=params["template"])
+    colors = (config["primary_color"], config["secondary_color"], config["accent_color"])
+    number = params["number"]
+    if engine == "lut" and params["template"] in RECOLORABLE_TEMPLATES:
+        return get_template_layer(params["template"], number, config, seed).recolor(colors)
+    if engine == "scene":
+        scene = SceneRecorder(config["slide_size"])
+        TEMPLATE_PAINTERS[params["template"]](scene, number, config, colors, slide_rng(seed, number))
+        return scene.rasterize([scene.size])[0]
+    return TEMPLATE_FACTORIES[params["template"]](number, config, colors, slide_rng(seed, number))
+
+
+def _render_icon(params, engine, quality, seed):
+    size = (ICON_CANVAS, ICON_CANVAS)
+    # Icons sit at the slide's icon anchor, so center the 120px icon on the canvas
+    position, icon_size, color = (ICON_CANVAS // 2, ICON_CANVAS // 2), 120, (40, 90, 160)
+    if engine == "scene":
+        scene = SceneRecorder(size)
+        scene.rectangle([(0, 0), size], fill=(255, 255, 255))
+        draw_icon(scene, params["icon"], position, icon_size, color)
+        return scene.rasterize([size])[0]
+    # The lut engine only changes templates, so icons draw the same as the reference
+    image = Image.new("RGB", size, (255, 255, 255))
+    draw_icon(ImageDraw.Draw(image), params["icon"], position, icon_size, color)
+    return image
+
+
+RENDERERS = {"slide": _render_slide, "template": _render_template, "icon": _render_icon}
+
+
+def render_case(case, engine="reference", seed=DEFAULT_SEED, quality="final"):
+    """Render one golden case with `engine`, seeding its template from `seed` and the case name"""
+    if engine not in GOLDEN_ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of: {', '.join(GOLDEN_ENGINES)}")
+    name, kind, params = case
+    return RENDERERS[kind](params, engine, quality, f"{seed}:{name}").convert("RGB")
+
+
+def image_digest(image):
+    """sha256 of an image's size, mode and pixels (independent of PNG encoder settings)"""
+    digest = hashlib.sha256(f"{image.mode}:{image.size}:".encode("ascii"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def compare_images(expected, actual, tolerance=0, max_fraction=0.0):
+    """Compare two RGB images pixel by pixel
+
+    A pixel counts as changed when any channel differs by more than
+    `tolerance`; the images match when at most `max_fraction` of the pixels
+    changed. Returns a dict with "match", "max_diff", "mean_diff" (average
+    of each pixel's largest channel difference) and "changed_fraction".
+    """
+    if expected.size != actual.size:
+        return {"match": False, "max_diff": 255, "mean_diff": 255.0, "changed_fraction": 1.0,
+                "error": f"size {actual.size} != {expected.size}"}
+    red, green, blue = ImageChops.difference(expected.convert("RGB"), actual.convert("RGB")).split()
+    # Largest channel difference per pixel
+    histogram = ImageChops.lighter(ImageChops.lighter(red, green), blue).histogram()
+    pixels = expected.size[0] * expected.size[1]
+    max_diff = max((value for value, count in enumerate(histogram) if count), default=0)
+    changed = sum(histogram[tolerance + 1:])
+    return {
+        "match": changed <= max_fraction * pixels,
+        "max_diff": max_diff,
+        "mean_diff": round(sum(value * count for value, count in enumerate(histogram)) / pixels, 4),
+        "changed_fraction": round(changed / pixels, 6)
+    }
+
+
+def diff_image(expected, actual, gain=8):
+    """Expected, actual and an amplified difference heatmap side by side"""
+    width, height = expected.size
+    sheet = Image.new("RGB", (width * 3, height), (0, 0, 0))
+    sheet.paste(expected.convert("RGB"), (0, 0))
+    sheet.paste(actual.convert("RGB").resize(expected.size), (width, 0))
+    difference = ImageChops.difference(expected.convert("RGB"), actual.convert("RGB").resize(expected.size))
+    sheet.paste(difference.point(lambda value: min(255, value * gain)), (width * 2, 0))
+    return sheet
+
+
+def record_golden(golden_dir, engine="reference", seed=DEFAULT_SEED, quality="final", themes=None):
+    """Render every golden case with `engine` and store the images plus a manifest of their digests"""
+    os.makedirs(golden_dir, exist_ok=True)
+    manifest = {"engine": engine, "seed": seed, "quality": quality, "themes": themes, "cases": {}}
+    for case in golden_cases(themes):
+        image = render_case(case, engine, seed, quality)
+        image.save(os.path.join(golden_dir, f"{case[0]}.png"))
+        manifest["cases"][case[0]] = {"sha256": image_digest(image), "size": list(image.size)}
+    with open(os.path.join(golden_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Recorded {len(manifest['cases'])} golden images with the {engine} engine in: {golden_dir}")
+    return manifest
+
+
+def verify_golden(golden_dir, engine="reference", tolerance=0, max_fraction=0.0, diff_dir=None):
+    """Render every recorded case with `engine` and compare it with the golden images
+
+    With the default tolerance only identical pixels pass (checked by
+    digest). Failing cases get a diff image (expected | actual | heatmap)
+    in `diff_dir`, by default `<golden_dir>/diffs`. Returns a report dict
+    with "passed", "failed" (case names) and per-case "results".
+    """
+    with open(os.path.join(golden_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    diff_dir = diff_dir or os.path.join(golden_dir, "diffs")
+    report = {"engine": engine, "reference_engine": manifest["engine"], "passed": [], "failed": [], "results": {}}
+    for case in golden_cases(manifest.get("themes")):
+        name = case[0]
+        if name not in manifest["cases"]:
+            continue
+        actual = render_case(case, engine, manifest["seed"], manifest["quality"])
+        if image_digest(actual) == manifest["cases"][name]["sha256"]:
+            result = {"match": True, "max_diff": 0, "mean_diff": 0.0, "changed_fraction": 0.0}
+        else:
+            with Image.open(os.path.join(golden_dir, f"{name}.png")) as expected:
+                expected = expected.convert("RGB")
+            result = compare_images(expected, actual, tolerance, max_fraction)
+            if not result["match"]:
+                os.makedirs(diff_dir, exist_ok=True)
+                result["diff_path"] = os.path.join(diff_dir, f"{name}.png")
+                diff_image(expected, actual).save(result["diff_path"])
+        report["results"][name] = result
+        report["passed" if result["match"] else "failed"].append(name)
+    return report
@@ -0,0 +1,113 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageDraw
+
+from .generator import CarouselGenerator
+from .context import get_render_context
+from .themes import get_available_themes
+from .utils import load_font
+from .storage import carousel_namespace
+from .sinks import LocalDirectorySink
+
+COMPARISON_THUMB_SIZE = 216
+COMPARISON_LABEL_WIDTH = 180
+COMPARISON_PADDING = 16
+
+
+def load_thumbnails(sink, slide_count, thumb_size=COMPARISON_THUMB_SIZE):
+    """Read slide_1.png ... from `sink` as RGB thumbnails that fit in a thumb_size square"""
+    thumbnails = []
+    for number in range(1, slide_count + 1):
+        with Image.open(io.BytesIO(sink.read(f"slide_{number}.png"))) as slide:
+            slide.thumbnail((thumb_size, thumb_size))
+            thumbnails.append(slide.convert("RGB"))
+    return thumbnails
+
+
+def build_comparison_sheet(rows, sink, name="comparison.png", thumb_size=COMPARISON_THUMB_SIZE):
+    """Save one PNG with a row of slide thumbnails per theme to `sink` and return its location
+
+    `rows` is a list of (theme_name, thumbnails) pairs (see load_thumbnails).
+    """
+    columns = max((len(thumbnails) for _, thumbnails in rows), default=0)
+    pad = COMPARISON_PADDING
+    sheet = Image.new("RGB", (COMPARISON_LABEL_WIDTH + columns * (thumb_size + pad) + pad,
+                              len(rows) * (thumb_size + pad) + pad), (255, 255, 255))
+    draw = ImageDraw.Draw(sheet)
+    font = load_font(28)
+    for row, (theme_name, thumbnails) in enumerate(rows):
+        top = pad + row * (thumb_size + pad)
+        draw.text((pad, top + thumb_size // 2), theme_name, fill=(40, 40, 40), font=font, anchor="lm")
+        for column, thumbnail in enumerate(thumbnails):
+            sheet.paste(thumbnail, (COMPARISON_LABEL_WIDTH + column * (thumb_size + pad), top))
+    with sink.open(name) as f:
+        sheet.save(f, format="PNG")
+    path = sink.location(name)
+    print(f"Comparison sheet saved to: {path}")
+    return path
+
+
+def generate_theme_matrix(title, slides_content, themes=None, output_dir="output", quality="final",
+                          logo_path=None, custom_text_color=None, background_paths=None,
+                          pdf=None, pdf_mode="raster", max_workers=None, sink=None, seed=None,
+                          engine="reference", palette=None):
+    """Render one carousel in several themes at once
+
+    The slides are read once and shared by every theme; slide layout (icon
+    choice and text placement) is cached per slide and font sizes, so themes
+    with matching sizes lay each slide out only once. Themes render in
+    parallel on up to `max_workers` threads, each into its own subdirectory
+    of a `<title-slug>-<hash>` matrix directory, next to a comparison.png
+    showing every theme side by side.
+
+    Files go to `sink` (see sinks.py), or to output_dir when it is None.
+    `themes` defaults to every available theme; all of them share `seed`
+    (see generate_carousel), the template `engine` and, when given, a
+    custom (primary, secondary, accent) `palette`. `background_paths` may map
+    theme names to per-slide background lists. Returns a dict with the
+    matrix "output_dir", the "comparison_path" and each theme's
+    generate_carousel result under "themes".
+    """
+    themes = list(themes or get_available_themes())
+    slides_content = list(slides_content)
+    if palette is not None:
+        palette = tuple(tuple(color) for color in palette)
+    matrix_sink = (sink or LocalDirectorySink(output_dir)).child(carousel_namespace(
+        title, [themes, quality, engine, palette, logo_path, custom_text_color, background_paths, pdf, pdf_mode,
+                seed], slides_content))
+
+    # One generator serves every theme; each run gets its own context and sink
+    generator = CarouselGenerator(quality=quality, sink=matrix_sink, engine=engine)
+
+    def render_theme(theme_name):
+        theme_sink = matrix_sink.child(theme_name)
+        result = generator.generate_carousel(
+            title,
+            slides_content,
+            logo_path=logo_path,
+            custom_text_color=custom_text_color,
+            background_paths=(background_paths or {}).get(theme_name),
+            pdf=pdf,
+            pdf_mode=pdf_mode,
+            namespace=False,
+            dedupe=False,
+            context=get_render_context(theme_name, quality, engine, palette),
+            sink=theme_sink,
+            seed=seed
+        )
+        # Thumbnails are read back here so decoding also runs in parallel across themes
+        return result, load_thumbnails(theme_sink, len(result["slide_paths"]))
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(themes)) as executor:
+        rendered = list(executor.map(render_theme, themes))
+
+    results = {theme_name: result for theme_name, (result, _) in zip(themes, rendered)}
+    comparison_path = build_comparison_sheet(
+        [(theme_name, thumbnails) for theme_name, (_, thumbnails) in zip(themes, rendered)],
+        matrix_sink
+    )
+    return {
+        "output_dir": matrix_sink.location(),
+        "comparison_path": comparison_path,
+        "themes": results
+    }
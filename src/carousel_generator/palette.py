@@ -0,0 +1,135 @@
+from functools import lru_cache
+from PIL import Image, ImageDraw
+
+from .templates import TEMPLATE_PAINTERS, draw_gradient_template, slide_rng
+from .utils import load_font
+
+# Stand-in theme colors the templates are painted with; only their identity matters
+PROBE_COLORS = ((32, 64, 96), (224, 192, 160), (16, 240, 48))
+
+# Layer values: fixed colors first, then a primary -> secondary ramp
+BLACK_INDEX = 0
+WHITE_INDEX = 1
+ACCENT_INDEX = 2
+RAMP_START = 3
+RAMP_SIZE = 256 - RAMP_START
+FIXED_INDICES = {(0, 0, 0): BLACK_INDEX, (255, 255, 255): WHITE_INDEX, PROBE_COLORS[2]: ACCENT_INDEX}
+
+# Templates whose colors are all roles. "geometric" picks each channel of its shapes at random between
+# primary and secondary, so neither its colors nor its random draws carry over between themes
+RECOLORABLE_TEMPLATES = frozenset(TEMPLATE_PAINTERS) - {"geometric"}
+
+
+def ramp_index(ratio):
+    return RAMP_START + int(round(min(1.0, max(0.0, ratio)) * (RAMP_SIZE - 1)))
+
+
+def color_index(color):
+    """Layer value for a color the template asked for (painted with PROBE_COLORS)"""
+    color = tuple(color[:3])
+    if color in FIXED_INDICES:
+        return FIXED_INDICES[color]
+    # Anything else is a blend of primary and secondary; project it onto the ramp
+    primary, secondary = PROBE_COLORS[0], PROBE_COLORS[1]
+    delta = [s - p for p, s in zip(primary, secondary)]
+    ratio = sum((c - p) * d for c, p, d in zip(color, primary, delta)) / sum(d * d for d in delta)
+    return ramp_index(ratio)
+
+
+def build_lut(theme_colors):
+    """Per-channel lookup tables that turn layer values into a theme's colors"""
+    primary, secondary, accent = (tuple(color[:3]) for color in theme_colors)
+    colors = [(0, 0, 0), (255, 255, 255), accent]
+    for i in range(RAMP_SIZE):
+        ratio = i / (RAMP_SIZE - 1)
+        colors.append(tuple(int(primary[c] * (1 - ratio) + secondary[c] * ratio) for c in range(3)))
+    return [[color[channel] for color in colors] for channel in range(3)]
+
+
+class _LayerDraw:
+    """ImageDraw-like adapter that paints color roles as values into an "L" layer.
+
+    Text is recorded instead of drawn, since anti-aliased edges cannot be
+    expressed as roles; it is drawn in the real colors after recoloring.
+    Fonts are recorded by size, since layers are shared between threads
+    and fonts are per thread (see load_font).
+    """
+
+    def __init__(self, layer):
+        self.draw = ImageDraw.Draw(layer)
+        self.size = layer.size
+        self.texts = []
+
+    @staticmethod
+    def _ink(color):
+        return None if color is None else color_index(color)
+
+    def line(self, xy, fill=None, width=0):
+        self.draw.line(xy, fill=self._ink(fill), width=width)
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self.draw.ellipse(xy, fill=self._ink(fill), outline=self._ink(outline), width=width)
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self.draw.rectangle(xy, fill=self._ink(fill), outline=self._ink(outline), width=width)
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self.draw.polygon(xy, fill=self._ink(fill), outline=self._ink(outline), width=width)
+
+    def point(self, xy, fill=None):
+        self.draw.point(xy, fill=self._ink(fill))
+
+    def text(self, xy, text, fill=None, font=None, anchor=None):
+        self.texts.append((xy, text, self._ink(fill), getattr(font, "size", None), anchor))
+
+    def vertical_gradient(self, top_color, bottom_color):
+        # Only primary -> secondary gradients are used by the templates
+        width, height = self.size
+        top, bottom = color_index(top_color), color_index(bottom_color)
+        for y in range(height):
+            ratio = y / height
+            value = int(round(top * (1 - ratio) + bottom * ratio))
+            self.draw.line([(0, y), (width, y)], fill=value)
+
+
+class TemplateLayer:
+    """A template painted once as color roles, recolored per theme with lookup tables"""
+
+    def __init__(self, template_type, slide_number, theme_config, rng=None):
+        self.layer = Image.new("L", theme_config["slide_size"], BLACK_INDEX)
+        draw = _LayerDraw(self.layer)
+        painter = TEMPLATE_PAINTERS.get(template_type, draw_gradient_template)
+        painter(draw, slide_number, theme_config, PROBE_COLORS, rng)
+        self.texts = draw.texts
+
+    def recolor(self, theme_colors):
+        """Render the template in `theme_colors` (primary, secondary, accent) as an RGB image"""
+        luts = build_lut(theme_colors)
+        image = Image.merge("RGB", [self.layer.point(lut) for lut in luts])
+        if self.texts:
+            draw = ImageDraw.Draw(image)
+            for xy, text, value, font_size, anchor in self.texts:
+                fill = None if value is None else tuple(lut[value] for lut in luts)
+                draw.text(xy, text, fill=fill, font=load_font(font_size) if font_size else None, anchor=anchor)
+        return image
+
+
+@lru_cache(maxsize=64)
+def _cached_layer(template_type, slide_number, slide_size, scale, draft, seed):
+    config = {"slide_size": slide_size, "scale": scale, "draft": draft}
+    return TemplateLayer(template_type, slide_number, config, slide_rng(seed, slide_number))
+
+
+def get_template_layer(template_type, slide_number, theme_config, seed=None):
+    """Shared, cached TemplateLayer for a template, slide number, render size and seed
+
+    Layers painted without a seed keep the global random draws of whichever
+    render painted them first.
+    """
+    return _cached_layer(template_type, slide_number, tuple(theme_config["slide_size"]),
+                         theme_config.get("scale", 1), bool(theme_config.get("draft")), seed)
+
+
+def clear_template_layers():
+    """Drop every cached layer, e.g. after reseeding the global random numbers unseeded layers draw from"""
+    _cached_layer.cache_clear()
@@ -0,0 +1,110 @@
+import zlib
+
+# US Letter in PDF points, same page size create_pdf uses via reportlab
+LETTER = (612.0, 792.0)
+
+
+class StreamingPdfWriter:
+    """Write a PDF one page at a time, straight to disk.
+
+    Each page is a single slide image, scaled and centered like create_pdf.
+    Pages are flushed as soon as they are added, so only the current image
+    and a list of byte offsets are kept in memory regardless of page count.
+    `path` may also be an open binary file, which is left open on close.
+    """
+
+    CATALOG_ID = 1
+    PAGES_ID = 2
+
+    def __init__(self, path, page_size=LETTER, fit_ratio=0.9, compress_level=6):
+        self.path = path
+        self.page_size = page_size
+        self.fit_ratio = fit_ratio
+        self.compress_level = compress_level
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = 3
+        self.owns_file = not hasattr(path, "write")
+        self.file = open(path, "wb") if self.owns_file else path
+        self.file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _reserve_id(self):
+        obj_id = self.next_id
+        self.next_id += 1
+        return obj_id
+
+    def _write_object(self, obj_id, body, stream=None):
+        self.offsets[obj_id] = self.file.tell()
+        self.file.write(f"{obj_id} 0 obj\n".encode("ascii"))
+        self.file.write(body)
+        if stream is not None:
+            self.file.write(b"\nstream\n")
+            self.file.write(stream)
+            self.file.write(b"\nendstream")
+        self.file.write(b"\nendobj\n")
+
+    def add_image(self, image):
+        """Append a page showing `image` (a PIL image) and flush it to disk"""
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        img_width, img_height = image.size
+        page_width, page_height = self.page_size
+        ratio = min(page_width / img_width, page_height / img_height) * self.fit_ratio
+        new_width = img_width * ratio
+        new_height = img_height * ratio
+        x = (page_width - new_width) / 2
+        y = (page_height - new_height) / 2
+
+        image_id = self._reserve_id()
+        data = zlib.compress(image.tobytes(), self.compress_level)
+        self._write_object(image_id, (
+            f"<< /Type /XObject /Subtype /Image /Width {img_width} /Height {img_height} "
+            f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode "
+            f"/Length {len(data)} >>"
+        ).encode("ascii"), data)
+        del data
+
+        content_id = self._reserve_id()
+        content = f"q {new_width:.4f} 0 0 {new_height:.4f} {x:.4f} {y:.4f} cm /Im0 Do Q".encode("ascii")
+        self._write_object(content_id, f"<< /Length {len(content)} >>".encode("ascii"), content)
+
+        page_id = self._reserve_id()
+        self._write_object(page_id, (
+            f"<< /Type /Page /Parent {self.PAGES_ID} 0 R "
+            f"/MediaBox [0 0 {page_width:g} {page_height:g}] "
+            f"/Resources << /XObject << /Im0 {image_id} 0 R >> >> "
+            f"/Contents {content_id} 0 R >>"
+        ).encode("ascii"))
+        self.page_ids.append(page_id)
+
+    def close(self):
+        """Write the page tree, cross-reference table and trailer"""
+        if self.file is None:
+            return
+        kids = " ".join(f"{page_id} 0 R" for page_id in self.page_ids)
+        self._write_object(self.PAGES_ID, (
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>"
+        ).encode("ascii"))
+        self._write_object(self.CATALOG_ID, (
+            f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>"
+        ).encode("ascii"))
+
+        xref_offset = self.file.tell()
+        size = self.next_id
+        lines = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        for obj_id in range(1, size):
+            lines.append(f"{self.offsets[obj_id]:010d} 00000 n \n")
+        self.file.write("".join(lines).encode("ascii"))
+        self.file.write((
+            f"trailer\n<< /Size {size} /Root {self.CATALOG_ID} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        ).encode("ascii"))
+        if self.owns_file:
+            self.file.close()
+        self.file = None
@@ -0,0 +1,241 @@
+import os
+import zlib
+from PIL import Image, ImageDraw
+
+from .utils import draw_icon
+from .pdf_stream import StreamingPdfWriter
+
+# Control points that approximate a quarter ellipse with one cubic Bézier curve
+KAPPA = 0.5522847498
+
+
+def _rgb(color):
+    """Convert a 0-255 RGB(A) tuple to PDF's 0-1 floats (alpha is ignored, as on RGB slides)"""
+    return color[0] / 255.0, color[1] / 255.0, color[2] / 255.0
+
+
+def _num(value):
+    return f"{value:.3f}".rstrip("0").rstrip(".") or "0"
+
+
+def _pdf_string(text):
+    # Helvetica is written with WinAnsiEncoding; characters outside it become '?'
+    data = text.encode("cp1252", errors="replace")
+    return "(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").decode("latin-1") + ")"
+
+
+class _PageDraw:
+    """ImageDraw-like adapter that turns slide-pixel coordinates into PDF path and text operators"""
+
+    def __init__(self, ops, slide_size, box):
+        self.ops = ops
+        self.slide_width, self.slide_height = slide_size
+        self.x0, self.y0, self.ratio = box
+
+    def _xy(self, point):
+        return (self.x0 + point[0] * self.ratio,
+                self.y0 + (self.slide_height - point[1]) * self.ratio)
+
+    def _style(self, fill, outline, width):
+        if fill is not None:
+            self.ops.append("%s %s %s rg" % tuple(_num(c) for c in _rgb(fill)))
+        if outline is not None:
+            self.ops.append("%s %s %s RG" % tuple(_num(c) for c in _rgb(outline)))
+            self.ops.append(f"{_num(max(width, 1) * self.ratio)} w")
+        return {(True, True): "B", (True, False): "S", (False, True): "f"}.get(
+            (outline is not None, fill is not None), "n")
+
+    def _path(self, xy, close=False):
+        points = [self._xy(p) for p in xy]
+        self.ops.append(f"{_num(points[0][0])} {_num(points[0][1])} m")
+        self.ops.extend(f"{_num(x)} {_num(y)} l" for x, y in points[1:])
+        if close:
+            self.ops.append("h")
+
+    def line(self, xy, fill=None, width=0):
+        if fill is None or len(xy) < 2:
+            return
+        paint = self._style(None, fill, width)
+        self._path(xy)
+        self.ops.append(paint)
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        paint = self._style(fill, outline, width)
+        (x1, y1), (x2, y2) = self._xy(xy[0]), self._xy(xy[1])
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        rx, ry = abs(x2 - x1) / 2, abs(y2 - y1) / 2
+        kx, ky = rx * KAPPA, ry * KAPPA
+        self.ops.append(f"{_num(cx + rx)} {_num(cy)} m")
+        for (c1x, c1y), (c2x, c2y), (ex, ey) in (
+                ((cx + rx, cy + ky), (cx + kx, cy + ry), (cx, cy + ry)),
+                ((cx - kx, cy + ry), (cx - rx, cy + ky), (cx - rx, cy)),
+                ((cx - rx, cy - ky), (cx - kx, cy - ry), (cx, cy - ry)),
+                ((cx + kx, cy - ry), (cx + rx, cy - ky), (cx + rx, cy))):
+            self.ops.append(" ".join(_num(v) for v in (c1x, c1y, c2x, c2y, ex, ey)) + " c")
+        self.ops.append(paint)
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        paint = self._style(fill, outline, width)
+        (x1, y1), (x2, y2) = self._xy(xy[0]), self._xy(xy[1])
+        self.ops.append(f"{_num(min(x1, x2))} {_num(min(y1, y2))} {_num(abs(x2 - x1))} {_num(abs(y2 - y1))} re")
+        self.ops.append(paint)
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        paint = self._style(fill, outline, width)
+        self._path(xy, close=True)
+        self.ops.append(paint)
+
+    def text(self, xy, text, fill=None, font_size=10, anchor=None):
+        from reportlab.pdfbase.pdfmetrics import getAscentDescent, stringWidth
+
+        size = font_size * self.ratio
+        ascent, descent = getAscentDescent("Helvetica", size)
+        x, y = self._xy(xy)
+        if anchor == "mm":
+            x -= stringWidth(text, "Helvetica", size) / 2
+            y -= (ascent + descent) / 2
+        else:
+            # PIL's default anchor places the top of the ascender at xy
+            y -= ascent
+        self.ops.append("%s %s %s rg" % tuple(_num(c) for c in _rgb(fill or (0, 0, 0))))
+        self.ops.append(f"BT /F1 {_num(size)} Tf {_num(x)} {_num(y)} Td {_pdf_string(text)} Tj ET")
+
+
+class VectorPdfWriter(StreamingPdfWriter):
+    """Draw slide scenes (see scene.py) as vector pages of a PDF.
+
+    Shapes, gradients, icons and text stay vector, so text is selectable and
+    files stay small. Only per-pixel content such as noise is rasterized.
+    Pages are laid out on US Letter like create_pdf and, like
+    StreamingPdfWriter, flushed to disk as soon as they are added, so memory
+    stays flat however many slides there are. `path` may also be a writable
+    binary file.
+    """
+
+    def __init__(self, path, fit_ratio=0.9, compress_level=6):
+        super().__init__(path, fit_ratio=fit_ratio, compress_level=compress_level)
+        self.font_id = None
+        # Logo and background images, written once however many pages show them
+        self.file_images = {}
+
+    def _write_stream(self, obj_id, entries, data):
+        data = zlib.compress(data, self.compress_level)
+        self._write_object(obj_id, f"<< {entries} /Filter /FlateDecode /Length {len(data)} >>".encode("ascii"), data)
+
+    def _write_image(self, image, keep_alpha=True):
+        """Write a PIL image as an image XObject (alpha as a soft mask) and return its id"""
+        smask = ""
+        if keep_alpha and (image.mode in ("RGBA", "LA") or "transparency" in image.info):
+            image = image.convert("RGBA")
+            mask_id = self._reserve_id()
+            self._write_stream(mask_id, (
+                f"/Type /XObject /Subtype /Image /Width {image.width} /Height {image.height} "
+                f"/ColorSpace /DeviceGray /BitsPerComponent 8"
+            ), image.getchannel("A").tobytes())
+            smask = f" /SMask {mask_id} 0 R"
+        image_id = self._reserve_id()
+        self._write_stream(image_id, (
+            f"/Type /XObject /Subtype /Image /Width {image.width} /Height {image.height} "
+            f"/ColorSpace /DeviceRGB /BitsPerComponent 8{smask}"
+        ), image.convert("RGB").tobytes())
+        return image_id
+
+    def _file_image(self, path, keep_alpha):
+        key = (path, keep_alpha)
+        if key not in self.file_images:
+            with Image.open(path) as image:
+                self.file_images[key] = self._write_image(image, keep_alpha)
+        return self.file_images[key]
+
+    def add_scene(self, scene):
+        """Draw one slide scene as a new page and flush it to disk"""
+        slide_width, slide_height = scene.size
+        page_width, page_height = self.page_size
+        ratio = min(page_width / slide_width, page_height / slide_height) * self.fit_ratio
+        box_width, box_height = slide_width * ratio, slide_height * ratio
+        x0, y0 = (page_width - box_width) / 2, (page_height - box_height) / 2
+        box = f"{_num(x0)} {_num(y0)} {_num(box_width)} {_num(box_height)}"
+        ops = []
+        draw = _PageDraw(ops, scene.size, (x0, y0, ratio))
+        xobjects, shadings, states = {}, {}, {}
+
+        def show_image(image_id, x, y, width, height):
+            name = f"Im{len(xobjects)}"
+            xobjects[name] = image_id
+            ops.append(f"q {_num(width)} 0 0 {_num(height)} {_num(x)} {_num(y)} cm /{name} Do Q")
+
+        ops.append(f"q {box} re W n")
+        for op in scene.ops:
+            kind = op[0]
+            if kind == "line":
+                _, points, fill, width = op
+                draw.line(points, fill=fill, width=width)
+            elif kind in ("ellipse", "rectangle", "polygon"):
+                _, points, fill, outline, width = op
+                getattr(draw, kind)(points, fill=fill, outline=outline, width=width)
+            elif kind == "points":
+                # Noise is cheaper as one transparent raster than thousands of tiny vector marks
+                _, points, fill = op
+                layer = Image.new("RGBA", scene.size, (0, 0, 0, 0))
+                ImageDraw.Draw(layer).point(points, fill=tuple(fill[:3]) + (255,))
+                show_image(self._write_image(layer), x0, y0, box_width, box_height)
+            elif kind == "text":
+                _, position, text, fill, font_size, anchor = op
+                draw.text(position, text, fill=fill,
+                          font_size=font_size or 10, anchor=anchor)
+            elif kind == "gradient":
+                _, top, bottom = op
+                name = f"Sh{len(shadings)}"
+                shadings[name] = self._reserve_id()
+                c0, c1 = (" ".join(_num(c) for c in _rgb(color)) for color in (top, bottom))
+                self._write_object(shadings[name], (
+                    f"<< /ShadingType 2 /ColorSpace /DeviceRGB "
+                    f"/Coords [{_num(x0)} {_num(y0 + box_height)} {_num(x0)} {_num(y0)}] "
+                    f"/Function << /FunctionType 2 /Domain [0 1] /C0 [{c0}] /C1 [{c1}] /N 1 >> "
+                    f"/Extend [false false] >>"
+                ).encode("ascii"))
+                ops.append(f"/{name} sh")
+            elif kind == "icon":
+                _, icon_type, position, size, color = op
+                draw_icon(draw, icon_type, position, int(round(size)), color)
+            elif kind == "logo":
+                _, path, corner, size = op
+                if os.path.exists(path):
+                    corner_x, corner_y = draw._xy(corner)
+                    logo_size = size * ratio
+                    show_image(self._file_image(path, True), corner_x - logo_size, corner_y, logo_size, logo_size)
+            elif kind == "background":
+                _, path, opacity = op
+                if os.path.exists(path):
+                    name = f"GS{len(states)}"
+                    states[name] = f"<< /ca {_num(opacity)} >>"
+                    ops.append(f"q /{name} gs")
+                    show_image(self._file_image(path, False), x0, y0, box_width, box_height)
+                    ops.append("Q")
+        ops.append("Q")
+
+        content_id = self._reserve_id()
+        self._write_stream(content_id, "", "\n".join(ops).encode("latin-1"))
+
+        resources = []
+        if any(op.startswith("BT") for op in ops):
+            if self.font_id is None:
+                self.font_id = self._reserve_id()
+                self._write_object(self.font_id, (
+                    b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"))
+            resources.append(f"/Font << /F1 {self.font_id} 0 R >>")
+        for key, entries in (("XObject", xobjects), ("Shading", shadings)):
+            if entries:
+                resources.append(f"/{key} << " + " ".join(f"/{name} {obj_id} 0 R" for name, obj_id in entries.items())
+                                 + " >>")
+        if states:
+            resources.append("/ExtGState << " + " ".join(f"/{name} {state}" for name, state in states.items()) + " >>")
+
+        page_id = self._reserve_id()
+        self._write_object(page_id, (
+            f"<< /Type /Page /Parent {self.PAGES_ID} 0 R "
+            f"/MediaBox [0 0 {_num(page_width)} {_num(page_height)}] "
+            f"/Resources << {' '.join(resources)} >> "
+            f"/Contents {content_id} 0 R >>"
+        ).encode("ascii"))
+        self.page_ids.append(page_id)
@@ -0,0 +1,89 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SlideWritePipeline:
+    """Write rendered slides on background threads while the caller keeps rendering.
+
+    Slide files are saved by a small thread pool; PDF pages go through a
+    single extra thread so they are appended in submission order. At most
+    `max_pending` slides are in flight: `submit` blocks once that many are
+    waiting to be written, which keeps memory bounded when the output volume
+    is slower than rendering.
+    """
+
+    def __init__(self, save_slide, add_page=None, writer_threads=2, max_pending=4):
+        self.save_slide = save_slide
+        self.add_page = add_page
+        self.file_pool = ThreadPoolExecutor(max(1, writer_threads), thread_name_prefix="slide-writer")
+        self.page_pool = ThreadPoolExecutor(1, thread_name_prefix="pdf-writer") if add_page else None
+        self.slots = threading.BoundedSemaphore(max(1, max_pending))
+        self.lock = threading.Lock()
+        self.futures = []
+        # write_seconds adds up every writer thread; busy_seconds is the wall time at least one was writing
+        self.write_seconds = 0.0
+        self.busy_seconds = 0.0
+        self.stall_seconds = 0.0
+        self._active = 0
+        self._busy_since = None
+        self.error = None
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        with self.lock:
+            if self._active == 0:
+                self._busy_since = start
+            self._active += 1
+        try:
+            func(*args)
+        finally:
+            end = time.perf_counter()
+            with self.lock:
+                self.write_seconds += end - start
+                self._active -= 1
+                if self._active == 0:
+                    self.busy_seconds += end - self._busy_since
+
+    def submit(self, slide):
+        """Queue one rendered slide, blocking while too many are still being written"""
+        start = time.perf_counter()
+        self.slots.acquire()
+        self.stall_seconds += time.perf_counter() - start
+        if self.error is not None:
+            # Stop rendering as soon as a write has failed instead of after the last slide
+            self.slots.release()
+            raise self.error
+
+        futures = [self.file_pool.submit(self._timed, self.save_slide, slide)]
+        if self.page_pool:
+            futures.append(self.page_pool.submit(self._timed, self.add_page, slide))
+        remaining = [len(futures)]
+
+        def done(future):
+            # The slot (and with it the slide's image) is freed once every write has finished
+            with self.lock:
+                if future.exception() is not None and self.error is None:
+                    self.error = future.exception()
+                remaining[0] -= 1
+                release = remaining[0] == 0
+            if release:
+                self.slots.release()
+
+        for future in futures:
+            future.add_done_callback(done)
+        self.futures.extend(futures)
+
+    def close(self):
+        """Wait for every queued write, re-raising the first failure"""
+        self.file_pool.shutdown(wait=True)
+        if self.page_pool:
+            self.page_pool.shutdown(wait=True)
+        for future in self.futures:
+            future.result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
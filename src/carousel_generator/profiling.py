@@ -0,0 +1,243 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is then left out
+    resource = None
+
+# Frames from the profiler itself, left out of the allocation report
+_IGNORED_ALLOCATIONS = (__file__, tracemalloc.__file__, "<frozen importlib._bootstrap>",
+                        "<frozen importlib._bootstrap_external>", "<unknown>")
+
+# From Python 3.12 cProfile runs on sys.monitoring: one profiler sees every thread and a second cannot be enabled
+PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+# Threads blocked waiting for each other; left out of the hot function table (but kept in the stats)
+_WAIT_FUNCTIONS = ("<method 'acquire' of '_thread.lock' objects>", "<method 'acquire' of '_thread.RLock' objects>",
+                   "<method 'get' of '_queue.SimpleQueue' objects>")
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _function_label(function):
+    filename, line, name = function
+    if filename == "~":
+        # Built-ins such as "<method 'encode' of 'ImagingEncoder' objects>"
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StackSampler:
+    """Samples the Python stack of every thread at a fixed interval on a background thread
+
+    Stacks are counted in the "collapsed" format (root frame first, frames
+    joined by ';', then the count) that flamegraph.pl, inferno and
+    speedscope render as flame graphs. Each stack starts with its thread's name.
+
+    While tracemalloc is tracing, every sample also checks the traced memory
+    and keeps a snapshot of the allocations whenever it reaches a new high
+    (by at least `snapshot_growth` of the last snapshot, so growing memory
+    does not snapshot on every sample). `peak_snapshot` is then the
+    allocations at the highest point seen, taken `peak_seconds` after start.
+    """
+
+    def __init__(self, interval=0.005, snapshot_growth=0.05):
+        self.interval = interval
+        self.snapshot_growth = snapshot_growth
+        self.counts = Counter()
+        self.samples = 0
+        self.peak_snapshot = None
+        self.peak_snapshot_bytes = 0
+        self.peak_seconds = None
+        self._started = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+            self.check_memory()
+
+    def check_memory(self):
+        """Snapshot the traced allocations if memory use is at a new high"""
+        if not tracemalloc.is_tracing():
+            return
+        current, _ = tracemalloc.get_traced_memory()
+        if self.peak_snapshot is not None and current <= self.peak_snapshot_bytes * (1 + self.snapshot_growth):
+            return
+        self.peak_snapshot = tracemalloc.take_snapshot()
+        self.peak_snapshot_bytes = current
+        self.peak_seconds = time.perf_counter() - self._started
+
+    def write_collapsed(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """Profile a block of code with cProfile, tracemalloc and a stack sampler
+
+    Use as a context manager around the work to measure. Threads started
+    inside the block (such as the slide writers) are profiled too: before
+    Python 3.12 each gets its own cProfile profiler, merged into one report
+    at the end; from 3.12 the single profiler sees every thread. On exit
+    these files are written to `output_dir`:
+
+    - `<name>.pstats`: cProfile stats for pstats, snakeviz or gprof2dot
+    - `<name>.collapsed`: sampled stacks for flame graph tools
+    - `<name>_memory.txt`: peak memory and the top allocating lines at the peak
+
+    tracemalloc only sees Python allocations, not Pillow's image buffers,
+    so the peak RSS of the process is reported next to it. Profiling
+    slows the code down, so compare timings between profiled runs only.
+    """
+
+    def __init__(self, output_dir, name="profile", interval=0.005, top=20):
+        self.output_dir = output_dir
+        self.name = name
+        self.top = top
+        self.sampler = StackSampler(interval)
+        self.report = None
+        self._profile = None
+        self._thread_profiles = []
+        self._lock = threading.Lock()
+        self._started = None
+
+    def _profile_thread(self, frame, event, arg):
+        # threading.setprofile calls this on a new thread's first event; it swaps in the thread's own profiler
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # An exception here would kill the thread before it runs, so carry on unprofiled
+            print(f"Warning: not profiling thread {threading.current_thread().name}: {e}")
+            return
+        with self._lock:
+            self._thread_profiles.append(profile)
+
+    def __enter__(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        tracemalloc.start()
+        # Started before the thread hook so the sampler itself is not profiled
+        self.sampler.start()
+        if PER_THREAD_PROFILES:
+            threading.setprofile(self._profile_thread)
+        self._started = time.perf_counter()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profile.disable()
+        wall_seconds = time.perf_counter() - self._started
+        if PER_THREAD_PROFILES:
+            threading.setprofile(None)
+        self.sampler.stop()
+        # Runs shorter than one sample interval still get a snapshot
+        self.sampler.check_memory()
+        _, peak_traced = tracemalloc.get_traced_memory()
+        snapshot = self.sampler.peak_snapshot.filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_ALLOCATIONS])
+        tracemalloc.stop()
+
+        stats = pstats.Stats(self._profile)
+        with self._lock:
+            for profile in self._thread_profiles:
+                stats.add(profile)
+        self.report = self._write(stats, snapshot, wall_seconds, peak_traced)
+
+    def _write(self, stats, snapshot, wall_seconds, peak_traced):
+        base = os.path.join(self.output_dir, self.name)
+        stats.dump_stats(f"{base}.pstats")
+        self.sampler.write_collapsed(f"{base}.collapsed")
+
+        busy = [item for item in stats.stats.items() if _function_label(item[0]) not in _WAIT_FUNCTIONS]
+        hot = sorted(busy, key=lambda item: item[1][2], reverse=True)[:self.top]
+        allocations = snapshot.statistics("lineno")[:self.top]
+        report = {
+            "wall_seconds": round(wall_seconds, 4),
+            "samples": self.sampler.samples,
+            "peak_traced_bytes": peak_traced,
+            "peak_rss_bytes": _peak_rss_bytes(),
+            "snapshot_traced_bytes": self.sampler.peak_snapshot_bytes,
+            "snapshot_seconds": round(self.sampler.peak_seconds, 4),
+            "hot_functions": [
+                {"function": _function_label(function), "calls": calls, "self_seconds": round(self_time, 4),
+                 "cumulative_seconds": round(cumulative, 4)}
+                for function, (_, calls, self_time, cumulative, _) in hot
+            ],
+            "allocations": [
+                {"location": f"{frame.filename}:{frame.lineno}", "bytes": stat.size, "count": stat.count}
+                for stat in allocations for frame in stat.traceback[:1]
+            ],
+            "pstats_path": f"{base}.pstats",
+            "collapsed_path": f"{base}.collapsed",
+            "memory_path": f"{base}_memory.txt"
+        }
+        with open(report["memory_path"], "w", encoding="utf-8") as f:
+            f.write(f"Peak traced memory (Python allocations): {peak_traced / 2**20:.1f} MB\n")
+            if report["peak_rss_bytes"] is not None:
+                f.write(f"Peak RSS (whole process): {report['peak_rss_bytes'] / 2**20:.1f} MB\n")
+            f.write(f"\nTop {len(allocations)} allocating lines at the highest sampled point "
+                    f"({report['snapshot_traced_bytes'] / 2**20:.1f} MB traced, "
+                    f"{report['snapshot_seconds']:.2f}s into the run):\n")
+            for allocation in report["allocations"]:
+                f.write(f"{allocation['bytes'] / 1024:10.1f} KiB {allocation['count']:8d} blocks  "
+                        f"{allocation['location']}\n")
+        return report
+
+    def print_summary(self, top=15):
+        """Print wall time, memory and a table of the functions with the most self time (waits excluded)"""
+        report = self.report
+        print(f"\nProfile: {report['wall_seconds']:.2f}s wall, {report['samples']} stack samples")
+        memory = f"Peak memory: {report['peak_traced_bytes'] / 2**20:.1f} MB traced"
+        if report["peak_rss_bytes"] is not None:
+            memory += f", {report['peak_rss_bytes'] / 2**20:.1f} MB RSS"
+        print(memory)
+        print(f"\n{'calls':>10} {'self s':>9} {'cumul s':>9}  function")
+        for row in report["hot_functions"][:top]:
+            print(f"{row['calls']:>10} {row['self_seconds']:>9.3f} {row['cumulative_seconds']:>9.3f}  "
+                  f"{row['function']}")
+        print(f"\ncProfile stats: {report['pstats_path']}")
+        print(f"Collapsed stacks (flamegraph.pl, speedscope): {report['collapsed_path']}")
+        print(f"Memory report: {report['memory_path']}")
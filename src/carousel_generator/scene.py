@@ -0,0 +1,177 @@
+import os
+from PIL import Image, ImageDraw
+
+from .utils import draw_icon
+from .fonts import draw_text, load_font_chain
+
+
+class SceneRecorder:
+    """Resolution-independent display list for one slide.
+
+    It accepts the same calls as ImageDraw (line, ellipse, rectangle, polygon,
+    point, text), so templates and slide layout can draw onto it unchanged.
+    It also accepts the higher-level gradient, icon, logo and background ops.
+    Positions and sizes are stored in the slide's own pixels, exactly as
+    they were drawn. When rasterizing at another size, positions scale with
+    the target's width and height, and sizes (line widths, font sizes, icon
+    and logo sizes) with its shorter side, so icons, text and the logo keep
+    their proportions on any aspect ratio.
+
+    The layout is built once; `rasterize` then draws it at any number of
+    target sizes. At the slide's own size it reproduces the directly
+    painted slide pixel for pixel.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.width, self.height = size
+        self.ops = []
+        # Fallback fonts of the FontChain text was recorded with, reused when rasterizing
+        self.fallback_fonts = ()
+
+    # --- Coordinate handling ------------------------------------------------
+
+    def _point(self, point):
+        return (point[0], point[1])
+
+    def _points(self, xy):
+        if xy and not isinstance(xy[0], (tuple, list)):
+            # Flat [x0, y0, x1, y1, ...] form accepted by ImageDraw
+            xy = list(zip(xy[0::2], xy[1::2]))
+        return [self._point(p) for p in xy]
+
+    # --- ImageDraw-compatible API -------------------------------------------
+
+    def line(self, xy, fill=None, width=0):
+        self.ops.append(("line", self._points(xy), fill, width))
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self.ops.append(("ellipse", self._points(xy), fill, outline, width))
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self.ops.append(("rectangle", self._points(xy), fill, outline, width))
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self.ops.append(("polygon", self._points(xy), fill, outline, width))
+
+    def point(self, xy, fill=None):
+        points = self._points(xy if isinstance(xy, list) else [xy])
+        # Consecutive points of the same colour (e.g. noise) share one op
+        if self.ops and self.ops[-1][0] == "points" and self.ops[-1][2] == fill:
+            self.ops[-1][1].extend(points)
+        else:
+            self.ops.append(("points", points, fill))
+
+    def text(self, xy, text, fill=None, font=None, anchor=None):
+        font_size = getattr(font, "size", None)
+        if hasattr(font, "fallbacks"):
+            self.fallback_fonts = font.fallbacks
+        self.ops.append(("text", self._point(xy), text, fill, font_size, anchor))
+
+    # --- Higher-level ops ---------------------------------------------------
+
+    def vertical_gradient(self, top_color, bottom_color):
+        self.ops.append(("gradient", top_color, bottom_color))
+
+    def icon(self, icon_type, position, size, color):
+        self.ops.append(("icon", icon_type, self._point(position), size, color))
+
+    def logo(self, logo_path, corner, size):
+        """Place a square logo whose bottom-right corner sits at `corner`"""
+        self.ops.append(("logo", logo_path, self._point(corner), size))
+
+    def background(self, background_path, opacity):
+        """Blend everything drawn so far over a background image"""
+        self.ops.append(("background", background_path, opacity))
+
+    # --- Rasterization ------------------------------------------------------
+
+    def rasterize(self, sizes):
+        """Draw the scene at every size in `sizes` in a single pass over the ops"""
+        targets = [_RasterTarget(size, self.size, self.fallback_fonts) for size in sizes]
+        images = {}
+        for op in self.ops:
+            kind = op[0]
+            if kind in ("logo", "background") and op[1] not in images:
+                images[op[1]] = _load_image(op[1])
+            for target in targets:
+                target.apply(op, images)
+        return [target.image for target in targets]
+
+
+class _RasterTarget:
+    def __init__(self, size, source_size, fallback_fonts=()):
+        self.size = tuple(size)
+        self.fallback_fonts = fallback_fonts
+        self.width, self.height = size
+        # At the source size ops are drawn with their recorded values, exactly as painted directly
+        self.exact = self.size == tuple(source_size)
+        self.scale_x = self.width / source_size[0]
+        self.scale_y = self.height / source_size[1]
+        self.scale = min(size) / min(source_size)
+        self.image = Image.new("RGB", self.size)
+        self.draw = ImageDraw.Draw(self.image)
+
+    def _point(self, point):
+        if self.exact:
+            return point
+        return (point[0] * self.scale_x, point[1] * self.scale_y)
+
+    def _length(self, value, minimum=0):
+        if self.exact:
+            return value
+        return max(minimum, int(round(value * self.scale)))
+
+    def apply(self, op, images):
+        kind = op[0]
+        draw = self.draw
+        if kind == "line":
+            _, points, fill, width = op
+            draw.line([self._point(p) for p in points], fill=fill, width=self._length(width))
+        elif kind in ("ellipse", "rectangle", "polygon"):
+            _, points, fill, outline, width = op
+            xy = [self._point(p) for p in points]
+            width = self._length(width, 1 if outline is not None else 0)
+            getattr(draw, kind)(xy, fill=fill, outline=outline, width=width)
+        elif kind == "points":
+            _, points, fill = op
+            draw.point([self._point(p) for p in points], fill=fill)
+        elif kind == "text":
+            _, position, text, fill, font_size, anchor = op
+            font = load_font_chain(self._length(font_size, 1), self.fallback_fonts) if font_size else None
+            draw_text(draw, self._point(position), text, fill=fill, font=font, anchor=anchor)
+        elif kind == "gradient":
+            _, top, bottom = op
+            for y in range(self.height):
+                ratio = y / self.height
+                color = tuple(int(top[i] * (1 - ratio) + bottom[i] * ratio) for i in range(3))
+                draw.line([(0, y), (self.width, y)], fill=color)
+        elif kind == "icon":
+            _, icon_type, position, size, color = op
+            draw_icon(draw, icon_type, self._point(position), self._length(size, 1), color)
+        elif kind == "logo":
+            _, path, corner, size = op
+            logo = images[path]
+            if logo is not None:
+                logo_size = self._length(size, 1)
+                resized = logo.resize((logo_size, logo_size))
+                x, y = self._point(corner)
+                self.image.paste(resized, (int(x) - logo_size, int(y) - logo_size), resized)
+        elif kind == "background":
+            _, path, opacity = op
+            background = images[path]
+            if background is not None:
+                self.image = Image.blend(self.image, background.convert("RGB").resize(self.size), opacity)
+                self.draw = ImageDraw.Draw(self.image)
+
+
+def _load_image(path):
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with Image.open(path) as image:
+            return image.convert("RGBA")
+    except Exception as e:
+        print(f"Error loading image {path}: {e}")
+        return None
+
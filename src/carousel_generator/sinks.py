@@ -0,0 +1,190 @@
+import io
+import os
+import mimetypes
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from .storage import BLOB_DIR, BlobStore, atomic_open
+
+
+def join_name(*parts):
+    """Join sink names with "/", skipping empty parts"""
+    return "/".join(part.strip("/") for part in parts if part and part.strip("/"))
+
+
+class OutputSink(ABC):
+    """Destination for generated artifacts (slides, PDF, JSON).
+
+    Artifacts are addressed by "/"-separated names relative to the sink.
+    Subclasses implement `open`, `read` and `location`; an artifact only
+    becomes visible once the `open` block exits without an error.
+    """
+
+    @abstractmethod
+    def open(self, name):
+        """Context manager yielding a writable binary file for `name`"""
+
+    @abstractmethod
+    def read(self, name):
+        """Bytes of the artifact stored under `name`"""
+
+    @abstractmethod
+    def location(self, name=""):
+        """Where `name` ends up (a path, key or URL), as recorded in results and JSON"""
+
+    def write(self, name, data, dedupe=False):
+        """Store `data` under `name` and return its location
+
+        `dedupe` asks sinks that support it to store identical files once.
+        """
+        with self.open(name) as f:
+            f.write(data)
+        return self.location(name)
+
+    def child(self, prefix):
+        """A view of this sink with every name placed under `prefix`"""
+        return PrefixedSink(self, prefix)
+
+
+class PrefixedSink(OutputSink):
+    def __init__(self, parent, prefix):
+        self.parent = parent
+        self.prefix = prefix
+
+    def open(self, name):
+        return self.parent.open(join_name(self.prefix, name))
+
+    def read(self, name):
+        return self.parent.read(join_name(self.prefix, name))
+
+    def location(self, name=""):
+        return self.parent.location(join_name(self.prefix, name))
+
+    def write(self, name, data, dedupe=False):
+        return self.parent.write(join_name(self.prefix, name), data, dedupe)
+
+    def child(self, prefix):
+        return PrefixedSink(self.parent, join_name(self.prefix, prefix))
+
+
+class LocalDirectorySink(OutputSink):
+    """Write artifacts under a local directory with atomic renames
+
+    Deduplicated writes share one copy per distinct file through a
+    BlobStore in `<blob_root>` (by default `<root>/.blobs`).
+    """
+
+    def __init__(self, root, blob_root=None):
+        self.root = root
+        self.blob_root = blob_root or os.path.join(root, BLOB_DIR)
+
+    def path_for(self, name):
+        return os.path.join(self.root, *name.split("/")) if name else self.root
+
+    @contextmanager
+    def open(self, name):
+        path = self.path_for(name)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with atomic_open(path) as f:
+            yield f
+
+    def read(self, name):
+        with open(self.path_for(name), "rb") as f:
+            return f.read()
+
+    def location(self, name=""):
+        return self.path_for(name)
+
+    def write(self, name, data, dedupe=False):
+        if not dedupe:
+            return super().write(name, data)
+        path = self.path_for(name)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        BlobStore(self.blob_root).write(data, path)
+        return path
+
+    def child(self, prefix):
+        return LocalDirectorySink(self.path_for(prefix), self.blob_root)
+
+
+class MemorySink(OutputSink):
+    """Keep artifacts in memory; `files` maps each name to its bytes"""
+
+    def __init__(self):
+        self.files = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def open(self, name):
+        buffer = io.BytesIO()
+        yield buffer
+        with self.lock:
+            self.files[name] = buffer.getvalue()
+
+    def read(self, name):
+        return self.files[name]
+
+    def location(self, name=""):
+        return name
+
+    def getvalue(self, name):
+        return self.files[name]
+
+
+class ObjectStoreSink(OutputSink):
+    """Upload artifacts to an object store through a boto3-style client
+
+    `client` needs `put_object(Bucket=, Key=, Body=, ContentType=)` and
+    `get_object(Bucket=, Key=)` returning {"Body": file}, so an S3 client
+    from boto3 works as is; LocalObjectStore is a stand-in for tests and
+    development. Each artifact is buffered in memory and uploaded in one
+    request once complete.
+    """
+
+    def __init__(self, client, bucket, prefix="", scheme="s3"):
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.scheme = scheme
+
+    def key_for(self, name):
+        return join_name(self.prefix, name)
+
+    @contextmanager
+    def open(self, name):
+        buffer = io.BytesIO()
+        yield buffer
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        self.client.put_object(Bucket=self.bucket, Key=self.key_for(name), Body=buffer.getvalue(),
+                               ContentType=content_type)
+
+    def read(self, name):
+        return self.client.get_object(Bucket=self.bucket, Key=self.key_for(name))["Body"].read()
+
+    def location(self, name=""):
+        return f"{self.scheme}://{self.bucket}/{self.key_for(name)}"
+
+    def child(self, prefix):
+        return ObjectStoreSink(self.client, self.bucket, self.key_for(prefix), self.scheme)
+
+
+class LocalObjectStore:
+    """Minimal boto3-compatible object store kept in a local directory (`<root>/<bucket>/<key>`)"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, bucket, key):
+        return os.path.join(self.root, bucket, *key.split("/"))
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        path = self._path(Bucket, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with atomic_open(path) as f:
+            f.write(Body)
+        return {}
+
+    def get_object(self, Bucket, Key, **kwargs):
+        with open(self._path(Bucket, Key), "rb") as f:
+            return {"Body": io.BytesIO(f.read())}
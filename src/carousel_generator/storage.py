@@ -0,0 +1,116 @@
+import os
+import re
+import json
+import uuid
+import shutil
+import hashlib
+from collections.abc import Sequence
+from contextlib import contextmanager
+
+# Shared, content-addressed store for slide files, kept inside the output directory
+BLOB_DIR = ".blobs"
+
+
+def carousel_slug(title):
+    """Filesystem-friendly version of a carousel title"""
+    slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+    return slug or "carousel"
+
+
+def carousel_namespace(title, settings, slides_content):
+    """Name of the directory that holds one carousel's files: `<slug>-<hash>`
+
+    The hash covers the title, render settings and slide content, so re-running
+    the same carousel reuses its directory while different carousels with the
+    same title never share one. When the slides are a one-shot iterable that
+    cannot be hashed up front, a random id is used instead.
+    """
+    if isinstance(slides_content, Sequence):
+        key = json.dumps([title, settings, list(slides_content)], sort_keys=True, default=str)
+        suffix = hashlib.sha256(key.encode("utf-8")).hexdigest()[:8]
+    else:
+        suffix = uuid.uuid4().hex[:8]
+    return f"{carousel_slug(title)}-{suffix}"
+
+
+def _discard(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def temp_path_for(path):
+    """Unused temporary name next to `path`, on the same filesystem so os.replace is atomic"""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+
+
+@contextmanager
+def atomic_open(path, mode="wb", **kwargs):
+    """Open a temporary file that replaces `path` only once it is fully written"""
+    tmp_path = temp_path_for(path)
+    # Unlike mkstemp (always 0600), this keeps the permissions the umask gives regular files
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+
+
+@contextmanager
+def atomic_path(path):
+    """Yield a temporary path for writers that open files by name; it replaces `path` on success"""
+    tmp_path = temp_path_for(path)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+
+
+def link_or_copy(source, path):
+    """Atomically make `path` a hardlink to `source`, copying where hardlinks are unsupported"""
+    tmp_path = temp_path_for(path)
+    try:
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+
+
+class BlobStore:
+    """Content-addressed file store used to deduplicate identical slide files.
+
+    Each distinct file is stored once as `<root>/<k[:2]>/<k><ext>`, where k
+    is the sha256 of its bytes, and carousel directories hardlink to it.
+    Files are always replaced rather than modified in place, so a shared
+    blob is never changed through one of its links.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def path_for(self, digest, ext):
+        return os.path.join(self.root, digest[:2], f"{digest}{ext}")
+
+    def put(self, data, ext=""):
+        """Store `data` if it is not already present and return its blob path"""
+        path = self.path_for(hashlib.sha256(data).hexdigest(), ext)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with atomic_open(path) as f:
+                f.write(data)
+        return path
+
+    def write(self, data, path):
+        """Write `data` to `path` as a link to its blob"""
+        link_or_copy(self.put(data, os.path.splitext(path)[1]), path)
@@ -0,0 +1,204 @@
+import io
+import os
+import base64
+from xml.sax.saxutils import escape, quoteattr
+from PIL import Image
+
+from .utils import draw_icon
+
+# Reference size icons are drawn at inside <defs>; each use scales it to the slide's icon size
+ICON_SYMBOL_SIZE = 120
+
+
+def _num(value):
+    """Format a coordinate compactly (at most one decimal place)"""
+    text = f"{value:.1f}"
+    return text[:-2] if text.endswith(".0") else text
+
+
+def _color(color):
+    return "#{:02x}{:02x}{:02x}".format(*color[:3])
+
+
+def _data_uri(image, fmt="PNG"):
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, optimize=True)
+    mime = "image/png" if fmt == "PNG" else "image/jpeg"
+    return f"data:{mime};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+
+def _style(fill, outline=None, width=0):
+    """Presentation attributes for a fill/stroke combination"""
+    attrs = f'fill="{_color(fill)}"' if fill is not None else 'fill="none"'
+    if outline is not None:
+        attrs += f' stroke="{_color(outline)}" stroke-width="{_num(width)}"'
+    return attrs
+
+
+def _group(elements):
+    """Join (style, element) pairs, wrapping runs that share a style in one <g>"""
+    parts = []
+    run_style, run = None, []
+
+    def flush():
+        if not run:
+            return
+        if run_style is None:
+            parts.extend(run)
+        elif len(run) == 1:
+            parts.append(run[0].replace(" ", f" {run_style} ", 1))
+        else:
+            parts.append(f"<g {run_style}>{''.join(run)}</g>")
+
+    for style, element in elements:
+        if style != run_style:
+            flush()
+            run_style, run = style, []
+        run.append(element)
+    flush()
+    return "".join(parts)
+
+
+class _SvgDraw:
+    """ImageDraw-like adapter that collects SVG elements with their style attributes"""
+
+    def __init__(self):
+        self.elements = []
+
+    def line(self, xy, fill=None, width=0):
+        if fill is None or len(xy) < 2:
+            return
+        points = " ".join(f"{_num(x)},{_num(y)}" for x, y in xy)
+        style = _style(None, fill, max(width, 1))
+        self.elements.append((style, f'<polyline points="{points}"/>'))
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        (x1, y1), (x2, y2) = xy
+        style = _style(fill, outline, width)
+        self.elements.append((style, (
+            f'<ellipse cx="{_num((x1 + x2) / 2)}" cy="{_num((y1 + y2) / 2)}" '
+            f'rx="{_num(abs(x2 - x1) / 2)}" ry="{_num(abs(y2 - y1) / 2)}"/>'
+        )))
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        (x1, y1), (x2, y2) = xy
+        style = _style(fill, outline, width)
+        self.elements.append((style, (
+            f'<rect x="{_num(min(x1, x2))}" y="{_num(min(y1, y2))}" '
+            f'width="{_num(abs(x2 - x1))}" height="{_num(abs(y2 - y1))}"/>'
+        )))
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        points = " ".join(f"{_num(x)},{_num(y)}" for x, y in xy)
+        style = _style(fill, outline, width)
+        self.elements.append((style, f'<polygon points="{points}"/>'))
+
+
+class SvgDocument:
+    """Builds one compact SVG for a slide scene.
+
+    Consecutive elements with the same fill and stroke share one <g>, and
+    gradients and icons are defined once in <defs> and referenced by id.
+    Only presentation attributes are used (no CSS), so the output renders in
+    email clients that strip <style> blocks.
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.width, self.height = scene.size
+        self.defs = {}
+
+    def gradient_id(self, top, bottom):
+        key = ("gradient", _color(top), _color(bottom))
+        if key not in self.defs:
+            gradient_id = f"g{len(self.defs)}"
+            self.defs[key] = (gradient_id, (
+                f'<linearGradient id="{gradient_id}" x1="0" y1="0" x2="0" y2="1">'
+                f'<stop offset="0" stop-color="{_color(top)}"/>'
+                f'<stop offset="1" stop-color="{_color(bottom)}"/></linearGradient>'
+            ))
+        return self.defs[key][0]
+
+    def icon_id(self, icon_type, color):
+        key = ("icon", icon_type, _color(color))
+        if key not in self.defs:
+            icon_id = f"i{len(self.defs)}"
+            symbol = _SvgDraw()
+            draw_icon(symbol, icon_type, (0, 0), ICON_SYMBOL_SIZE, color)
+            self.defs[key] = (icon_id, f'<g id="{icon_id}">{_group(symbol.elements)}</g>')
+        return self.defs[key][0]
+
+    def render(self):
+        scene = self.scene
+        draw = _SvgDraw()
+        body = draw.elements
+
+        for op in scene.ops:
+            kind = op[0]
+            if kind == "line":
+                _, points, fill, width = op
+                draw.line(points, fill=fill, width=width)
+            elif kind in ("ellipse", "rectangle", "polygon"):
+                _, points, fill, outline, width = op
+                getattr(draw, kind)(points, fill=fill, outline=outline, width=width)
+            elif kind == "points":
+                # All points of one colour become a single path of 1px squares
+                _, points, fill = op
+                path = "".join(f"M{int(x)} {int(y)}h1v1h-1z" for x, y in points)
+                body.append((_style(fill), f'<path d="{path}"/>'))
+            elif kind == "text":
+                _, position, text, fill, font_size, anchor = op
+                x, y = position
+                size = font_size or 10
+                if anchor == "mm":
+                    placement = 'text-anchor="middle" dominant-baseline="central"'
+                else:
+                    placement = 'dominant-baseline="text-before-edge"'
+                body.append((None, (
+                    f'<text x="{_num(x)}" y="{_num(y)}" font-size="{_num(size)}" '
+                    f'fill="{_color(fill or (0, 0, 0))}" {placement}>{escape(text)}</text>'
+                )))
+            elif kind == "gradient":
+                _, top, bottom = op
+                gradient_id = self.gradient_id(top, bottom)
+                body.append((None, f'<rect width="{self.width}" height="{self.height}" fill="url(#{gradient_id})"/>'))
+            elif kind == "icon":
+                _, icon_type, position, size, color = op
+                x, y = position
+                k = size / ICON_SYMBOL_SIZE
+                body.append((None, (
+                    f'<use xlink:href="#{self.icon_id(icon_type, color)}" '
+                    f'transform="translate({_num(x)} {_num(y)}) scale({k:.4g})"/>'
+                )))
+            elif kind == "logo":
+                _, path, corner, size = op
+                if os.path.exists(path):
+                    logo_size = max(1, int(round(size)))
+                    with Image.open(path) as logo:
+                        uri = _data_uri(logo.convert("RGBA").resize((logo_size, logo_size)))
+                    x, y = corner
+                    body.append((None, (
+                        f'<image x="{_num(x - logo_size)}" y="{_num(y - logo_size)}" width="{logo_size}" '
+                        f'height="{logo_size}" xlink:href={quoteattr(uri)}/>'
+                    )))
+            elif kind == "background":
+                _, path, opacity = op
+                if os.path.exists(path):
+                    with Image.open(path) as background:
+                        uri = _data_uri(background.convert("RGB").resize(scene.size), fmt="JPEG")
+                    body.append((None, (
+                        f'<image width="{self.width}" height="{self.height}" opacity="{opacity:g}" '
+                        f'xlink:href={quoteattr(uri)}/>'
+                    )))
+
+        defs = "".join(definition for _, definition in self.defs.values())
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+            f'viewBox="0 0 {self.width} {self.height}" width="{self.width}" height="{self.height}" '
+            f'font-family="Arial, Helvetica, sans-serif"><defs>{defs}</defs>{_group(body)}</svg>'
+        )
+
+
+def render_scene_svg(scene):
+    """Render a slide scene (see scene.py) to an SVG string"""
+    return SvgDocument(scene).render()
@@ -1,72 +1,93 @@
 import random
+import hashlib
+import json
+from collections.abc import Sequence
 from PIL import Image, ImageDraw
-from .utils import add_slide_number_indicator, draw_hexagon # Use relative import
+from .utils import add_slide_number_indicator, draw_hexagon, draw_vertical_gradient, scale_px # Use relative import
 
-def create_gradient_template(slide_number, theme_config, theme_colors):
-    """Create a gradient template with modern business style"""
+def carousel_seed(title, slides_content):
+    """Default seed of a carousel, derived from its title and slides so identical input renders identically
+
+    One-shot iterables cannot be read up front, so only their title counts.
+    """
+    key = [title, list(slides_content)] if isinstance(slides_content, Sequence) else [title]
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big")
+
+def slide_seed(heading, content):
+    """Default seed of a slide rendered on its own: that of a one-slide carousel titled by its heading
+
+    Pass carousel_seed(title, slides) instead to render the slide exactly as it appears in its carousel.
+    """
+    return carousel_seed(heading, [{"heading": heading, "content": content}])
+
+def slide_rng(seed, slide_number):
+    """Random generator for one slide's template, or None (the global random module) without a seed"""
+    return None if seed is None else random.Random(f"{seed}:{slide_number}")
+
+def draw_gradient_template(draw, slide_number, theme_config, theme_colors, rng=None):
+    """Draw a gradient template with modern business style onto any ImageDraw-like canvas"""
     width, height = theme_config["slide_size"]
     primary, secondary, accent = theme_colors
+    scale = theme_config.get("scale", 1)
+    rng = rng or random
     
-    image = Image.new("RGB", (width, height))
-    draw = ImageDraw.Draw(image)
-    
-    for y in range(height):
-        ratio = y / height
-        r = int(primary[0] * (1 - ratio) + secondary[0] * ratio)
-        g = int(primary[1] * (1 - ratio) + secondary[1] * ratio)
-        b = int(primary[2] * (1 - ratio) + secondary[2] * ratio)
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
+    draw_vertical_gradient(draw, (width, height), primary, secondary)
         
     for i in range(5):
-        line_width = random.randint(2, 6)
-        x1 = random.randint(-100, width//2)
-        y1 = random.randint(-100, height//4)
-        x2 = x1 + random.randint(400, 800)
-        y2 = y1 + random.randint(400, 800)
+        line_width = max(1, scale_px(rng.randint(2, 6), scale))
+        x1 = rng.randint(scale_px(-100, scale), width//2)
+        y1 = rng.randint(scale_px(-100, scale), height//4)
+        x2 = x1 + rng.randint(scale_px(400, scale), scale_px(800, scale))
+        y2 = y1 + rng.randint(scale_px(400, scale), scale_px(800, scale))
         line_color = (accent[0], accent[1], accent[2], 100)
         draw.line([(x1, y1), (x2, y2)], fill=line_color, width=line_width)
         
-    highlight_radius = 200
-    highlight_pos = (width - 150, 150)
-    for r in range(highlight_radius, 0, -1):
-        opacity = int(100 * (1 - r/highlight_radius))
-        highlight_color = (accent[0], accent[1], accent[2], opacity)
-        draw.ellipse(
-            [(highlight_pos[0]-r, highlight_pos[1]-r), 
-             (highlight_pos[0]+r, highlight_pos[1]+r)], 
-            outline=highlight_color,
-            width=1
-        )
+    # Glow rings are skipped in draft mode
+    if not theme_config.get("draft"):
+        highlight_radius = 200
+        highlight_pos = (width - 150, 150)
+        for r in range(highlight_radius, 0, -1):
+            opacity = int(100 * (1 - r/highlight_radius))
+            highlight_color = (accent[0], accent[1], accent[2], opacity)
+            draw.ellipse(
+                [(highlight_pos[0]-r, highlight_pos[1]-r), 
+                 (highlight_pos[0]+r, highlight_pos[1]+r)], 
+                outline=highlight_color,
+                width=1
+            )
         
-    add_slide_number_indicator(draw, slide_number, (50, 50), accent, 40)
-    return image
+    add_slide_number_indicator(draw, slide_number, (scale_px(50, scale), scale_px(50, scale)), accent,
+                               scale_px(40, scale))
 
-def create_blocks_template(slide_number, theme_config, theme_colors):
-    """Create a template with modern block design"""
+def draw_blocks_template(draw, slide_number, theme_config, theme_colors, rng=None):
+    """Draw a template with modern block design onto any ImageDraw-like canvas"""
     width, height = theme_config["slide_size"]
     primary, secondary, accent = theme_colors
+    scale = theme_config.get("scale", 1)
+    rng = rng or random
     
-    image = Image.new("RGB", (width, height), primary)
-    draw = ImageDraw.Draw(image)
+    draw.rectangle([(0, 0), (width, height)], fill=primary)
     
     rect_width = width // 3
     draw.rectangle([(0, 0), (rect_width, height)], fill=secondary)
     
-    block_size = 80
+    block_size = scale_px(80, scale)
+    margin = scale_px(50, scale)
     for i in range(6):
-        x = random.randint(rect_width + 50, width - block_size - 50)
-        y = random.randint(50, height - block_size - 50)
+        x = rng.randint(rect_width + margin, width - block_size - margin)
+        y = rng.randint(margin, height - block_size - margin)
         block_color = accent
         outline_color = (255, 255, 255)
         draw.rectangle(
             [(x, y), (x + block_size, y + block_size)], 
             fill=block_color,
             outline=outline_color,
-            width=2
+            width=max(1, scale_px(2, scale))
         )
         
-    num_box_size = 80
-    num_box_pos = (rect_width - num_box_size - 30, 50)
+    num_box_size = scale_px(80, scale)
+    num_box_pos = (rect_width - num_box_size - scale_px(30, scale), margin)
     draw.rectangle(
         [num_box_pos, (num_box_pos[0] + num_box_size, num_box_pos[1] + num_box_size)],
         fill=accent
@@ -76,28 +97,31 @@ def create_blocks_template(slide_number, theme_config, theme_colors):
         slide_number, 
         (num_box_pos[0] + num_box_size//2, num_box_pos[1] + num_box_size//2), 
         (255, 255, 255), 
-        40,
+        scale_px(40, scale),
         center=True
     )
-    return image
 
-def create_minimal_template(slide_number, theme_config, theme_colors):
-    """Create a minimal, clean template"""
+def draw_minimal_template(draw, slide_number, theme_config, theme_colors, rng=None):
+    """Draw a minimal, clean template onto any ImageDraw-like canvas"""
     width, height = theme_config["slide_size"]
     primary, secondary, accent = theme_colors
+    scale = theme_config.get("scale", 1)
+    rng = rng or random
     
-    image = Image.new("RGB", (width, height), primary)
-    draw = ImageDraw.Draw(image)
+    draw.rectangle([(0, 0), (width, height)], fill=primary)
     
-    for i in range(1000):
-        x = random.randint(0, width)
-        y = random.randint(0, height)
-        draw.point((x, y), fill=(secondary[0], secondary[1], secondary[2]))
+    # Noise is skipped in draft mode
+    if not theme_config.get("draft"):
+        for i in range(1000):
+            x = rng.randint(0, width)
+            y = rng.randint(0, height)
+            draw.point((x, y), fill=(secondary[0], secondary[1], secondary[2]))
         
     line_y = height // 4
-    draw.line([(50, line_y), (width - 50, line_y)], fill=accent, width=2)
+    line_margin = scale_px(50, scale)
+    draw.line([(line_margin, line_y), (width - line_margin, line_y)], fill=accent, width=max(1, scale_px(2, scale)))
     
-    border_width = 10
+    border_width = max(2, scale_px(10, scale))
     draw.rectangle(
         [(border_width//2, border_width//2), (width - border_width//2, height - border_width//2)],
         outline=secondary,
@@ -107,32 +131,32 @@ def create_minimal_template(slide_number, theme_config, theme_colors):
     add_slide_number_indicator(
         draw, 
         slide_number, 
-        (width - 80, height - 80), 
+        (width - scale_px(80, scale), height - scale_px(80, scale)), 
         accent, 
-        36
+        scale_px(36, scale)
     )
-    return image
 
-def create_geometric_template(slide_number, theme_config, theme_colors):
-    """Create a template with geometric patterns"""
+def draw_geometric_template(draw, slide_number, theme_config, theme_colors, rng=None):
+    """Draw a template with geometric patterns onto any ImageDraw-like canvas"""
     width, height = theme_config["slide_size"]
     primary, secondary, accent = theme_colors
+    scale = theme_config.get("scale", 1)
+    rng = rng or random
     
-    image = Image.new("RGB", (width, height), primary)
-    draw = ImageDraw.Draw(image)
+    draw.rectangle([(0, 0), (width, height)], fill=primary)
     
     for i in range(15):
         points = [
-            (random.randint(0, width), random.randint(0, height)),
-            (random.randint(0, width), random.randint(0, height)),
-            (random.randint(0, width), random.randint(0, height))
+            (rng.randint(0, width), rng.randint(0, height)),
+            (rng.randint(0, width), rng.randint(0, height)),
+            (rng.randint(0, width), rng.randint(0, height))
         ]
-        r = random.randint(min(primary[0], secondary[0]), max(primary[0], secondary[0]))
-        g = random.randint(min(primary[1], secondary[1]), max(primary[1], secondary[1]))
-        b = random.randint(min(primary[2], secondary[2]), max(primary[2], secondary[2]))
+        r = rng.randint(min(primary[0], secondary[0]), max(primary[0], secondary[0]))
+        g = rng.randint(min(primary[1], secondary[1]), max(primary[1], secondary[1]))
+        b = rng.randint(min(primary[2], secondary[2]), max(primary[2], secondary[2]))
         draw.polygon(points, fill=(r, g, b))
     
-    stripe_width = 150
+    stripe_width = scale_px(150, scale)
     points = [
         (0, height - stripe_width),
         (0, height),
@@ -144,56 +168,50 @@ def create_geometric_template(slide_number, theme_config, theme_colors):
     add_slide_number_indicator(
         draw, 
         slide_number, 
-        (width - 80, height - stripe_width//2), 
+        (width - scale_px(80, scale), height - stripe_width//2), 
         (255, 255, 255), 
-        40
+        scale_px(40, scale)
     )
-    return image
 
-def create_circuit_template(slide_number, theme_config, theme_colors):
-    """Create a tech-themed template with circuit board patterns"""
+def draw_circuit_template(draw, slide_number, theme_config, theme_colors, rng=None):
+    """Draw a tech-themed template with circuit board patterns onto any ImageDraw-like canvas"""
     width, height = theme_config["slide_size"]
     primary, secondary, accent = theme_colors
+    scale = theme_config.get("scale", 1)
+    rng = rng or random
     
-    image = Image.new("RGB", (width, height))
-    draw = ImageDraw.Draw(image)
-    
-    for y in range(height):
-        ratio = y / height
-        r = int(primary[0] * (1 - ratio) + secondary[0] * ratio)
-        g = int(primary[1] * (1 - ratio) + secondary[1] * ratio)
-        b = int(primary[2] * (1 - ratio) + secondary[2] * ratio)
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
+    draw_vertical_gradient(draw, (width, height), primary, secondary)
     
     nodes = []
     for i in range(10):
-        nodes.append((random.randint(0, width), random.randint(0, height)))
+        nodes.append((rng.randint(0, width), rng.randint(0, height)))
     
     for i in range(len(nodes)):
-        connections = random.randint(2, 3)
+        connections = rng.randint(2, 3)
         for j in range(connections):
-            target = random.randint(0, len(nodes)-1)
+            target = rng.randint(0, len(nodes)-1)
             if target != i:
                 start = nodes[i]
                 end = nodes[target]
                 
-                if random.random() > 0.5:
+                if rng.random() > 0.5:
                     mid = (start[0], end[1])
                 else:
                     mid = (end[0], start[1])
                 
-                draw.line([start, mid], fill=accent, width=2)
-                draw.line([mid, end], fill=accent, width=2)
+                line_width = max(1, scale_px(2, scale))
+                draw.line([start, mid], fill=accent, width=line_width)
+                draw.line([mid, end], fill=accent, width=line_width)
                 
-                node_size = random.randint(4, 10)
+                node_size = max(2, scale_px(rng.randint(4, 10), scale))
                 draw.ellipse(
                     [(end[0]-node_size//2, end[1]-node_size//2), 
                      (end[0]+node_size//2, end[1]+node_size//2)],
                     fill=accent
                 )
     
-    indicator_size = 80
-    indicator_pos = (width - indicator_size - 50, 50)
+    indicator_size = scale_px(80, scale)
+    indicator_pos = (width - indicator_size - scale_px(50, scale), scale_px(50, scale))
     
     draw_hexagon(
         draw, 
@@ -207,11 +225,45 @@ def create_circuit_template(slide_number, theme_config, theme_colors):
         slide_number, 
         (indicator_pos[0] + indicator_size//2, indicator_pos[1] + indicator_size//2), 
         (255, 255, 255), 
-        36,
+        scale_px(36, scale),
         center=True
     )
+
+def render_template(painter, slide_number, theme_config, theme_colors, rng=None):
+    """Create a new slide image and paint a template onto it"""
+    image = Image.new("RGB", theme_config["slide_size"])
+    painter(ImageDraw.Draw(image), slide_number, theme_config, theme_colors, rng)
     return image
 
+def create_gradient_template(slide_number, theme_config, theme_colors, rng=None):
+    """Create a gradient template with modern business style"""
+    return render_template(draw_gradient_template, slide_number, theme_config, theme_colors, rng)
+
+def create_blocks_template(slide_number, theme_config, theme_colors, rng=None):
+    """Create a template with modern block design"""
+    return render_template(draw_blocks_template, slide_number, theme_config, theme_colors, rng)
+
+def create_minimal_template(slide_number, theme_config, theme_colors, rng=None):
+    """Create a minimal, clean template"""
+    return render_template(draw_minimal_template, slide_number, theme_config, theme_colors, rng)
+
+def create_geometric_template(slide_number, theme_config, theme_colors, rng=None):
+    """Create a template with geometric patterns"""
+    return render_template(draw_geometric_template, slide_number, theme_config, theme_colors, rng)
+
+def create_circuit_template(slide_number, theme_config, theme_colors, rng=None):
+    """Create a tech-themed template with circuit board patterns"""
+    return render_template(draw_circuit_template, slide_number, theme_config, theme_colors, rng)
+
+# Dictionary mapping template names to painters that draw onto an existing canvas
+TEMPLATE_PAINTERS = {
+    "gradient": draw_gradient_template,
+    "blocks": draw_blocks_template,
+    "minimal": draw_minimal_template,
+    "geometric": draw_geometric_template,
+    "circuit": draw_circuit_template
+}
+
 # Dictionary mapping template names to functions
 TEMPLATE_FACTORIES = {
     "gradient": create_gradient_template,
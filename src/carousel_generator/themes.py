@@ -1,3 +1,19 @@
+# Installed fonts tried, in order, for characters the primary font has no glyph for
+# (accented Latin, Greek, Cyrillic, CJK, emoji). Missing fonts are skipped.
+DEFAULT_FALLBACK_FONTS = (
+    "DejaVuSans.ttf",
+    "NotoSans-Regular.ttf",
+    "LiberationSans-Regular.ttf",
+    "Arial Unicode.ttf",
+    "NotoSansCJK-Regular.ttc",
+    "NotoSansCJKsc-Regular.otf",
+    "msyh.ttc",
+    "PingFang.ttc",
+    "NotoEmoji-Regular.ttf",
+    "seguiemj.ttf",
+    "Symbola.ttf"
+)
+
 THEMES = {
     "default": {
         "text_color": (255, 255, 255),
@@ -8,7 +24,8 @@ THEMES = {
         "primary_color": (52, 152, 219),  # Blue
         "secondary_color": (41, 128, 185),  # Darker blue
         "accent_color": (46, 204, 113),  # Green
-        "template": "gradient"
+        "template": "gradient",
+        "fallback_fonts": DEFAULT_FALLBACK_FONTS
     },
     "dark": {
         "text_color": (230, 230, 230),
@@ -19,7 +36,8 @@ THEMES = {
         "primary_color": (44, 62, 80),  # Dark blue
         "secondary_color": (52, 73, 94),  # Slightly lighter dark blue
         "accent_color": (231, 76, 60),  # Red
-        "template": "blocks"
+        "template": "blocks",
+        "fallback_fonts": DEFAULT_FALLBACK_FONTS
     },
     "light": {
         "text_color": (70, 70, 70),
@@ -30,7 +48,8 @@ THEMES = {
         "primary_color": (236, 240, 241),  # Light gray
         "secondary_color": (189, 195, 199),  # Slightly darker light gray
         "accent_color": (241, 196, 15),  # Yellow
-        "template": "minimal"
+        "template": "minimal",
+        "fallback_fonts": DEFAULT_FALLBACK_FONTS
     },
     "creative": {
         "text_color": (250, 250, 250),
@@ -41,7 +60,8 @@ THEMES = {
         "primary_color": (155, 89, 182),  # Purple
         "secondary_color": (142, 68, 173),  # Darker purple
         "accent_color": (230, 126, 34),  # Orange
-        "template": "geometric"
+        "template": "geometric",
+        "fallback_fonts": DEFAULT_FALLBACK_FONTS
     },
     "tech": {
         "text_color": (220, 240, 255),
@@ -52,7 +72,8 @@ THEMES = {
         "primary_color": (26, 188, 156),  # Teal
         "secondary_color": (22, 160, 133),  # Darker teal
         "accent_color": (52, 152, 219),  # Blue
-        "template": "circuit"
+        "template": "circuit",
+        "fallback_fonts": DEFAULT_FALLBACK_FONTS
     }
 }
 
@@ -60,4 +81,29 @@ def get_available_themes():
     return list(THEMES.keys())
 
 def get_theme_config(theme_name):
-    return THEMES.get(theme_name, THEMES["default"]) 
\ No newline at end of file
+    return THEMES.get(theme_name, THEMES["default"])
+
+QUALITY_TIERS = ("final", "draft")
+
+# Fraction of the theme's slide_size used for draft renders
+DRAFT_SCALE = 0.25
+
+def get_render_config(theme_name, quality="final"):
+    """Theme config for a quality tier; draft scales sizes down and flags simplified effects"""
+    config = get_theme_config(theme_name)
+    if quality == "final":
+        return config
+    if quality != "draft":
+        raise ValueError(f"Unknown quality '{quality}', expected one of: {', '.join(QUALITY_TIERS)}")
+
+    width, height = config["slide_size"]
+    draft_config = dict(config)
+    draft_config.update({
+        "slide_size": (max(1, int(width * DRAFT_SCALE)), max(1, int(height * DRAFT_SCALE))),
+        "heading_font_size": max(1, int(config["heading_font_size"] * DRAFT_SCALE)),
+        "subheading_font_size": max(1, int(config["subheading_font_size"] * DRAFT_SCALE)),
+        "content_font_size": max(1, int(config["content_font_size"] * DRAFT_SCALE)),
+        "scale": DRAFT_SCALE,
+        "draft": True
+    })
+    return draft_config
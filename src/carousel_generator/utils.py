@@ -2,14 +2,64 @@ import os
 import math
 import json
 import random
+import threading
 from PIL import Image, ImageDraw, ImageFont
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+
+from .sinks import LocalDirectorySink
+
+def load_environment(dotenv_path=None):
+    """Load variables such as GEMINI_API_KEY from a .env file into the environment.
+
+    Entry points call this explicitly; importing the package has no side effects.
+    """
+    from dotenv import load_dotenv
+    return load_dotenv(dotenv_path)
 
 def create_output_dir(output_dir="output"):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
+def scale_px(value, scale=1):
+    """Scale a pixel measurement laid out for full-size slides (unchanged at scale 1)"""
+    if scale == 1:
+        return value
+    return int(round(value * scale))
+
+_fonts = threading.local()
+
+def load_font(size):
+    """Load the slide font at the given size, cached so warm generators reuse it
+
+    FreeType fonts must not be used by several threads at once, so each
+    thread keeps its own cache.
+    """
+    cache = getattr(_fonts, "cache", None)
+    if cache is None:
+        cache = _fonts.cache = {}
+    font = cache.get(size)
+    if font is None:
+        try:
+            font = ImageFont.truetype("arial.ttf", size)
+        except IOError:
+            # Pillow's built-in font, scaled like Arial would be so fallback fonts (see fonts.py) match its size
+            font = ImageFont.load_default(size)
+        cache[size] = font
+    return font
+
+def draw_vertical_gradient(draw, size, top_color, bottom_color):
+    """Fill the canvas with a top-to-bottom linear gradient"""
+    if hasattr(draw, "vertical_gradient"):
+        # Recording canvases (see scene.py) keep the gradient as a single op
+        draw.vertical_gradient(top_color, bottom_color)
+        return
+    width, height = size
+    for y in range(height):
+        ratio = y / height
+        r = int(top_color[0] * (1 - ratio) + bottom_color[0] * ratio)
+        g = int(top_color[1] * (1 - ratio) + bottom_color[1] * ratio)
+        b = int(top_color[2] * (1 - ratio) + bottom_color[2] * ratio)
+        draw.line([(0, y), (width, y)], fill=(r, g, b))
+
 def draw_hexagon(draw, center, size, color):
     """Helper method to draw a hexagon"""
     points = []
@@ -23,10 +73,7 @@ def draw_hexagon(draw, center, size, color):
 
 def add_slide_number_indicator(draw, number, position, color, size, center=False):
     """Add a slide number indicator to the template"""
-    try:
-        font = ImageFont.truetype("arial.ttf", size)
-    except IOError:
-        font = ImageFont.load_default()
+    font = load_font(size)
         
     text = f"{number}"
     
@@ -35,8 +82,15 @@ def add_slide_number_indicator(draw, number, position, color, size, center=False
     else:
         draw.text(position, text, fill=color, font=font)
 
+# Icons draw_icon knows; anything else draws nothing
+ICON_TYPES = ("lightbulb", "graph", "gear", "chat", "person", "star")
+
 def draw_icon(draw, icon_type, position, size, color):
     """Draw icons for slides"""
+    if hasattr(draw, "icon"):
+        # Recording canvases (see scene.py) keep the icon as a single op
+        draw.icon(icon_type, position, size, color)
+        return
     x, y = position
     
     if icon_type == "lightbulb":
@@ -159,46 +213,53 @@ def select_icon(heading):
         return "star"
     return "lightbulb"  # default
 
-def create_pdf(image_paths, title, output_dir="output"):
-    """Create a PDF from the slide images"""
-    pdf_path = os.path.join(output_dir, f"{title.replace(' ', '_')}_carousel.pdf")
-    c = canvas.Canvas(pdf_path, pagesize=letter)
-    
-    for img_path in image_paths:
-        try:
-            img = Image.open(img_path)
-            img_width, img_height = img.size
-            
-            # Calculate aspect ratio to fit on letter page
-            page_width, page_height = letter
-            ratio = min(page_width / img_width, page_height / img_height) * 0.9
-            
-            # Calculate new dimensions
-            new_width = img_width * ratio
-            new_height = img_height * ratio
-            
-            # Calculate position to center the image
-            x = (page_width - new_width) / 2
-            y = (page_height - new_height) / 2
-            
-            # Add the image to the PDF
-            c.drawImage(img_path, x, y, width=new_width, height=new_height)
-            c.showPage()
-        except Exception as e:
-            print(f"Error adding image {img_path} to PDF: {e}")
-    
-    c.save()
+def create_pdf(image_paths, title, output_dir="output", sink=None):
+    """Create a PDF from the slide images, written to `sink` (see sinks.py) or output_dir"""
+    # reportlab is only needed here, so keep it out of the import path of the package
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    sink = sink or LocalDirectorySink(output_dir)
+    pdf_name = f"{title.replace(' ', '_')}_carousel.pdf"
+    with sink.open(pdf_name) as pdf_file:
+        c = canvas.Canvas(pdf_file, pagesize=letter, invariant=1)
+        
+        for img_path in image_paths:
+            try:
+                img = Image.open(img_path)
+                img_width, img_height = img.size
+                
+                # Calculate aspect ratio to fit on letter page
+                page_width, page_height = letter
+                ratio = min(page_width / img_width, page_height / img_height) * 0.9
+                
+                # Calculate new dimensions
+                new_width = img_width * ratio
+                new_height = img_height * ratio
+                
+                # Calculate position to center the image
+                x = (page_width - new_width) / 2
+                y = (page_height - new_height) / 2
+                
+                # Add the image to the PDF
+                c.drawImage(img_path, x, y, width=new_width, height=new_height)
+                c.showPage()
+            except Exception as e:
+                print(f"Error adding image {img_path} to PDF: {e}")
+        
+        c.save()
+    pdf_path = sink.location(pdf_name)
     print(f"PDF saved to: {pdf_path}")
     return pdf_path
 
-def save_carousel_data(carousel_data, title, output_dir="output"):
-    """Save carousel metadata to a JSON file."""
-    json_path = os.path.join(output_dir, f"{title.replace(' ', '_')}_carousel_data.json")
+def save_carousel_data(carousel_data, title, output_dir="output", sink=None):
+    """Save carousel metadata to a JSON file, in `sink` (see sinks.py) or output_dir."""
+    sink = sink or LocalDirectorySink(output_dir)
+    json_name = f"{title.replace(' ', '_')}_carousel_data.json"
     try:
-        with open(json_path, 'w') as f:
-            json.dump(carousel_data, f, indent=4)
+        json_path = sink.write(json_name, json.dumps(carousel_data, indent=4).encode("utf-8"))
         print(f"JSON data saved to: {json_path}")
         return json_path
     except Exception as e:
         print(f"Error saving JSON data: {e}")
-        return None 
\ No newline at end of file
+        return None
@@ -1,7 +1,30 @@
-import json
+import io
 import os
+import html
+import json
+import hashlib
 from pathlib import Path
+from PIL import Image, features
+
+from ..carousel_generator.storage import atomic_open
 
+PREVIEW_STYLE = """        body { font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f0f2f5; }
+        .container { max-width: 1200px; margin: 0 auto; }
+        h1 { color: #0077B5; text-align: center; }
+        .carousel { display: flex; overflow-x: auto; scroll-snap-type: x mandatory; gap: 20px; padding: 20px 0; }
+        .slide { scroll-snap-align: start; flex: 0 0 auto; width: 500px; height: 500px; border-radius: 10px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); position: relative; cursor: pointer; }
+        .slide img { width: 100%; height: 100%; object-fit: contain; border-radius: 10px; }
+        .slide-number { position: absolute; top: 10px; left: 10px; background-color: rgba(0, 0, 0, 0.5); color: white; padding: 5px 10px; border-radius: 15px; font-size: 14px; }
+        .controls { display: flex; justify-content: center; margin-top: 20px; gap: 10px; }
+        button { background-color: #0077B5; color: white; border: none; padding: 10px 20px; border-radius: 5px; cursor: pointer; font-size: 16px; }
+        button:hover { background-color: #00669c; }
+        .fullscreen { position: fixed; top: 0; left: 0; width: 100%; height: 100%; background-color: rgba(0, 0, 0, 0.9); display: none; justify-content: center; align-items: center; z-index: 1000; }
+        .fullscreen img { max-width: 90%; max-height: 90%; object-fit: contain; }
+        .close-btn { position: absolute; top: 20px; right: 20px; color: white; font-size: 30px; cursor: pointer; }
+        .slide-info { margin-top: 20px; padding: 20px; background-color: white; border-radius: 10px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); }
+        .metadata { margin-top: 40px; padding: 20px; background-color: white; border-radius: 10px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); }
+        pre { background-color: #f7f7f7; padding: 15px; border-radius: 5px; overflow-x: auto; }
+"""
 
 HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
@@ -10,23 +33,7 @@ HTML_TEMPLATE = """<!DOCTYPE html>
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{title} - Preview</title>
     <style>
-        body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f0f2f5; }}
-        .container {{ max-width: 1200px; margin: 0 auto; }}
-        h1 {{ color: #0077B5; text-align: center; }}
-        .carousel {{ display: flex; overflow-x: auto; scroll-snap-type: x mandatory; gap: 20px; padding: 20px 0; }}
-        .slide {{ scroll-snap-align: start; flex: 0 0 auto; width: 500px; height: 500px; border-radius: 10px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); position: relative; cursor: pointer; }}
-        .slide img {{ width: 100%; height: 100%; object-fit: contain; border-radius: 10px; }}
-        .slide-number {{ position: absolute; top: 10px; left: 10px; background-color: rgba(0, 0, 0, 0.5); color: white; padding: 5px 10px; border-radius: 15px; font-size: 14px; }}
-        .controls {{ display: flex; justify-content: center; margin-top: 20px; gap: 10px; }}
-        button {{ background-color: #0077B5; color: white; border: none; padding: 10px 20px; border-radius: 5px; cursor: pointer; font-size: 16px; }}
-        button:hover {{ background-color: #00669c; }}
-        .fullscreen {{ position: fixed; top: 0; left: 0; width: 100%; height: 100%; background-color: rgba(0, 0, 0, 0.9); display: none; justify-content: center; align-items: center; z-index: 1000; }}
-        .fullscreen img {{ max-width: 90%; max-height: 90%; object-fit: contain; }}
-        .close-btn {{ position: absolute; top: 20px; right: 20px; color: white; font-size: 30px; cursor: pointer; }}
-        .slide-info {{ margin-top: 20px; padding: 20px; background-color: white; border-radius: 10px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); }}
-        .metadata {{ margin-top: 40px; padding: 20px; background-color: white; border-radius: 10px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); }}
-        pre {{ background-color: #f7f7f7; padding: 15px; border-radius: 5px; overflow-x: auto; }}
-    </style>
+{style}    </style>
 </head>
 <body>
     <div class="container">
@@ -210,6 +217,7 @@ def generate_preview_html(json_file, workspace_root):
         with open(html_path, 'w') as f:
             f.write(HTML_TEMPLATE.format(
                 title=title, 
+                style=PREVIEW_STYLE,
                 slides_html=slides_html,
                 json_file_path_for_js=json_file_path_for_js,
                 workspace_root_for_js=workspace_root_js,
@@ -221,4 +229,219 @@ def generate_preview_html(json_file, workspace_root):
         return str(html_path) # Return the path relative to workspace root
     except Exception as e:
         print(f"Error generating preview HTML: {e}")
-        return None 
\ No newline at end of file
+        return None 
+
+STATIC_HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} - Preview</title>
+{preload_links}
+    <style>
+{style}        a.button {{ background-color: #0077B5; color: white; padding: 10px 20px; border-radius: 5px; font-size: 16px; text-decoration: none; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>{title}</h1>
+        <div class="carousel" id="carousel">
+            {slides_html}
+        </div>
+        <div class="controls">
+            <button id="prev-btn">Previous</button>
+            <button id="next-btn">Next</button>
+            {download_html}
+        </div>
+        <div class="slide-info" id="slide-info">
+            <h2>Slide Information</h2>
+            <div id="slide-content"></div>
+        </div>
+        <div class="metadata">
+            <h2>Carousel Metadata</h2>
+            <pre id="metadata-json"></pre>
+        </div>
+    </div>
+    <div class="fullscreen" id="fullscreen">
+        <span class="close-btn" id="close-btn">&times;</span>
+        <img id="fullscreen-img" src="" alt="Fullscreen slide">
+    </div>
+    <script type="application/json" id="carousel-data">{carousel_json}</script>
+    <script>
+        const carouselData = JSON.parse(document.getElementById('carousel-data').textContent);
+        const slides = Array.from(document.querySelectorAll('.slide'));
+        const slideInfo = document.getElementById('slide-content');
+        const fullscreen = document.getElementById('fullscreen');
+        const fullscreenImg = document.getElementById('fullscreen-img');
+        let currentSlide = 0;
+
+        document.getElementById('metadata-json').textContent = JSON.stringify(carouselData, null, 2);
+
+        function updateSlideInfo() {{
+            const slide = carouselData.slides[currentSlide];
+            if (!slide) return;
+            const heading = document.createElement('h3');
+            heading.textContent = `Slide ${{slide.number}}: ${{slide.heading || ''}}`;
+            const content = document.createElement('p');
+            content.innerText = slide.content || '';
+            slideInfo.replaceChildren(heading, content);
+        }}
+
+        function scrollToSlide(index) {{
+            if (slides.length === 0) return;
+            currentSlide = Math.max(0, Math.min(index, slides.length - 1));
+            slides[currentSlide].scrollIntoView({{ behavior: 'smooth', block: 'nearest', inline: 'start' }});
+            updateSlideInfo();
+        }}
+
+        document.getElementById('prev-btn').addEventListener('click', () => scrollToSlide(currentSlide - 1));
+        document.getElementById('next-btn').addEventListener('click', () => scrollToSlide(currentSlide + 1));
+        slides.forEach((slide, index) => {{
+            slide.addEventListener('click', () => {{
+                // The full-size image is only fetched when a slide is opened
+                fullscreenImg.src = carouselData.slides[index].full_image_path;
+                fullscreen.style.display = 'flex';
+            }});
+        }});
+        document.getElementById('close-btn').addEventListener('click', () => fullscreen.style.display = 'none');
+        document.addEventListener('keydown', (e) => {{
+            if (e.key === 'ArrowLeft') scrollToSlide(currentSlide - 1);
+            else if (e.key === 'ArrowRight') scrollToSlide(currentSlide + 1);
+            else if (e.key === 'Escape' && fullscreen.style.display === 'flex') fullscreen.style.display = 'none';
+        }});
+
+        updateSlideInfo();
+    </script>
+</body>
+</html>
+"""
+
+# Width of a slide on the preview page (see .slide in PREVIEW_STYLE)
+PREVIEW_SLIDE_SIZE = 500
+
+
+def _find_file(path, json_dir):
+    """Locate a path from the carousel JSON: as given, relative to the JSON file, or next to it"""
+    for candidate in (path, os.path.join(json_dir, path), os.path.join(json_dir, os.path.basename(path))):
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _write_asset(export_dir, stem, data, extension):
+    """Store `data` as assets/<stem>.<content hash>.<extension> and return its URL relative to the page"""
+    name = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.{extension}"
+    path = os.path.join(export_dir, "assets", name)
+    # The name changes with the content, and files only appear once complete, so an existing file is up to date
+    if not os.path.exists(path):
+        with atomic_open(path, "wb") as f:
+            f.write(data)
+    return f"assets/{name}"
+
+
+def _sized_image(image, size):
+    """`image` scaled down to fit in size x size, as (bytes, extension, (width, height))
+
+    Uses WebP when Pillow was built with it: resampled slides gain soft edges
+    that make PNGs larger than the full-size original.
+    """
+    sized = image.convert("RGB")
+    sized.thumbnail((size, size), Image.LANCZOS)
+    buffer = io.BytesIO()
+    if features.check("webp"):
+        sized.save(buffer, format="WEBP", quality=90)
+        return buffer.getvalue(), "webp", sized.size
+    sized.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue(), "png", sized.size
+
+
+def export_static_preview(json_file, export_dir, preload=2, slide_size=PREVIEW_SLIDE_SIZE):
+    """Export a preview page that works without the preview server
+
+    Writes `<export_dir>/index.html` with the carousel data inlined, plus an
+    `assets/` directory of content-hashed files: every slide pre-sized for
+    the page at 1x and 2x (see _sized_image), the full-size slide for the
+    fullscreen view and the PDF when it is found next to the JSON. The first `preload` slides
+    are preloaded and the rest load lazily, so the page shows its slides
+    from a single HTML request. Asset names change whenever their content
+    does, so the bundle can be served by any CDN with long cache lifetimes.
+    Returns the path of index.html, or None on failure.
+    """
+    try:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        json_dir = os.path.dirname(os.path.abspath(json_file))
+        title = data.get('title', 'LinkedIn Carousel')
+        os.makedirs(os.path.join(export_dir, "assets"), exist_ok=True)
+
+        slides = []
+        preload_links = []
+        slides_html = ""
+        for index, slide in enumerate(data.get('slides', [])):
+            number = slide.get('number', index + 1)
+            image_path = _find_file(slide.get('image_path', ''), json_dir)
+            if image_path is None:
+                print(f"Warning: Image for slide {number} not found at {slide.get('image_path')}. Skipping it.")
+                continue
+            with open(image_path, 'rb') as f:
+                original = f.read()
+            extension = os.path.splitext(image_path)[1].lstrip('.').lower() or 'png'
+            full_url = _write_asset(export_dir, f"slide-{number}", original, extension)
+            if extension == 'svg':
+                # Vector slides are sharp at any size
+                src, srcset, (width, height) = full_url, None, (slide_size, slide_size)
+            else:
+                urls = []
+                with Image.open(io.BytesIO(original)) as image:
+                    for size in (slide_size, slide_size * 2):
+                        sized, sized_extension, dimensions = _sized_image(image, size)
+                        # Keep the original when scaling does not make the file smaller
+                        if len(sized) < len(original):
+                            urls.append(_write_asset(export_dir, f"slide-{number}-{size}", sized, sized_extension))
+                        else:
+                            urls.append(full_url)
+                        if size == slide_size:
+                            width, height = dimensions
+                src = urls[0]
+                srcset = f"{urls[0]} 1x, {urls[1]} 2x"
+
+            eager = len(slides) < preload
+            if eager:
+                srcset_attr = f' imagesrcset="{srcset}"' if srcset else ''
+                preload_links.append(f'    <link rel="preload" as="image" href="{src}"{srcset_attr} fetchpriority="high">')
+            loading = 'loading="eager" fetchpriority="high"' if eager else 'loading="lazy"'
+            srcset_attr = f' srcset="{srcset}"' if srcset else ''
+            slides_html += f"""
+            <div class="slide">
+                <img src="{src}"{srcset_attr} width="{width}" height="{height}" {loading} decoding="async" alt="Slide {number}">
+                <div class="slide-number">Slide {number}</div>
+            </div>"""
+            slides.append(dict(slide, number=number, image_path=src, full_image_path=full_url))
+
+        pdf_url = None
+        pdf_path = _find_file(data.get('pdf_path') or f"{title.replace(' ', '_')}_carousel.pdf", json_dir)
+        if pdf_path:
+            with open(pdf_path, 'rb') as f:
+                pdf_url = _write_asset(export_dir, "carousel", f.read(), 'pdf')
+        download_html = f'<a class="button" href="{pdf_url}" download>Download PDF</a>' if pdf_url else ''
+
+        carousel = {key: value for key, value in data.items() if key not in ('slides', 'pdf_path')}
+        carousel.update(slides=slides, pdf_path=pdf_url)
+        # Escaped so slide text such as "</script>" cannot end the script element early
+        carousel_json = json.dumps(carousel, indent=2).replace("<", "\\u003c")
+
+        html_path = os.path.join(export_dir, "index.html")
+        with atomic_open(html_path, 'w', encoding='utf-8') as f:
+            f.write(STATIC_HTML_TEMPLATE.format(
+                title=html.escape(title),
+                style=PREVIEW_STYLE,
+                preload_links="\n".join(preload_links),
+                slides_html=slides_html,
+                download_html=download_html,
+                carousel_json=carousel_json
+            ))
+        print(f"Exported static preview with {len(slides)} slides to: {html_path}")
+        return html_path
+    except Exception as e:
+        print(f"Error exporting static preview: {e}")
+        return None
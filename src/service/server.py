@@ -0,0 +1,83 @@
+import http.server
+import json
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from .workers import (RenderWorkerPool, QueueFullError, RenderTimeoutError,
+                      validate_render_request, validate_timeout)
+
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class RenderRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Handles POST /render and GET /health for the render service"""
+
+    # Set by create_render_server
+    pool = None
+    default_timeout = 60.0
+    max_timeout = 300.0
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/health":
+            self._send_json(200, {"status": "ok", **self.pool.stats()})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0].rstrip("/") != "/render":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._send_json(413 if length > MAX_BODY_BYTES else 400,
+                            {"error": "Request body must be 1 byte to 1 MiB of JSON"})
+            return
+
+        try:
+            payload = json.loads(self.rfile.read(length).decode("utf-8"))
+            request = validate_render_request(payload)
+            timeout = validate_timeout(payload.get("timeout"), self.default_timeout, self.max_timeout)
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            content_type, filename, body = self.pool.render(request, timeout)
+        except QueueFullError as e:
+            self._send_json(429, {"error": str(e)}, headers={"Retry-After": "1"})
+            return
+        except (FutureTimeoutError, RenderTimeoutError):
+            self._send_json(504, {"error": f"Render did not finish within {timeout:g}s"})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"Render failed: {e}"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_render_server(host="127.0.0.1", port=8080, workers=2, max_queue=16, timeout=60.0):
+    """Create the render HTTP server along with its warm worker pool"""
+    pool = RenderWorkerPool(workers=workers, max_queue=max_queue)
+    handler = type("BoundRenderRequestHandler", (RenderRequestHandler,), {
+        "pool": pool,
+        "default_timeout": timeout,
+    })
+    httpd = http.server.ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    return httpd, pool
@@ -0,0 +1,216 @@
+import io
+import json
+import math
+import queue
+import hashlib
+import threading
+import time
+import zipfile
+from concurrent.futures import Future
+
+from ..carousel_generator.generator import CarouselGenerator
+from ..carousel_generator.themes import get_available_themes
+from ..carousel_generator.sinks import MemorySink
+from ..carousel_generator.templates import carousel_seed
+from ..carousel_generator.storage import carousel_slug
+
+OUTPUT_FORMATS = ("png", "pdf", "zip")
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class QueueFullError(Exception):
+    """Raised when the render queue cannot accept another job"""
+
+
+class RenderTimeoutError(Exception):
+    """Raised when a job's deadline passed before a worker picked it up"""
+
+
+def validate_render_request(payload):
+    """Check a decoded render request and fill in defaults"""
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+    title = payload.get("title")
+    if not title or not isinstance(title, str):
+        raise ValueError("'title' is required")
+    if any(ord(char) < 32 or ord(char) == 127 for char in title):
+        raise ValueError("'title' must not contain control characters")
+    slides = payload.get("slides")
+    if not slides or not isinstance(slides, list):
+        raise ValueError("'slides' must be a non-empty list")
+    for slide in slides:
+        if not isinstance(slide, dict):
+            raise ValueError("Each slide must be an object with 'heading' and 'content'")
+        for field in ("heading", "content"):
+            if not isinstance(slide.get(field, ""), str):
+                raise ValueError(f"Slide '{field}' must be a string")
+    theme = payload.get("theme", "default")
+    if theme not in get_available_themes():
+        raise ValueError(f"Unknown theme '{theme}'")
+    output_format = payload.get("format", "zip")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"'format' must be one of: {', '.join(OUTPUT_FORMATS)}")
+    slide_number = int(payload.get("slide", 1))
+    if output_format == "png" and not 1 <= slide_number <= len(slides):
+        raise ValueError(f"'slide' must be between 1 and {len(slides)}")
+    seed = payload.get("seed")
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int)):
+        raise ValueError("'seed' must be an integer")
+    request = {
+        "title": title,
+        "theme": theme,
+        "slides": [
+            {"heading": s.get("heading", ""), "content": s.get("content", "")}
+            for s in slides
+        ],
+        "format": output_format,
+        "slide": slide_number,
+    }
+    # Without a seed the render is seeded from its content, so identical requests give identical bytes
+    if seed is not None:
+        request["seed"] = seed
+    return request
+
+
+def validate_timeout(value, default, maximum):
+    """Seconds a request may wait for its render, capped at `maximum`; rejects non-finite and non-positive values"""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        raise ValueError("'timeout' must be a number of seconds")
+    timeout = float(value)
+    if not math.isfinite(timeout) or timeout <= 0:
+        raise ValueError("'timeout' must be a positive number of seconds")
+    return min(timeout, maximum)
+
+
+def request_key(request):
+    """Stable hash of a validated request, used to coalesce identical renders"""
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class RenderJob:
+    def __init__(self, key, request, deadline):
+        self.key = key
+        self.request = request
+        self.deadline = deadline
+        self.future = Future()
+
+
+class RenderWorkerPool:
+    """Worker threads that share one warm CarouselGenerator and render queued jobs.
+
+    Identical requests that arrive while a render is queued or running share
+    a single job; a full queue is reported with QueueFullError so callers can
+    push back on clients.
+    """
+
+    def __init__(self, workers=2, max_queue=16):
+        self.jobs = queue.Queue(maxsize=max_queue)
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.threads = []
+        # Runs keep their state in a per-job object, so every worker can use the same generator
+        self.generator = CarouselGenerator(sink=MemorySink())
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"render-worker-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, request, timeout):
+        """Queue a render (or join an identical one in flight) and return its future"""
+        key = request_key(request)
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            job = self.inflight.get(key)
+            if job is not None:
+                job.deadline = max(job.deadline, deadline)
+                return job.future
+            job = RenderJob(key, request, deadline)
+            try:
+                self.jobs.put_nowait(job)
+            except queue.Full:
+                raise QueueFullError("Render queue is full")
+            self.inflight[key] = job
+            return job.future
+
+    def render(self, request, timeout):
+        """Render a request, waiting at most `timeout` seconds for the result"""
+        return self.submit(request, timeout).result(timeout=timeout)
+
+    def stats(self):
+        with self.lock:
+            inflight = len(self.inflight)
+        return {
+            "workers": len(self.threads),
+            "queued": self.jobs.qsize(),
+            "max_queue": self.jobs.maxsize,
+            "inflight": inflight,
+        }
+
+    def shutdown(self):
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join()
+
+    def _worker_loop(self):
+        generator = self.generator
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            try:
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                if time.monotonic() > job.deadline:
+                    job.future.set_exception(RenderTimeoutError("Request timed out while queued"))
+                    continue
+                try:
+                    job.future.set_result(render_request(generator, job.request))
+                except Exception as e:
+                    job.future.set_exception(e)
+            finally:
+                with self.lock:
+                    self.inflight.pop(job.key, None)
+                self.jobs.task_done()
+
+
+def render_request(generator, request):
+    """Render a validated request with a worker's generator.
+
+    Returns a (content_type, filename, body) tuple.
+    """
+    # The theme and sink are passed per run, so the shared generator itself is never changed
+    context = generator.context.with_theme(request["theme"])
+    # Download names go into a Content-Disposition header, so they only use the slug's safe characters
+    base_name = carousel_slug(request["title"])
+
+    if request["format"] == "png":
+        # Only the requested slide is rendered, seeded exactly as it would be in the full carousel
+        seed = request.get("seed")
+        if seed is None:
+            seed = carousel_seed(request["title"], request["slides"])
+        slide = request["slides"][request["slide"] - 1]
+        image = generator.render_slide(slide["heading"], slide["content"], request["slide"],
+                                       context=context, seed=seed)
+        return "image/png", f"slide_{request['slide']}.png", generator.encode_png(image, context)
+
+    # Artifacts stay in memory; nothing is written to or read back from disk
+    sink = MemorySink()
+    result = generator.generate_carousel(request["title"], request["slides"], namespace=False,
+                                         pdf=True if request["format"] == "pdf" else None,
+                                         context=context, sink=sink, seed=request.get("seed"))
+
+    if request["format"] == "pdf":
+        return "application/pdf", f"{base_name}_carousel.pdf", sink.read(result["pdf_path"])
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name in result["slide_paths"] + [result["pdf_path"], result["json_path"]]:
+            if name in sink.files:
+                # A fixed timestamp keeps the archive byte-identical for identical requests
+                info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+                archive.writestr(info, sink.read(name), compress_type=zipfile.ZIP_DEFLATED)
+    return "application/zip", f"{base_name}_carousel.zip", buffer.getvalue()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the package the same way the *_cli.py entry points do: `from src.carousel_generator...`
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -0,0 +1,82 @@
+import asyncio
+import hashlib
+import io
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from src.carousel_generator.backgrounds import (BackgroundCache, BackgroundProvider, GeminiBackgroundProvider,
+                                                StubBackgroundProvider, generate_backgrounds)
+
+
+class CountingProvider(StubBackgroundProvider):
+    def __init__(self):
+        super().__init__(size=(64, 64))
+        self.prompts = []
+
+    def generate(self, prompt):
+        self.prompts.append(prompt)
+        return super().generate(prompt)
+
+
+def test_provider_must_implement_generate():
+    with pytest.raises(TypeError):
+        BackgroundProvider()
+
+
+def test_stub_provider_is_deterministic_per_prompt():
+    provider = StubBackgroundProvider(size=(120, 80))
+    first = provider.generate("calm ocean")
+    assert first == provider.generate("calm ocean")
+    assert first != provider.generate("busy city")
+    with Image.open(io.BytesIO(first)) as image:
+        assert (image.format, image.size) == ("PNG", (120, 80))
+
+
+def test_cache_key_depends_on_prompt_and_model_only(tmp_path):
+    cache = BackgroundCache(str(tmp_path))
+    key = cache.key("calm ocean", "stub")
+    assert key == hashlib.sha256(b"stub\0calm ocean").hexdigest()
+    assert key == BackgroundCache(str(tmp_path / "other")).key("calm ocean", "stub")
+    assert key != cache.key("calm ocean", "gemini")
+    assert key != cache.key("busy city", "stub")
+
+
+def test_cache_round_trip(tmp_path):
+    cache = BackgroundCache(str(tmp_path))
+    assert cache.get("calm ocean", "stub") is None
+    path = cache.put("calm ocean", "stub", b"image bytes")
+    assert cache.get("calm ocean", "stub") == path
+    with open(path, "rb") as f:
+        assert f.read() == b"image bytes"
+    assert cache.get("calm ocean", "gemini") is None
+
+
+def test_generate_backgrounds_dedupes_and_hits_cache(tmp_path):
+    cache = BackgroundCache(str(tmp_path))
+    provider = CountingProvider()
+    prompts = ["ocean", "city", "ocean", "forest"]
+    paths = asyncio.run(generate_backgrounds(prompts, provider, cache, concurrency=2))
+    assert sorted(provider.prompts) == ["city", "forest", "ocean"]
+    assert paths[0] == paths[2] and len(set(paths)) == 3
+
+    again = asyncio.run(generate_backgrounds(prompts, provider, cache))
+    assert again == paths
+    assert len(provider.prompts) == 3
+
+
+def test_gemini_provider_returns_first_image_chunk():
+    pytest.importorskip("google.genai")
+
+    def chunk(inline_data=None, text=None):
+        part = SimpleNamespace(inline_data=inline_data)
+        return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))], text=text)
+
+    image = SimpleNamespace(data=b"png bytes", mime_type="image/png")
+    client = SimpleNamespace(models=SimpleNamespace(
+        generate_content_stream=lambda **kwargs: iter([SimpleNamespace(candidates=[]), chunk(text="hi"),
+                                                       chunk(inline_data=image)])))
+    provider = GeminiBackgroundProvider(api_key="test")
+    provider._client = client
+    assert provider.generate("calm ocean") == b"png bytes"
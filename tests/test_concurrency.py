@@ -0,0 +1,44 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from src.carousel_generator.context import get_render_context
+from src.carousel_generator.generator import CarouselGenerator
+from src.carousel_generator.sinks import MemorySink
+
+THEMES = ("default", "dark", "light", "creative", "tech")
+RUNS = 40
+
+
+def _job(index):
+    """Theme, engine, slides and seed of the index-th run; every run differs from its neighbours"""
+    theme = THEMES[index % len(THEMES)]
+    engine = "lut" if index % 3 == 0 else "reference"
+    slides = [{"heading": f"Run {index} slide {number}", "content": f"Point {index}\nPoint {number}"}
+              for number in range(1, 2 + index % 3)]
+    return f"Deck {index}", slides, get_render_context(theme, "draft", engine), index
+
+
+def _run(generator, index):
+    title, slides, context, seed = _job(index)
+    sink = MemorySink()
+    result = generator.generate_carousel(title, slides, pdf=index % 2 == 0, namespace=False, dedupe=False,
+                                         context=context, sink=sink, seed=seed, writer_threads=2)
+    return result, sink.files
+
+
+def test_concurrent_runs_match_serial_runs(tmp_path):
+    generator = CarouselGenerator(output_dir=str(tmp_path))
+    serial = [_run(generator, index) for index in range(RUNS)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        concurrent = list(executor.map(lambda index: _run(generator, index), range(RUNS)))
+
+    for index, ((serial_result, serial_files), (result, files)) in enumerate(zip(serial, concurrent)):
+        title, slides, context, seed = _job(index)
+        assert files == serial_files, f"run {index} ({context.theme_name}) wrote different files"
+        assert result["slide_paths"] == serial_result["slide_paths"]
+        assert result["seed"] == seed
+        assert (result["pdf_path"] is not None) == (index % 2 == 0)
+        assert len(result["slide_paths"]) == len(slides)
+    # Per-call contexts and sinks leave the generator's own defaults untouched
+    assert (generator.context.theme_name, generator.context.engine) == ("default", "reference")
+    assert not any(name.startswith("Deck") for name in os.listdir(tmp_path))
@@ -0,0 +1,17 @@
+import pytest
+
+from src.carousel_generator.fonts import load_font_chain
+from src.carousel_generator.utils import load_font
+
+
+@pytest.mark.parametrize("size", [24, 60])
+def test_load_font_has_requested_size(size):
+    assert load_font(size).size == size
+
+
+@pytest.mark.parametrize("text", ["Café", "Check ✓ done", "Naïve → résumé"])
+def test_segmented_runs_share_one_size(text):
+    chain = load_font_chain(60)
+    runs = chain.segment(text)
+    assert "".join(run for _, run in runs) == text
+    assert {font.size for font, _ in runs} == {60}
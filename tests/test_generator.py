@@ -0,0 +1,140 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from PIL import Image
+
+from src.carousel_generator.generator import CarouselGenerator
+from src.carousel_generator.sinks import MemorySink
+from src.carousel_generator.templates import carousel_seed
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SLIDES = [
+    {"heading": "Ideas worth sharing", "content": "First point\nSecond point"},
+    {"heading": "Growth metrics", "content": "Revenue up\nCosts down\nTeam grew"},
+    {"heading": "Thank you", "content": "Questions welcome"},
+]
+
+
+def _slide_files(generator, **options):
+    sink = MemorySink()
+    generator.generate_carousel("Slides", SLIDES, sink=sink, namespace=False, dedupe=False, **options)
+    return {name: data for name, data in sink.files.items() if name.startswith("slide_")}
+
+
+@pytest.mark.parametrize("theme", ["default", "dark"])
+def test_pdf_mode_does_not_change_slide_pngs(theme, tmp_path):
+    generator = CarouselGenerator(theme=theme, output_dir=str(tmp_path))
+    raster = _slide_files(generator, pdf_mode="raster")
+    vector = _slide_files(generator, pdf_mode="vector")
+    assert sorted(raster) == ["slide_1.png", "slide_2.png", "slide_3.png"]
+    assert raster == vector
+
+
+def test_overlap_never_exceeds_wall_time(tmp_path):
+    generator = CarouselGenerator(output_dir=str(tmp_path))
+    result = generator.generate_carousel("Timings", SLIDES * 3, sink=MemorySink(), writer_threads=4)
+    timings = result["timings"]
+    assert timings["write_busy_seconds"] <= timings["wall_seconds"]
+    assert 0 <= timings["overlap_seconds"] <= min(timings["write_busy_seconds"], timings["render_seconds"])
+
+
+@pytest.mark.parametrize("theme", ["default", "dark", "light", "creative", "tech"])
+def test_scene_at_slide_size_matches_direct_render(theme, tmp_path):
+    logo_path = str(tmp_path / "logo.png")
+    Image.new("RGBA", (64, 64), (200, 30, 30, 128)).save(logo_path)
+    background_path = str(tmp_path / "background.png")
+    Image.radial_gradient("L").convert("RGB").save(background_path)
+    generator = CarouselGenerator(theme=theme, sink=MemorySink())
+    for number, slide in enumerate(SLIDES, 1):
+        args = (slide["heading"], slide["content"], number, logo_path, None, background_path)
+        expected = generator.render_slide(*args, seed=7)
+        scene = generator.build_scene(*args, seed=7)
+        assert scene.rasterize([scene.size])[0].tobytes() == expected.tobytes()
+
+
+def test_export_at_slide_size_matches_carousel_slides():
+    generator = CarouselGenerator(sink=MemorySink())
+    slides = _slide_files(generator)
+    exported = generator.export_sizes("Slides", SLIDES, [(1080, 1080)], namespace=False)
+    assert [generator.get_sink().read(name) for name in exported["1080x1080"]] == \
+        [slides[f"slide_{i}.png"] for i in range(1, len(SLIDES) + 1)]
+
+
+def test_vector_pdf_paints_each_slide_once(monkeypatch):
+    generator = CarouselGenerator(sink=MemorySink())
+    # The PNGs are rasterized from the scenes the vector PDF needs anyway
+    monkeypatch.setattr(generator, "render_slide", None)
+    result = generator.generate_carousel("Slides", SLIDES, pdf=True, pdf_mode="vector", namespace=False)
+    assert len(result["slide_paths"]) == len(SLIDES)
+
+
+def test_export_and_iter_slides_get_their_own_directories():
+    sink = MemorySink()
+    generator = CarouselGenerator(sink=sink)
+    first = generator.export_sizes("Deck", SLIDES[:1], [(540, 540)])["540x540"]
+    second = generator.export_sizes("Deck", SLIDES[1:2], [(540, 540)])["540x540"]
+    streamed = [slide["image_path"] for slide in generator.iter_slides("Deck", SLIDES[:1])]
+    paths = first + second + streamed
+    assert len({os.path.dirname(path) for path in paths}) == 3
+    assert all(path.startswith("deck-") and path in sink.files for path in paths)
+
+
+def test_local_exports_are_deduplicated(tmp_path):
+    generator = CarouselGenerator(output_dir=str(tmp_path))
+    first = generator.export_sizes("Deck", SLIDES[:1], [(540, 540)], seed=1)["540x540"][0]
+    second = generator.export_sizes("Deck", SLIDES[:1], [(540, 540)], custom_text_color=(255, 255, 255),
+                                    seed=1)["540x540"][0]
+    assert os.path.dirname(first) != os.path.dirname(second)
+    # The custom color matches the theme's text color, so both exports are one file on disk
+    assert os.path.samefile(first, second)
+
+
+@pytest.mark.parametrize("flags", [["--pdf"], ["--pdf-mode", "vector"], ["--format", "svg"], ["--animate", "gif"]])
+def test_cli_rejects_flags_sizes_ignores(flags, tmp_path):
+    result = subprocess.run([sys.executable, "cli.py", "--title", "Sizes", "--slides", "2", "--sizes", "540x540",
+                             "--output", str(tmp_path), *flags], cwd=ROOT, capture_output=True, text=True,
+                            stdin=subprocess.DEVNULL)
+    assert result.returncode == 2
+    assert "--sizes only exports PNG slides" in result.stderr
+    assert os.listdir(tmp_path) == []
+
+
+def _run_twice(run):
+    first, second = MemorySink(), MemorySink()
+    run(CarouselGenerator(sink=first))
+    run(CarouselGenerator(sink=second))
+    return first.files, second.files
+
+
+def test_default_seed_gives_byte_identical_carousels():
+    first, second = _run_twice(lambda generator: generator.generate_carousel("Slides", SLIDES, pdf=True))
+    names = sorted(os.path.basename(name) for name in first)
+    assert names == ["Slides_carousel.pdf", "Slides_carousel_data.json", "slide_1.png", "slide_2.png",
+                     "slide_3.png"]
+    assert first == second
+
+
+def test_default_seed_gives_identical_streamed_and_single_slides():
+    def run(generator):
+        list(generator.iter_slides("Slides", SLIDES))
+        generator.create_slide("Solo", "Only point", 1)
+        asyncio.run(generator.create_slide_async("Solo", "Only point", 2))
+
+    first, second = _run_twice(run)
+    assert len(first) == 5
+    assert first == second
+
+
+def test_streamed_slides_match_the_carousel():
+    sink = MemorySink()
+    generator = CarouselGenerator(sink=sink)
+    carousel = generator.generate_carousel("Slides", SLIDES, namespace=False, dedupe=False)
+    streamed = [slide["image_path"] for slide in generator.iter_slides("Slides", SLIDES, namespace=False)]
+    assert streamed == carousel["slide_paths"]
+    seed = carousel_seed("Slides", SLIDES)
+    single = generator.render_slide(SLIDES[1]["heading"], SLIDES[1]["content"], 2, seed=seed)
+    assert generator.encode_png(single) == sink.read("slide_2.png")
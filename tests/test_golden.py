@@ -0,0 +1,36 @@
+import pytest
+
+from src.carousel_generator.golden import golden_cases, record_golden, verify_golden
+
+# Every theme, template and icon
+THEMES = None
+# Documented in the README: lut matches the reference within one level per channel
+LUT_TOLERANCE = 1
+# Documented in the README: scenes replay the recorded pixel values at the slide's own size, so no drift is allowed
+SCENE_TOLERANCE = 0
+
+
+@pytest.fixture(scope="module")
+def golden_dir(tmp_path_factory):
+    golden_dir = str(tmp_path_factory.mktemp("golden"))
+    record_golden(golden_dir, themes=THEMES)
+    return golden_dir
+
+
+def test_reference_engine_matches_exactly(golden_dir):
+    report = verify_golden(golden_dir, engine="reference")
+    assert report["failed"] == []
+    assert len(report["passed"]) == len(golden_cases(THEMES))
+    assert all(result["max_diff"] == 0 for result in report["results"].values())
+
+
+def test_lut_engine_within_tolerance(golden_dir):
+    report = verify_golden(golden_dir, engine="lut", tolerance=LUT_TOLERANCE)
+    assert report["failed"] == [], {name: report["results"][name] for name in report["failed"]}
+    assert len(report["passed"]) == len(golden_cases(THEMES))
+
+
+def test_scene_engine_within_tolerance(golden_dir):
+    report = verify_golden(golden_dir, engine="scene", tolerance=SCENE_TOLERANCE)
+    assert report["failed"] == [], {name: report["results"][name] for name in report["failed"]}
+    assert len(report["passed"]) == len(golden_cases(THEMES))
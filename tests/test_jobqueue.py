@@ -0,0 +1,46 @@
+import os
+import time
+
+from src.batch.jobqueue import FINISHING_SUFFIX, JobQueue
+
+SPEC = {"title": "Queued", "slides": [{"heading": "One", "content": "Point"}]}
+
+
+def _states(queue, job_id):
+    return [state for state in ("pending", "leased", "done", "failed")
+            if os.path.exists(queue.path_for(state, job_id))]
+
+
+def test_requeue_while_finishing_does_not_duplicate_job(tmp_path):
+    worker = JobQueue(str(tmp_path))
+    # Another worker that already decided this job's lease has expired, but has not moved it yet
+    requeuer = JobQueue(str(tmp_path))
+    requeuer.lease_age = lambda job_id: float("inf")
+
+    job_id, _ = worker.enqueue(SPEC)
+    job = worker.claim("worker-1")
+    write = worker._write
+
+    def write_then_requeue(path, data):
+        requeuer.requeue_expired()
+        write(path, data)
+
+    worker._write = write_then_requeue
+    worker.complete(job, {"slide_count": 1})
+    assert _states(worker, job_id) == ["done"]
+    assert worker.read("done", job_id)["result"] == {"slide_count": 1}
+    assert os.listdir(worker.state_dir("leased")) == []
+
+
+def test_job_left_finishing_by_dead_worker_is_requeued(tmp_path):
+    queue = JobQueue(str(tmp_path), lease_seconds=60)
+    job_id, _ = queue.enqueue(SPEC)
+    queue.claim("worker-1")
+    finishing_path = os.path.join(queue.state_dir("leased"), f".{job_id}.deadbeef{FINISHING_SUFFIX}")
+    os.rename(queue.path_for("leased", job_id), finishing_path)
+    assert queue.requeue_expired() == []
+
+    old = time.time() - 120
+    os.utime(finishing_path, (old, old))
+    assert queue.requeue_expired() == [job_id]
+    assert _states(queue, job_id) == ["pending"]
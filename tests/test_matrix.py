@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.carousel_generator.context import get_render_context
+from src.carousel_generator.generator import CarouselGenerator
+from src.carousel_generator.matrix import generate_theme_matrix
+from src.carousel_generator.sinks import MemorySink
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SLIDES = [
+    {"heading": "Ideas worth sharing", "content": "First point\nSecond point"},
+    {"heading": "Thank you", "content": "Questions welcome"},
+]
+PALETTE = ((10, 102, 194), (0, 65, 130), (245, 197, 24))
+
+
+def test_matrix_uses_engine_and_palette():
+    sink = MemorySink()
+    result = generate_theme_matrix("Matrix", SLIDES, themes=["dark", "tech"], sink=sink, pdf=False, seed=5,
+                                   engine="lut", palette=PALETTE)
+    generator = CarouselGenerator()
+    for theme in ("dark", "tech"):
+        expected = MemorySink()
+        generator.generate_carousel("Matrix", SLIDES, pdf=False, namespace=False, dedupe=False, seed=5,
+                                    context=get_render_context(theme, "final", "lut", PALETTE), sink=expected)
+        theme_dir = result["themes"][theme]["output_dir"]
+        for number in (1, 2):
+            assert sink.files[f"{theme_dir}/slide_{number}.png"] == expected.files[f"slide_{number}.png"]
+
+
+@pytest.mark.parametrize("flags", [["--sizes", "1080x1080"], ["--format", "svg"], ["--animate", "gif"],
+                                   ["--flat-output"]])
+def test_cli_rejects_flags_themes_ignores(flags, tmp_path):
+    result = subprocess.run([sys.executable, "cli.py", "--title", "Matrix", "--slides", "2", "--themes", "all",
+                             "--output", str(tmp_path), *flags], cwd=ROOT, capture_output=True, text=True,
+                            stdin=subprocess.DEVNULL)
+    assert result.returncode == 2
+    assert "--themes cannot be combined with" in result.stderr
+    assert os.listdir(tmp_path) == []
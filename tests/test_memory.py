@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Renders a carousel in a fresh process and prints its peak Python allocations and peak RSS, both in bytes
+SCRIPT = """
+import sys, tracemalloc
+from src.carousel_generator.generator import CarouselGenerator
+from src.carousel_generator.profiling import _peak_rss_bytes
+tracemalloc.start()
+slides = [{"heading": f"Heading {i}", "content": "Point one\\nPoint two\\nPoint three"} for i in range(int(sys.argv[1]))]
+CarouselGenerator(output_dir=sys.argv[3]).generate_carousel("Memory", slides, pdf_mode=sys.argv[2])
+print(tracemalloc.get_traced_memory()[1], _peak_rss_bytes() or 0)
+"""
+
+# Slides and PDF pages are flushed as they are rendered, so peak memory should not depend on the slide count.
+# Pillow's image buffers are invisible to tracemalloc, hence the looser RSS bound next to it
+SMALL, LARGE = 20, 120
+ALLOWED_TRACED_GROWTH = 2 * 2**20
+ALLOWED_RSS_GROWTH = 12 * 2**20
+
+
+def _peak_memory(slides, pdf_mode, output_dir):
+    result = subprocess.run([sys.executable, "-c", SCRIPT, str(slides), pdf_mode, str(output_dir)], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    traced, rss = result.stdout.strip().splitlines()[-1].split()
+    return int(traced), int(rss)
+
+
+@pytest.mark.parametrize("pdf_mode", ["raster", "vector"])
+def test_peak_memory_does_not_grow_with_slide_count(pdf_mode, tmp_path):
+    small_traced, small_rss = _peak_memory(SMALL, pdf_mode, tmp_path / "small")
+    large_traced, large_rss = _peak_memory(LARGE, pdf_mode, tmp_path / "large")
+    assert large_traced - small_traced < ALLOWED_TRACED_GROWTH, (
+        f"traced peak: {small_traced / 2**20:.1f} MB for {SMALL} slides, {large_traced / 2**20:.1f} MB for {LARGE}")
+    assert large_rss - small_rss < ALLOWED_RSS_GROWTH, (
+        f"peak RSS: {small_rss / 2**20:.0f} MB for {SMALL} slides, {large_rss / 2**20:.0f} MB for {LARGE}")
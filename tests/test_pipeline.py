@@ -0,0 +1,22 @@
+import time
+
+from src.carousel_generator.pipeline import SlideWritePipeline
+
+
+def test_busy_time_counts_parallel_writes_once():
+    started = time.perf_counter()
+    with SlideWritePipeline(lambda slide: time.sleep(0.05), writer_threads=4, max_pending=8) as pipeline:
+        for number in range(8):
+            pipeline.submit({"number": number})
+    wall_seconds = time.perf_counter() - started
+    # Four writers sleep side by side: their summed time exceeds the wall time, their busy time cannot
+    assert pipeline.write_seconds > wall_seconds
+    assert 0.1 <= pipeline.busy_seconds <= wall_seconds
+
+
+def test_busy_time_excludes_idle_gaps():
+    with SlideWritePipeline(lambda slide: time.sleep(0.02), writer_threads=2) as pipeline:
+        for number in range(3):
+            pipeline.submit({"number": number})
+            time.sleep(0.1)
+    assert pipeline.busy_seconds < 0.2
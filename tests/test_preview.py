@@ -0,0 +1,58 @@
+import hashlib
+import os
+
+import pytest
+
+from src.carousel_generator.generator import CarouselGenerator
+from src.preview.html_generator import export_static_preview
+
+SLIDES = [
+    {"heading": "Ideas worth sharing", "content": "First point\nSecond point"},
+    {"heading": "Thank you", "content": "Questions welcome"},
+]
+
+
+@pytest.fixture
+def json_file(tmp_path):
+    result = CarouselGenerator(output_dir=str(tmp_path / "output"), quality="draft").generate_carousel(
+        "Preview", SLIDES, pdf=True)
+    return result["json_path"]
+
+
+def _assets(export_dir):
+    return sorted(os.listdir(os.path.join(export_dir, "assets")))
+
+
+def test_export_writes_content_hashed_assets(json_file, tmp_path):
+    export_dir = str(tmp_path / "site")
+    assert export_static_preview(json_file, export_dir) == os.path.join(export_dir, "index.html")
+    assets = _assets(export_dir)
+    assert any(name.endswith(".pdf") for name in assets)
+    for name in assets:
+        with open(os.path.join(export_dir, "assets", name), "rb") as f:
+            assert name.split(".")[-2] == hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def test_interrupted_export_leaves_no_partial_assets(json_file, tmp_path, monkeypatch):
+    export_dir = str(tmp_path / "site")
+    replace = os.replace
+    calls = []
+
+    def interrupt_third_write(src, dst):
+        calls.append(dst)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", interrupt_third_write)
+    with pytest.raises(KeyboardInterrupt):
+        export_static_preview(json_file, export_dir)
+    # Only the two completed assets are there; the interrupted one left neither a partial file nor a temp file
+    assert _assets(export_dir) == sorted(os.path.basename(path) for path in calls[:2])
+    assert not os.path.exists(os.path.join(export_dir, "index.html"))
+
+    monkeypatch.setattr(os, "replace", replace)
+    export_static_preview(json_file, export_dir)
+    for name in _assets(export_dir):
+        with open(os.path.join(export_dir, "assets", name), "rb") as f:
+            assert name.split(".")[-2] == hashlib.sha256(f.read()).hexdigest()[:12]
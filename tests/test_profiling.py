@@ -0,0 +1,44 @@
+import pstats
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.carousel_generator.profiling import Profiler
+
+
+def _allocate_and_release():
+    buffers = [bytearray(1000) for _ in range(20000)]  # ~20 MB, released before the run ends
+    time.sleep(0.1)
+    del buffers
+    time.sleep(0.05)
+
+
+def test_allocation_report_is_taken_at_the_peak(tmp_path):
+    with Profiler(str(tmp_path), "spike", interval=0.005) as profiler:
+        _allocate_and_release()
+    report = profiler.report
+    assert report["snapshot_traced_bytes"] > 15 * 2**20
+    assert report["peak_traced_bytes"] >= report["snapshot_traced_bytes"]
+    top = report["allocations"][0]
+    assert top["location"].endswith(f"test_profiling.py:{_allocate_and_release.__code__.co_firstlineno + 1}")
+    assert top["bytes"] > 15 * 2**20
+    with open(report["memory_path"], encoding="utf-8") as f:
+        assert "at the highest sampled point" in f.read()
+
+
+def _count_up(n):
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+
+def test_threads_started_while_profiling_run_and_are_profiled(tmp_path):
+    with Profiler(str(tmp_path), "threads") as profiler:
+        with ThreadPoolExecutor(2, thread_name_prefix="worker") as pool:
+            futures = [pool.submit(_count_up, 10000) for _ in range(4)]
+            # Threads that die when the profiler hooks them would leave these futures pending forever
+            results = [future.result(timeout=30) for future in futures]
+    assert results == [_count_up(10000)] * 4
+    stats = pstats.Stats(profiler.report["pstats_path"])
+    calls = {name: counts[1] for (_, _, name), counts in stats.stats.items()}
+    assert calls["_count_up"] == 4
@@ -0,0 +1,92 @@
+import io
+import json
+import http.client
+import threading
+import zipfile
+
+import pytest
+
+from src.carousel_generator.generator import CarouselGenerator
+from src.carousel_generator.sinks import MemorySink
+from src.service.server import create_render_server
+from src.service.workers import render_request, validate_render_request, validate_timeout
+
+SLIDES = [{"heading": f"Heading {i}", "content": "First point\nSecond point"} for i in range(1, 4)]
+
+
+def test_rejects_non_string_slide_text():
+    for slide in ({"heading": None}, {"content": 3}, {"heading": ["a"]}):
+        with pytest.raises(ValueError):
+            validate_render_request({"title": "T", "slides": [slide]})
+
+
+def test_missing_slide_text_defaults_to_empty():
+    request = validate_render_request({"title": "T", "slides": [{}]})
+    assert request["slides"] == [{"heading": "", "content": ""}]
+
+
+@pytest.mark.parametrize("value", ["nan", float("inf"), "-inf", 0, -5, True, "soon"])
+def test_rejects_bad_timeouts(value):
+    with pytest.raises(ValueError):
+        validate_timeout(value, 60.0, 300.0)
+
+
+def test_timeout_defaults_and_cap():
+    assert validate_timeout(None, 60.0, 300.0) == 60.0
+    assert validate_timeout("12.5", 60.0, 300.0) == 12.5
+    assert validate_timeout(1000, 60.0, 300.0) == 300.0
+
+
+def test_png_request_matches_slide_in_full_carousel(monkeypatch):
+    generator = CarouselGenerator(sink=MemorySink())
+    zip_request = validate_render_request({"title": "Deck", "theme": "dark", "slides": SLIDES})
+    _, _, archive = render_request(generator, zip_request)
+    with zipfile.ZipFile(io.BytesIO(archive)) as files:
+        expected = files.read("slide_2.png")
+
+    png_request = validate_render_request({"title": "Deck", "theme": "dark", "slides": SLIDES,
+                                           "format": "png", "slide": 2})
+    # A single slide must not render the whole carousel and its PDF
+    monkeypatch.setattr(generator, "generate_carousel", None)
+    content_type, filename, body = render_request(generator, png_request)
+    assert (content_type, filename) == ("image/png", "slide_2.png")
+    assert body == expected
+
+
+@pytest.mark.parametrize("title", ["Deck\r\nSet-Cookie: a=b", "Line\nbreak", "Tab\there", "Bell\x07"])
+def test_rejects_control_characters_in_title(title):
+    with pytest.raises(ValueError):
+        validate_render_request({"title": title, "slides": SLIDES})
+
+
+def test_hostile_title_gives_safe_download_name():
+    generator = CarouselGenerator(sink=MemorySink(), quality="draft")
+    request = validate_render_request({"title": 'Q3 "plan"; filename=evil.exe', "slides": SLIDES[:1],
+                                       "format": "pdf"})
+    _, filename, _ = render_request(generator, request)
+    assert filename == "q3-plan-filename-evil-exe_carousel.pdf"
+
+
+def test_hostile_title_over_http():
+    server, pool = create_render_server(port=0, workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection(*server.server_address, timeout=60)
+        body = json.dumps({"title": 'Deck" x="1', "slides": SLIDES[:1], "format": "pdf"})
+        connection.request("POST", "/render", body, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 200
+        assert response.getheader("Content-Disposition") == 'attachment; filename="deck-x-1_carousel.pdf"'
+
+        body = json.dumps({"title": "Deck\r\nX-Injected: 1", "slides": SLIDES[:1], "format": "pdf"})
+        connection.request("POST", "/render", body, {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 400
+        assert response.getheader("X-Injected") is None
+    finally:
+        server.shutdown()
+        server.server_close()
+        pool.shutdown()
@@ -0,0 +1,124 @@
+import io
+import os
+
+import pytest
+
+from src.carousel_generator.sinks import (LocalDirectorySink, LocalObjectStore, MemorySink, ObjectStoreSink,
+                                          OutputSink)
+from src.carousel_generator.storage import BLOB_DIR
+
+
+class FakeS3Client:
+    """Records put_object calls the way boto3's S3 client receives them"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):
+        self.objects[(Bucket, Key)] = (Body, ContentType)
+        return {}
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)][0])}
+
+
+def _round_trip(sink):
+    assert sink.write("slide_1.png", b"png bytes") == sink.location("slide_1.png")
+    with sink.open("deck/data.json") as f:
+        f.write(b"{}")
+    child = sink.child("deck")
+    assert child.location("data.json") == sink.location("deck/data.json")
+    child.write("slide_2.png", b"second")
+    assert sink.read("slide_1.png") == b"png bytes"
+    assert sink.read("deck/data.json") == b"{}"
+    assert sink.read("deck/slide_2.png") == child.read("slide_2.png") == b"second"
+
+
+def test_output_sink_is_abstract():
+    with pytest.raises(TypeError):
+        OutputSink()
+
+    class ReadOnlySink(OutputSink):
+        def read(self, name):
+            return b""
+
+    with pytest.raises(TypeError):
+        ReadOnlySink()
+
+
+def test_memory_sink_round_trip():
+    sink = MemorySink()
+    _round_trip(sink)
+    assert sink.location("deck/slide_2.png") == "deck/slide_2.png"
+    assert sorted(sink.files) == ["deck/data.json", "deck/slide_2.png", "slide_1.png"]
+
+
+def test_memory_sink_discards_failed_writes():
+    sink = MemorySink()
+    with pytest.raises(RuntimeError):
+        with sink.open("broken.pdf") as f:
+            f.write(b"partial")
+            raise RuntimeError("writer failed")
+    assert sink.files == {}
+
+
+def test_local_directory_sink_round_trip(tmp_path):
+    sink = LocalDirectorySink(str(tmp_path))
+    _round_trip(sink)
+    assert sink.location("deck/slide_2.png") == str(tmp_path / "deck" / "slide_2.png")
+    assert (tmp_path / "deck" / "slide_2.png").read_bytes() == b"second"
+
+
+def test_local_directory_sink_writes_atomically(tmp_path):
+    sink = LocalDirectorySink(str(tmp_path))
+    sink.write("carousel.pdf", b"old")
+    with pytest.raises(RuntimeError):
+        with sink.open("carousel.pdf") as f:
+            f.write(b"partial")
+            # Nothing is visible under the final name until the block exits
+            assert sink.read("carousel.pdf") == b"old"
+            raise RuntimeError("writer failed")
+    assert sink.read("carousel.pdf") == b"old"
+    assert os.listdir(tmp_path) == ["carousel.pdf"]
+
+
+def test_local_directory_sink_dedupes_across_children(tmp_path):
+    sink = LocalDirectorySink(str(tmp_path))
+    first = sink.child("deck-a").write("slide_1.png", b"same", dedupe=True)
+    second = sink.child("deck-b").write("slide_1.png", b"same", dedupe=True)
+    other = sink.child("deck-b").write("slide_2.png", b"different", dedupe=True)
+    assert os.path.samefile(first, second)
+    assert not os.path.samefile(first, other)
+    blobs = [name for _, _, names in os.walk(tmp_path / BLOB_DIR) for name in names]
+    assert len(blobs) == 2
+    # Rewriting one carousel's slide replaces its link and leaves the shared blob alone
+    sink.child("deck-a").write("slide_1.png", b"changed", dedupe=True)
+    assert sink.read("deck-b/slide_1.png") == b"same"
+
+
+def test_object_store_sink_round_trip():
+    client = FakeS3Client()
+    sink = ObjectStoreSink(client, "carousels", prefix="renders")
+    _round_trip(sink)
+    assert sink.location("deck/slide_2.png") == "s3://carousels/renders/deck/slide_2.png"
+    assert client.objects[("carousels", "renders/slide_1.png")] == (b"png bytes", "image/png")
+    assert client.objects[("carousels", "renders/deck/data.json")][1] == "application/json"
+    # Dedupe is not supported by object stores and is ignored
+    sink.write("slide_3.png", b"x", dedupe=True)
+    assert sink.read("slide_3.png") == b"x"
+
+
+def test_object_store_sink_skips_failed_uploads():
+    client = FakeS3Client()
+    sink = ObjectStoreSink(client, "carousels")
+    with pytest.raises(RuntimeError):
+        with sink.open("broken.pdf") as f:
+            f.write(b"partial")
+            raise RuntimeError("writer failed")
+    assert client.objects == {}
+
+
+def test_local_object_store_round_trip(tmp_path):
+    sink = ObjectStoreSink(LocalObjectStore(str(tmp_path)), "carousels", prefix="renders")
+    _round_trip(sink)
+    assert (tmp_path / "carousels" / "renders" / "deck" / "slide_2.png").read_bytes() == b"second"
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Loaded lazily by the commands that need them, never by `--help`
+HEAVY_MODULES = ("PIL", "reportlab", "dotenv", "asyncio")
+
+# Import time of `cli.py --help` in microseconds; it is ~20 ms on a laptop, so this leaves room for slow CI machines
+IMPORT_BUDGET_US = 300_000
+
+
+def _import_times(script):
+    result = subprocess.run([sys.executable, "-X", "importtime", script, "--help"], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package", nested imports are indented
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(cumulative), not name.startswith("  "))
+    return modules
+
+
+def test_cli_help_does_not_import_heavy_modules():
+    modules = _import_times("cli.py")
+    assert "argparse" in modules
+    loaded = sorted(name for name in modules if name.split(".")[0] in HEAVY_MODULES)
+    assert loaded == []
+
+
+def test_cli_help_import_time_within_budget():
+    modules = _import_times("cli.py")
+    total = sum(cumulative for cumulative, top_level in modules.values() if top_level)
+    assert total < IMPORT_BUDGET_US, f"cli.py --help spent {total / 1000:.0f} ms importing modules"
+
+
+def test_generator_import_does_not_load_asyncio():
+    code = "import sys; import src.carousel_generator.generator; print('asyncio' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,42 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+from PIL import Image
+
+from src.carousel_generator.generator import CarouselGenerator
+from src.carousel_generator.sinks import MemorySink
+from src.carousel_generator.templates import TEMPLATE_PAINTERS
+from src.carousel_generator.themes import get_available_themes, get_theme_config
+
+SVG = "{http://www.w3.org/2000/svg}"
+# Markup characters in slide text must come out escaped
+SLIDES = [
+    {"heading": 'Tips & <tricks> "quoted"', "content": "First point\nR&D < 5% of budget"},
+    {"heading": "Growth metrics", "content": "Revenue up\nCosts down"},
+]
+
+
+def test_themes_cover_every_template():
+    assert {get_theme_config(theme)["template"] for theme in get_available_themes()} == set(TEMPLATE_PAINTERS)
+
+
+@pytest.mark.parametrize("theme", get_available_themes())
+def test_svg_slides_are_well_formed(theme, tmp_path):
+    logo_path = str(tmp_path / "logo.png")
+    Image.new("RGBA", (64, 64), (200, 30, 30, 128)).save(logo_path)
+    background_path = str(tmp_path / "background.png")
+    Image.radial_gradient("L").convert("RGB").save(background_path)
+
+    sink = MemorySink()
+    generator = CarouselGenerator(theme=theme, sink=sink)
+    result = generator.generate_carousel("Slides", SLIDES, logo_path=logo_path,
+                                         background_paths=[background_path] * len(SLIDES),
+                                         pdf=False, slide_format="svg", namespace=False)
+    assert result["slide_paths"] == ["slide_1.svg", "slide_2.svg"]
+    for path, slide in zip(result["slide_paths"], SLIDES):
+        root = ET.fromstring(sink.read(path))
+        assert root.tag == f"{SVG}svg"
+        assert (root.get("width"), root.get("height")) == ("1080", "1080")
+        texts = [element.text for element in root.iter(f"{SVG}text")]
+        assert slide["heading"] in texts
+        assert len(list(root.iter(f"{SVG}image"))) == 2